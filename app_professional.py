@@ -7,10 +7,9 @@ import streamlit as st
 import os
 import uuid
 import json
-import tempfile
 from datetime import datetime
 from pathlib import Path
-import google.generativeai as genai
+from utils.pdf_processor import PDFProcessor
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -219,32 +218,25 @@ def configure_api():
             st.error("❌ GEMINI_API_KEY bulunamadı. Lütfen yapılandırmanızı kontrol edin.")
             st.stop()
         
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         return genai.GenerativeModel('gemini-1.5-flash')
     except Exception as e:
         st.error(f"❌ API yapılandırma hatası: {str(e)}")
         st.stop()
 
-def simple_pdf_processor(uploaded_file):
+def simple_pdf_processor(uploaded_file, max_chars=None):
     """PDF işleyici"""
     try:
-        import pypdf
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        text = ""
-        with open(tmp_path, 'rb') as file:
-            pdf_reader = pypdf.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        
-        os.unlink(tmp_path)
+        # max_chars dolunca kalan sayfalar ayrıştırılmaz
+        extraction = PDFProcessor().extract_pages_with_budget(uploaded_file, max_chars=max_chars)
+        pages = [page_text + "\n" for page_text in extraction['pages']]
+        text = "".join(pages)
         
         return {
             "text": text,
-            "pages": len(pdf_reader.pages),
+            "pages": extraction['total_pages'],
+            "skipped_pages": extraction['skipped_pages'],
             "title": uploaded_file.name
         }
     except Exception as e:
@@ -378,7 +370,8 @@ def main():
                     
                     # PDF'leri işle
                     for uploaded_file in uploaded_files:
-                        pdf_data = simple_pdf_processor(uploaded_file)
+                        # İstem yalnızca ilk 3000 karakteri kullanır
+                        pdf_data = simple_pdf_processor(uploaded_file, max_chars=3000)
                         if pdf_data:
                             all_text += pdf_data["text"] + "\n\n"
                     
@@ -8,11 +8,10 @@ import streamlit as st
 import os
 import uuid
 import json
-import tempfile
 import hashlib
 from datetime import datetime
 from pathlib import Path
-import google.generativeai as genai
+from utils.pdf_processor import PDFProcessor
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -280,30 +279,22 @@ def configure_api():
             st.error("❌ API anahtarı bulunamadı")
             st.stop()
         
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         return genai.GenerativeModel('gemini-1.5-flash')
     except Exception as e:
         st.error(f"❌ API hatası: {str(e)}")
         st.stop()
 
-def simple_pdf_processor(uploaded_file):
+def simple_pdf_processor(uploaded_file, max_chars=None):
     """PDF işleyici"""
     try:
-        import pypdf
+        # max_chars dolunca kalan sayfalar ayrıştırılmaz
+        extraction = PDFProcessor().extract_pages_with_budget(uploaded_file, max_chars=max_chars)
+        pages = [page_text + "\n" for page_text in extraction['pages']]
+        text = "".join(pages)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        text = ""
-        with open(tmp_path, 'rb') as file:
-            pdf_reader = pypdf.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        
-        os.unlink(tmp_path)
-        
-        return {"text": text, "pages": len(pdf_reader.pages), "title": uploaded_file.name}
+        return {"text": text, "pages": extraction['total_pages'], "skipped_pages": extraction['skipped_pages'], "title": uploaded_file.name}
     except Exception as e:
         st.error(f"PDF işleme hatası: {str(e)}")
         return None
@@ -486,7 +477,8 @@ def admin_smart_types_tab(model, user_data):
                 all_texts = []
                 
                 for uploaded_file in uploaded_files:
-                    pdf_data = simple_pdf_processor(uploaded_file)
+                    # Bilgi tabanı ilk 10000 karakterle sınırlı
+                    pdf_data = simple_pdf_processor(uploaded_file, max_chars=10000)
                     if pdf_data:
                         all_texts.append(pdf_data["text"])
                 
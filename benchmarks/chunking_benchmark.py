@@ -0,0 +1,107 @@
+"""
+Chunk bölme benchmark'ı: eski rfind tabanlı bölücü ile sınır indeksli bölücüyü karşılaştırır
+
+Kullanım:
+    python -m benchmarks.chunking_benchmark --sizes 1 5 20
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from utils.chunks import ChunkedText
+
+WORDS = [
+    "sosyal", "hizmet", "rapor", "aile", "çocuk", "gelir", "sağlık", "eğitim",
+    "destek", "risk", "değerlendirme", "görüşme", "ihtiyaç", "müdahale", "kurum"
+]
+
+def legacy_split(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """Önceki PDFProcessor.split_text_into_chunks uygulaması (karşılaştırma için)"""
+    if not text:
+        return []
+    
+    chunks = []
+    start = 0
+    
+    while start < len(text):
+        end = start + chunk_size
+        
+        if end < len(text):
+            last_period = text.rfind('.', start, end)
+            last_newline = text.rfind('\n', start, end)
+            
+            if last_period > start:
+                end = last_period + 1
+            elif last_newline > start:
+                end = last_newline + 1
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        
+        start = max(start + chunk_size - overlap, end)
+    
+    return chunks
+
+def make_text(n_chars: int, seed: int = 42) -> str:
+    """Cümle ve paragraf yapısı olan sentetik rapor metni üretir"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    
+    while length < n_chars:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))).capitalize() + "."
+        if rng.random() < 0.15:
+            sentence += "\n"
+        else:
+            sentence += " "
+        parts.append(sentence)
+        length += len(sentence)
+    
+    return "".join(parts)[:n_chars]
+
+def measure(func, repeat: int) -> float:
+    """En iyi çalışma süresini saniye cinsinden döndürür"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    """Benchmark'ı çalıştır ve sonuç tablosunu yazdır"""
+    parser = argparse.ArgumentParser(description="Chunk bölme benchmark'ı")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 20], help="Metin boyutları (milyon karakter)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Chunk boyutu")
+    parser.add_argument("--overlap", type=int, default=200, help="Örtüşme miktarı")
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı")
+    args = parser.parse_args()
+    
+    print(f"{'boyut':>10} {'yöntem':>10} {'süre (s)':>10} {'chunk':>8} {'ort. örtüşme':>13} {'ofset/kopya bayt':>18}")
+    
+    for size in args.sizes:
+        text = make_text(int(size * 1_000_000))
+        
+        legacy_time = measure(lambda: legacy_split(text, args.chunk_size, args.overlap), args.repeat)
+        legacy_chunks = legacy_split(text, args.chunk_size, args.overlap)
+        legacy_bytes = sum(len(chunk.encode('utf-8')) for chunk in legacy_chunks)
+        
+        indexed_time = measure(lambda: ChunkedText.from_text(text, args.chunk_size, args.overlap), args.repeat)
+        indexed_chunks = ChunkedText.from_text(text, args.chunk_size, args.overlap)
+        spans = list(indexed_chunks.spans())
+        overlaps = [max(0, prev_end - start) for (_, prev_end), (start, _) in zip(spans, spans[1:])]
+        mean_overlap = sum(overlaps) / len(overlaps) if overlaps else 0
+        
+        tokens_time = measure(lambda: ChunkedText.from_text(text, args.chunk_size // 4, args.overlap // 4, 'tokens'), args.repeat)
+        token_chunks = ChunkedText.from_text(text, args.chunk_size // 4, args.overlap // 4, 'tokens')
+        
+        label = f"{size:g}M"
+        print(f"{label:>10} {'eski':>10} {legacy_time:>10.3f} {len(legacy_chunks):>8} {0:>13} {legacy_bytes:>18}")
+        print(f"{label:>10} {'indeks':>10} {indexed_time:>10.3f} {len(indexed_chunks):>8} {mean_overlap:>13.1f} {indexed_chunks.offsets_nbytes:>18}")
+        print(f"{label:>10} {'token':>10} {tokens_time:>10.3f} {len(token_chunks):>8} {'-':>13} {token_chunks.offsets_nbytes:>18}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Boyut indirgeme benchmark'ı: tam boyut, PCA projeksiyonu ve kesme (truncation)
+
+Varsayılan değerlendirme seti, gerçek embedding'ler gibi azalan varyans
+spektrumuna sahip sentetik vektörlerdir. --cache ile embedding önbelleğindeki
+gerçek Gemini vektörleri kullanılır; kesme sonuçları yalnızca bu durumda API'nin
+output_dimensionality davranışını yansıtır.
+
+Kullanım:
+    python -m benchmarks.dimension_benchmark --dims 128 256 384
+    python -m benchmarks.dimension_benchmark --cache ./data/vector_db/embedding_cache.sqlite3
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import numpy as np
+
+from utils.projection import PCAProjection
+
+def make_eval_set(n_vectors: int, dimension: int, n_clusters: int = 200, decay: float = 0.7, seed: int = 42):
+    """Azalan spektrumlu, döndürülmüş ve normalize edilmiş kümelenmiş vektörler üretir"""
+    rng = np.random.default_rng(seed)
+    spectrum = (np.arange(1, dimension + 1) ** -decay).astype('float32')
+    centers = rng.standard_normal((n_clusters, dimension)).astype('float32')
+    labels = rng.integers(0, n_clusters, n_vectors)
+    vectors = (centers[labels] + rng.standard_normal((n_vectors, dimension)).astype('float32') * 0.8) * spectrum
+    
+    # Varyansın ilk eksenlerde toplanmaması için rastgele döndür
+    rotation, _ = np.linalg.qr(rng.standard_normal((dimension, dimension)))
+    vectors = vectors @ rotation.astype('float32')
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def load_cached_vectors(cache_path: str, limit: int) -> np.ndarray:
+    """Embedding önbelleğindeki doküman vektörlerini yükler"""
+    connection = sqlite3.connect(cache_path)
+    rows = connection.execute(
+        "SELECT vector FROM embeddings WHERE task_type = 'retrieval_document' LIMIT ?", (limit,)
+    ).fetchall()
+    connection.close()
+    return np.stack([np.frombuffer(blob, dtype='float32') for (blob,) in rows])
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int):
+    """Kare L2 mesafesine göre en yakın k satır ve sorgu başına ms"""
+    started = time.perf_counter()
+    distances = (corpus ** 2).sum(axis=1)[None, :] - 2.0 * (queries @ corpus.T)
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    elapsed = (time.perf_counter() - started) * 1000 / len(queries)
+    return [set(row) for row in top], elapsed
+
+def main():
+    """Benchmark'ı çalıştır ve sonuç tablosunu yazdır"""
+    parser = argparse.ArgumentParser(description="Embedding boyut indirgeme benchmark'ı")
+    parser.add_argument("--vectors", type=int, default=20000, help="Vektör sayısı")
+    parser.add_argument("--queries", type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument("--dimension", type=int, default=768, help="Sentetik vektör boyutu")
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256, 384], help="Hedef boyutlar")
+    parser.add_argument("--sample", type=int, default=2000, help="PCA örnek sayısı")
+    parser.add_argument("--k", type=int, default=10, help="Recall@k için k")
+    parser.add_argument("--cache", type=str, default=None, help="Gerçek vektörler için embedding önbelleği")
+    args = parser.parse_args()
+    
+    if args.cache:
+        vectors = load_cached_vectors(args.cache, args.vectors)
+    else:
+        vectors = make_eval_set(args.vectors, args.dimension)
+    
+    rng = np.random.default_rng(7)
+    queries = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = queries + rng.standard_normal(queries.shape).astype('float32') * 0.01
+    truth, full_latency = top_k(vectors, queries, args.k)
+    
+    print(f"{len(vectors)} vektör, {vectors.shape[1]} boyut, {len(queries)} sorgu")
+    print(f"{'yöntem':>10} {'boyut':>6} {'bellek MB':>10} {'varyans':>8} {f'recall@{args.k}':>10} {'ms/sorgu':>9}")
+    print(f"{'tam':>10} {vectors.shape[1]:>6} {vectors.nbytes / 1e6:>10.1f} {'-':>8} {1.0:>10.3f} {full_latency:>9.2f}")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for dims in args.dims:
+            projection = PCAProjection(f"{tmp_dir}/pca_{dims}.npz", dims)
+            projection.fit(vectors[:args.sample])
+            reduced = projection.transform(vectors)
+            found, latency = top_k(reduced, projection.transform(queries), args.k)
+            recall = np.mean([len(hit & exact) / args.k for hit, exact in zip(found, truth)])
+            print(f"{'pca':>10} {dims:>6} {reduced.nbytes / 1e6:>10.1f} "
+                  f"{projection.explained_variance_ratio:>8.1%} {recall:>10.3f} {latency:>9.2f}")
+            
+            truncated = vectors[:, :dims] / np.linalg.norm(vectors[:, :dims], axis=1, keepdims=True)
+            truncated_queries = queries[:, :dims] / np.linalg.norm(queries[:, :dims], axis=1, keepdims=True)
+            found, latency = top_k(truncated, truncated_queries, args.k)
+            recall = np.mean([len(hit & exact) / args.k for hit, exact in zip(found, truth)])
+            print(f"{'kesme':>10} {dims:>6} {truncated.nbytes / 1e6:>10.1f} {'-':>8} {recall:>10.3f} {latency:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+İçe aktarma süresi benchmark'ı: giriş noktaları başına soğuk başlatma bütçesi
+
+Her giriş noktası yeni bir Python sürecinde çalıştırılır; boş yorumlayıcının
+başlatma süresi çıkarılarak yalnızca modüllerin içe aktarma maliyeti ölçülür.
+Bütçeyi aşan giriş noktası varsa çıkış kodu 1 olur. --details ile
+`-X importtime` çıktısından en pahalı modüller listelenir.
+
+Kullanım:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --runs 5 --details
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+# (ad, python argümanları, ms bütçesi); chromadb/genai/numpy/pypdf ilk kullanımda yüklenir
+ENTRY_POINTS = [
+    ("utils", ["-c", "import utils"], 30),
+    ("utils.pdf_processor", ["-c", "import utils.pdf_processor"], 80),
+    ("utils.vector_db", ["-c", "import utils.vector_db"], 80),
+    ("utils.indexer", ["-c", "import utils.indexer"], 120),
+    ("indexer --help", ["-m", "utils.indexer", "--help"], 150),
+    ("utils.report_generator", ["-c", "import utils.report_generator"], 50),
+    ("utils.chatbot", ["-c", "import utils.chatbot"], 50),
+    ("utils.learning_system", ["-c", "import utils.learning_system"], 50),
+    ("utils.smart_question_generator", ["-c", "import utils.smart_question_generator"], 100),
+]
+
+def run_seconds(arguments, runs: int) -> float:
+    """Yeni süreçte komutun en iyi (en düşük) süresi"""
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], capture_output=True, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def import_costs(arguments):
+    """-X importtime çıktısından (kümülatif ms, modül) çiftleri"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *arguments], capture_output=True, text=True)
+    costs = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        costs.append((int(parts[1]) / 1000, parts[2].strip()))
+    return costs
+
+def main():
+    """Benchmark'ı çalıştır ve sonuç tablosunu yazdır"""
+    parser = argparse.ArgumentParser(description="İçe aktarma süresi benchmark'ı")
+    parser.add_argument("--runs", type=int, default=3, help="Giriş noktası başına tekrar sayısı")
+    parser.add_argument("--details", action="store_true", help="En pahalı modülleri listele")
+    args = parser.parse_args()
+    
+    baseline = run_seconds(["-c", "pass"], args.runs)
+    startup_modules = {module for _, module in import_costs(["-c", "pass"])}
+    print(f"Boş yorumlayıcı: {baseline * 1000:.0f} ms (sonuçlardan çıkarıldı)")
+    print(f"{'giriş noktası':>32} {'ms':>7} {'bütçe':>7} {'durum':>7}")
+    
+    over_budget = []
+    for name, arguments, budget_ms in ENTRY_POINTS:
+        elapsed_ms = max(0.0, run_seconds(arguments, args.runs) - baseline) * 1000
+        status = "ok" if elapsed_ms <= budget_ms else "AŞILDI"
+        if elapsed_ms > budget_ms:
+            over_budget.append(name)
+        print(f"{name:>32} {elapsed_ms:>7.0f} {budget_ms:>7} {status:>7}")
+        
+        if args.details:
+            costs = [(cost_ms, module) for cost_ms, module in import_costs(arguments) if module not in startup_modules]
+            for cost_ms, module in sorted(costs, reverse=True)[:5]:
+                print(f"{'':>34}{module} {cost_ms:.0f} ms")
+    
+    if over_budget:
+        print(f"\nBütçeyi aşan giriş noktaları: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Nicemleme benchmark'ı: float32, float16, int8 ve int8 + float32 yeniden sıralama
+
+Dahili değerlendirme seti, gerçek embedding'lere benzer şekilde kümelenmiş
+ve normalize edilmiş sentetik vektörlerden oluşur; doğruluk birebir float32
+aramasına göre recall@k olarak ölçülür.
+
+Kullanım:
+    python -m benchmarks.quantization_benchmark --vectors 20000 --queries 200
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+
+from utils.numpy_backend import NumpyBackend
+
+def make_eval_set(n_vectors: int, n_queries: int, dimension: int, n_clusters: int = 200, seed: int = 42):
+    """Kümelenmiş, birim uzunlukta vektörler ve bunlara yakın sorgular üretir"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dimension)).astype('float32')
+    labels = rng.integers(0, n_clusters, n_vectors)
+    vectors = centers[labels] + rng.standard_normal((n_vectors, dimension)).astype('float32') * 0.8
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    
+    anchors = vectors[rng.integers(0, n_vectors, n_queries)]
+    queries = anchors + rng.standard_normal((n_queries, dimension)).astype('float32') * 0.02
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return vectors, queries
+
+def build_backend(path: str, vectors: np.ndarray, batch_size: int = 5000, **options) -> NumpyBackend:
+    """Vektörleri gruplar halinde bir NumpyBackend'e yükler"""
+    backend = NumpyBackend(path, **options)
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        ids = [f"v{start + i}" for i in range(len(batch))]
+        backend.add(ids, batch, [""] * len(batch), [{}] * len(batch))
+    return backend
+
+def search_ids(backend: NumpyBackend, queries: np.ndarray, k: int):
+    """Sorguları çalıştırır, (sonuç ID kümeleri, sorgu başına ms) döndürür"""
+    started = time.perf_counter()
+    results = backend.query(queries, k)
+    elapsed = (time.perf_counter() - started) * 1000 / len(queries)
+    return [{hit['id'] for hit in hits} for hits in results], elapsed
+
+def main():
+    """Benchmark'ı çalıştır ve sonuç tablosunu yazdır"""
+    parser = argparse.ArgumentParser(description="Vektör nicemleme benchmark'ı")
+    parser.add_argument("--vectors", type=int, default=20000, help="Vektör sayısı")
+    parser.add_argument("--queries", type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument("--dimension", type=int, default=768, help="Vektör boyutu")
+    parser.add_argument("--k", type=int, default=10, help="Recall@k için k")
+    parser.add_argument("--rerank", type=int, default=50, help="Yeniden sıralanacak aday sayısı")
+    args = parser.parse_args()
+    
+    vectors, queries = make_eval_set(args.vectors, args.queries, args.dimension)
+    modes = [
+        ("float32", {'quantization': "none"}),
+        ("float16", {'quantization': "float16"}),
+        ("int8", {'quantization': "int8"}),
+        (f"int8+rr{args.rerank}", {'quantization': "int8", 'rerank_candidates': args.rerank}),
+    ]
+    
+    print(f"{'mod':>12} {'arama MB':>10} {'tasarruf':>9} {f'recall@{args.k}':>10} {'ms/sorgu':>9}")
+    
+    truth = None
+    baseline_bytes = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, options in modes:
+            backend = build_backend(f"{tmp_dir}/{label}", vectors, **options)
+            backend.query(queries[:1], args.k)
+            found, latency = search_ids(backend, queries, args.k)
+            search_bytes = backend.get_stats()['search_bytes']
+            
+            if truth is None:
+                truth, baseline_bytes = found, search_bytes
+            recall = np.mean([len(hit & exact) / args.k for hit, exact in zip(found, truth)])
+            saved = 1 - search_bytes / baseline_bytes
+            print(f"{label:>12} {search_bytes / 1e6:>10.1f} {saved:>9.0%} {recall:>10.3f} {latency:>9.2f}")
+
+if __name__ == "__main__":
+    main()
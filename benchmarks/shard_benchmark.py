@@ -0,0 +1,76 @@
+"""
+Parçalama benchmark'ı: korpus büyüdükçe tek indeks ve parçalı dağıt-topla arama süresi
+
+Her korpus boyutunda aynı rastgele birim vektörler tek bir NumpyBackend'e ve
+--shards parçalı ShardedBackend'e yüklenir; sorgu başına gecikme süreç havuzu
+ısındıktan sonra ölçülür. Sonuçların tek indeksle aynı olduğu da doğrulanır.
+
+Kullanım:
+    python -m benchmarks.shard_benchmark --sizes 50000 200000 --shards 8
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+
+from utils.numpy_backend import NumpyBackend
+from utils.sharded_backend import ShardedBackend
+
+def load(backend, vectors: np.ndarray, batch_size: int = 10000):
+    """Vektörleri gruplar halinde backend'e yükler"""
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        ids = [f"v{start + i}" for i in range(len(batch))]
+        backend.add(ids, batch, [""] * len(batch), [{}] * len(batch))
+    backend.persist()
+
+def latency_ms(backend, queries: np.ndarray, k: int, runs: int):
+    """Sorguları tek tek çalıştırır, (son sonuç ID listeleri, ortanca ms) döndürür"""
+    timings = []
+    for _ in range(runs):
+        for query in queries:
+            started = time.perf_counter()
+            backend.query(query[None, :], k)
+            timings.append((time.perf_counter() - started) * 1000)
+    found = [[hit['id'] for hit in hits] for hits in backend.query(queries, k)]
+    return found, float(np.median(timings))
+
+def main():
+    """Benchmark'ı çalıştır ve sonuç tablosunu yazdır"""
+    parser = argparse.ArgumentParser(description="Parçalı arama benchmark'ı")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 80000, 320000], help="Korpus boyutları")
+    parser.add_argument("--shards", type=int, default=4, help="Parça sayısı")
+    parser.add_argument("--workers", type=int, default=None, help="Arama süreci sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--dimension", type=int, default=768, help="Vektör boyutu")
+    parser.add_argument("--queries", type=int, default=20, help="Sorgu sayısı")
+    parser.add_argument("--k", type=int, default=10, help="Sorgu başına sonuç")
+    parser.add_argument("--runs", type=int, default=3, help="Tekrar sayısı")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(42)
+    queries = rng.standard_normal((args.queries, args.dimension)).astype('float32')
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    
+    print(f"{'vektör':>9} {'tek ms':>8} {f'{args.shards} parça ms':>12} {'hızlanma':>9} {'aynı':>6}")
+    for size in args.sizes:
+        vectors = rng.standard_normal((size, args.dimension)).astype('float32')
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            single = NumpyBackend(f"{tmp_dir}/single")
+            sharded = ShardedBackend(f"{tmp_dir}/sharded", shards=args.shards, workers=args.workers)
+            load(single, vectors)
+            load(sharded, vectors)
+            
+            # İlk sorgu süreç havuzunu başlatır ve parçaları açar
+            sharded.query(queries[:1], args.k)
+            expected, single_ms = latency_ms(single, queries, args.k, args.runs)
+            found, sharded_ms = latency_ms(sharded, queries, args.k, args.runs)
+            sharded.close()
+        
+        same = np.mean([a == b for a, b in zip(found, expected)])
+        print(f"{size:>9} {single_ms:>8.2f} {sharded_ms:>12.2f} {single_ms / sharded_ms:>8.1f}x {same:>6.0%}")
+
+if __name__ == "__main__":
+    main()
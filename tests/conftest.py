@@ -0,0 +1,93 @@
+"""
+Testler için ortak yardımcılar: ağ isteği göndermeyen sahte embedding modülü
+ve bağımlılıksız küçük PDF üretici
+"""
+
+import hashlib
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from utils.vector_db import VectorDatabase
+
+def pdf_bytes(pages: List[str]) -> bytes:
+    """Her sayfada tek satır metin bulunan en küçük geçerli PDF"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 10 Tf 20 800 Td ({escaped}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def write_pdf(path: Path, pages: List[str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(pdf_bytes(pages))
+    return path
+
+def report_pages(seed: int, pages: int = 3, words: int = 120) -> List[str]:
+    """Tohuma göre tekrarlanabilir, birbirinden farklı rapor sayfaları"""
+    rng = np.random.default_rng(seed)
+    vocabulary = ["aile", "ziyaret", "gelir", "konut", "saglik", "egitim", "destek", "gorusme"]
+    return [
+        " ".join(f"{vocabulary[i % len(vocabulary)]}{number}" for i, number in
+                 enumerate(rng.integers(0, 100000, words))) + "."
+        for _ in range(pages)
+    ]
+
+class FakeGenai:
+    """google.generativeai yerine metnin özetinden deterministik vektör döndürür"""
+    
+    max_batch = 100
+    
+    def __init__(self, dimension: int = 16):
+        self.dimension = dimension
+        self.requests = []
+    
+    @property
+    def texts_sent(self) -> int:
+        return sum(self.requests)
+    
+    def vector(self, text: str, dimension: int) -> List[float]:
+        seed = int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).standard_normal(dimension)
+        return (vector / np.linalg.norm(vector)).tolist()
+    
+    def embed_content(self, model, content, task_type=None, output_dimensionality=None):
+        texts = content if isinstance(content, list) else [content]
+        if len(texts) > self.max_batch:
+            raise ValueError(f"at most {self.max_batch} requests can be in one batch")
+        self.requests.append(len(texts))
+        vectors = [self.vector(text, output_dimensionality or self.dimension) for text in texts]
+        return {'embedding': vectors if isinstance(content, list) else vectors[0]}
+
+@pytest.fixture
+def fake_genai() -> FakeGenai:
+    return FakeGenai()
+
+@pytest.fixture
+def make_vector_db(tmp_path, fake_genai):
+    """Sahte embedding modülüyle çalışan VectorDatabase üretir"""
+    def make(name: str = "db", **options) -> VectorDatabase:
+        options.setdefault('backend', 'numpy')
+        vector_db = VectorDatabase(db_path=str(tmp_path / name), api_key="test", **options)
+        vector_db._genai_module = fake_genai
+        return vector_db
+    return make
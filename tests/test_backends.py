@@ -0,0 +1,81 @@
+"""
+NumPy ve FAISS backend testleri
+"""
+
+import numpy as np
+import pytest
+
+from utils.numpy_backend import _append_npy
+from utils.vector_db import create_backend
+
+DIMENSION = 8
+
+def _records(start: int, count: int):
+    rng = np.random.default_rng(start)
+    vectors = rng.standard_normal((count, DIMENSION)).astype('float32')
+    ids = [f"doc{i}" for i in range(start, start + count)]
+    documents = [f"metin {i}" for i in range(start, start + count)]
+    metadatas = [{'source_file': f"rapor{i % 3}.pdf", 'chunk_index': i} for i in range(start, start + count)]
+    return ids, vectors, documents, metadatas
+
+def _stored_vectors(backend):
+    stored = {}
+    for ids, vectors, _, _ in backend.iter_batches(batch_size=7):
+        stored.update(zip(ids, vectors))
+    return stored
+
+@pytest.fixture(params=[
+    ("numpy", {}),
+    ("numpy", {'quantization': "float16", 'rerank_candidates': 10}),
+    ("numpy", {'quantization': "int8", 'rerank_candidates': 10}),
+    ("faiss", {}),
+])
+def backend_factory(request, tmp_path):
+    name, options = request.param
+    if name == "faiss":
+        pytest.importorskip("faiss")
+    return lambda: create_backend(name, str(tmp_path), **options)
+
+def test_query_filter_delete_and_reopen(backend_factory):
+    backend = backend_factory()
+    ids, vectors, documents, metadatas = _records(0, 30)
+    backend.add(ids, vectors.tolist(), documents, metadatas)
+    
+    hits = backend.query(vectors[:3].tolist(), n_results=2)
+    assert [query_hits[0]['id'] for query_hits in hits] == ids[:3]
+    
+    filtered = backend.query([vectors[0].tolist()], n_results=50, where={'source_file': "rapor1.pdf"})[0]
+    assert sorted(hit['id'] for hit in filtered) == sorted(ids[1::3])
+    
+    backend.delete(ids[:2])
+    backend.persist()
+    
+    reopened = backend_factory()
+    assert reopened.count() == 28
+    assert reopened.query([vectors[0].tolist()], n_results=1)[0][0]['id'] != ids[0]
+    assert set(_stored_vectors(reopened)) == set(ids[2:])
+
+@pytest.mark.parametrize("quantization", ["none", "float16", "int8"])
+def test_numpy_append_overwrites_rows_left_by_interrupted_add(tmp_path, quantization):
+    backend = create_backend("numpy", str(tmp_path), quantization=quantization)
+    ids, vectors, documents, metadatas = _records(0, 10)
+    backend.add(ids, vectors.tolist(), documents, metadatas)
+    
+    # Konum dosyası yazılmadan kesilen bir eklemeyi taklit et
+    orphans = np.full((4, DIMENSION), 100.0, dtype='float32')
+    _append_npy(backend.matrix_path, orphans)
+    _append_npy(backend.norms_path, np.einsum('ij,ij->i', orphans, orphans))
+    if backend.quantized_path.exists():
+        _append_npy(backend.quantized_path, np.zeros((4, DIMENSION), dtype=np.load(backend.quantized_path).dtype))
+    
+    new_ids, new_vectors, new_documents, new_metadatas = _records(10, 5)
+    backend.add(new_ids, new_vectors.tolist(), new_documents, new_metadatas)
+    
+    reopened = create_backend("numpy", str(tmp_path), quantization=quantization)
+    assert len(np.load(reopened.matrix_path, mmap_mode='r')) == 15
+    stored = _stored_vectors(reopened)
+    for doc_id, vector in zip(ids + new_ids, np.concatenate([vectors, new_vectors])):
+        np.testing.assert_array_equal(stored[doc_id], vector)
+    
+    hits = reopened.query(new_vectors.tolist(), n_results=1)
+    assert [query_hits[0]['id'] for query_hits in hits] == new_ids
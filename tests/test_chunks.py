@@ -0,0 +1,39 @@
+"""
+ChunkedText.from_text regresyon testleri
+"""
+
+import random
+
+import pytest
+
+from utils.chunks import ChunkedText
+
+def _paragraph_then_list() -> str:
+    # Pencere örtüşmeden sonra yalnızca önceki chunk'ın bittiği '.' ile satır sonlarını içerir
+    paragraph = " ".join(f"Cümle {i} aile ziyareti yapıldı." for i in range(31))
+    items = "\n".join(f"- madde {i} ihtiyaç listesi kalemi" for i in range(60))
+    return paragraph + "\n" + items
+
+def _assert_ends_strictly_increase(chunks: ChunkedText):
+    spans = list(chunks.spans())
+    for (previous_start, previous_end), (start, end) in zip(spans, spans[1:]):
+        assert start >= previous_start
+        assert end > previous_end
+
+@pytest.mark.parametrize("unit, chunk_size, overlap", [("chars", 1000, 200), ("tokens", 200, 40)])
+def test_chunk_ends_strictly_increase_after_paragraph_and_list(unit, chunk_size, overlap):
+    text = _paragraph_then_list()
+    chunks = ChunkedText.from_text(text, chunk_size, overlap, unit=unit)
+    
+    _assert_ends_strictly_increase(chunks)
+    assert chunks.span(len(chunks) - 1)[1] == len(text.rstrip())
+
+def test_chunk_ends_strictly_increase_on_random_text():
+    rng = random.Random(7)
+    pieces = ["aile", "ziyaret", "gelir", "konut", ".", "\n", "\n\n", "  "]
+    for _ in range(50):
+        text = " ".join(rng.choice(pieces) for _ in range(rng.randint(50, 1500)))
+        chunk_size = rng.randint(20, 400)
+        overlap = rng.randint(0, chunk_size - 1)
+        for unit in ("chars", "tokens"):
+            _assert_ends_strictly_increase(ChunkedText.from_text(text, chunk_size, overlap, unit=unit))
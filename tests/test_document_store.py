@@ -0,0 +1,38 @@
+"""
+DocumentStore metadata filtresi testleri
+"""
+
+import pytest
+
+from utils.document_store import DocumentStore
+from utils.metadata_filter import matches, normalize_where
+
+METADATAS = [
+    {'source_file': "a.pdf", 'chunk_index': 0},
+    {'source_file': "b.pdf", 'chunk_index': 1},
+    {'source_file': 7, 'chunk_index': "2"},
+    {'chunk_index': 3},
+    {'source_file': True},
+]
+
+@pytest.fixture
+def store(tmp_path):
+    ids = [f"doc{i}" for i in range(len(METADATAS))]
+    store = DocumentStore(tmp_path / "documents.sqlite3")
+    store.add(ids, [f"metin {i}" for i in ids], METADATAS)
+    return store
+
+@pytest.mark.parametrize("where", [
+    {'source_file': {"$in": ["a.pdf", 7]}},
+    {'source_file': {"$nin": ["a.pdf"]}},
+    {'source_file': {"$nin": ["a.pdf", 7]}},
+    {'chunk_index': {"$nin": [0, "2"]}},
+    {'chunk_index': {"$in": [1, 3, "2"]}},
+    {'source_file': {"$ne": "b.pdf"}},
+    {"$or": [{'source_file': {"$nin": ["a.pdf"]}}, {'chunk_index': {"$gte": 3}}]},
+])
+def test_filter_matches_in_memory_filter(store, where):
+    # SQL tarafı NULL ve farklı tipli değerlerde de Python filtresiyle aynı sonucu vermeli
+    expected = [f"doc{i}" for i, metadata in enumerate(METADATAS) if matches(normalize_where(where), metadata)]
+    
+    assert sorted(store.filter_ids(where)) == expected
@@ -0,0 +1,85 @@
+"""
+DocumentIndexer testleri: artımlı indeksleme, kopya ayıklama, dosya silme, kalıcılık
+"""
+
+import pytest
+
+from conftest import report_pages, write_pdf
+from utils.indexer import DocumentIndexer
+from utils.pdf_processor import PDFProcessor
+
+CHUNK_SIZE = 300
+OVERLAP = 50
+
+@pytest.fixture
+def make_indexer(make_vector_db):
+    def make(**options) -> DocumentIndexer:
+        indexer = DocumentIndexer(vector_db=make_vector_db(**options))
+        indexer.pdf_processor = PDFProcessor(cache_dir=None)
+        return indexer
+    return make
+
+def _index(indexer, directory, **options):
+    return indexer.index_directory(str(directory), CHUNK_SIZE, OVERLAP, **options)
+
+def test_unchanged_files_are_skipped(make_indexer, fake_genai, tmp_path):
+    for seed in range(3):
+        write_pdf(tmp_path / "pdfs" / f"rapor{seed}.pdf", report_pages(seed))
+    indexer = make_indexer()
+    
+    first = _index(indexer, tmp_path / "pdfs")
+    requests = len(fake_genai.requests)
+    second = _index(indexer, tmp_path / "pdfs")
+    
+    assert (first['processed_files'], second['processed_files'], second['skipped_files']) == (3, 0, 3)
+    assert len(fake_genai.requests) == requests
+    
+    write_pdf(tmp_path / "pdfs" / "rapor1.pdf", report_pages(10))
+    (tmp_path / "pdfs" / "rapor2.pdf").unlink()
+    third = _index(indexer, tmp_path / "pdfs")
+    
+    assert (third['processed_files'], third['skipped_files']) == (1, 1)
+    assert [path.endswith("rapor2.pdf") for path in third['removed_files']] == [True]
+    assert indexer.vector_db.backend.filter_ids({'source_file': "rapor2.pdf"}) == []
+
+@pytest.mark.parametrize("cache_entries, workers", [(0, 1), (0, 4), (1000, 1)])
+def test_duplicate_files_are_embedded_once(make_indexer, fake_genai, tmp_path, cache_entries, workers):
+    pages = report_pages(1)
+    for name in ("rapor.pdf", "rapor_kopya.pdf", "rapor_kopya2.pdf"):
+        write_pdf(tmp_path / "pdfs" / name, pages)
+    indexer = make_indexer(embedding_cache_max_entries=cache_entries, embedding_workers=workers)
+    
+    result = _index(indexer, tmp_path / "pdfs")
+    stats = result['dedup_stats']
+    
+    # Her kanonik chunk bir kez gönderilir; kopyalar kaydedilir ama embed edilmez
+    assert stats['duplicates'] == 2 * result['total_chunks'] // 3
+    assert fake_genai.texts_sent == result['total_chunks'] // 3
+    assert fake_genai.texts_sent + stats['embedding_texts_saved'] == result['total_chunks']
+    assert indexer.vector_db.backend.count() == result['total_chunks']
+    assert (stats['index_bytes_saved'] > 0) == bool(cache_entries)
+
+def test_delete_file_keeps_same_named_file_in_other_directory(make_indexer, tmp_path):
+    first = write_pdf(tmp_path / "a" / "rapor.pdf", report_pages(1))
+    second = write_pdf(tmp_path / "b" / "rapor.pdf", report_pages(2))
+    indexer = make_indexer()
+    first_chunks = indexer.index_single_file(str(first), CHUNK_SIZE, OVERLAP)
+    second_chunks = indexer.index_single_file(str(second), CHUNK_SIZE, OVERLAP)
+    
+    assert indexer.delete_file(str(first)) == first_chunks
+    
+    assert indexer.vector_db.backend.count() == second_chunks
+    assert not indexer.manifest.is_unchanged(str(first), CHUNK_SIZE, OVERLAP)
+    assert indexer.manifest.is_unchanged(str(second), CHUNK_SIZE, OVERLAP)
+
+def test_index_is_persisted_every_n_files(make_indexer, monkeypatch, tmp_path):
+    for seed in range(6):
+        write_pdf(tmp_path / "pdfs" / f"rapor{seed}.pdf", report_pages(seed, pages=1))
+    indexer = make_indexer()
+    persists = []
+    monkeypatch.setattr(indexer.vector_db.backend, "persist", lambda: persists.append(1))
+    
+    _index(indexer, tmp_path / "pdfs", persist_every=2)
+    
+    # 2, 4 ve 6. dosyadan sonra birer kez, çalıştırma sonunda bir kez
+    assert len(persists) == 4
@@ -0,0 +1,105 @@
+"""
+PDF çıkarma, çıkarma önbelleği ve bütçeli çıkarma testleri
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pypdf
+import pytest
+
+from conftest import pdf_bytes, report_pages, write_pdf
+from utils.extraction_cache import ExtractionCache
+from utils.pdf_processor import PDFProcessor
+
+@pytest.fixture
+def parsed_pages(monkeypatch):
+    """Metni ayrıştırılan sayfa sayısını sayar"""
+    counter = {'pages': 0}
+    extract_text = pypdf.PageObject.extract_text
+    
+    def counting_extract_text(self, *args, **kwargs):
+        counter['pages'] += 1
+        return extract_text(self, *args, **kwargs)
+    
+    monkeypatch.setattr(pypdf.PageObject, "extract_text", counting_extract_text)
+    return counter
+
+def test_extraction_cache_hit_skips_parsing(tmp_path, parsed_pages):
+    pdf_path = write_pdf(tmp_path / "rapor.pdf", report_pages(1, pages=4))
+    cache_dir = str(tmp_path / "cache")
+    
+    first = PDFProcessor(cache_dir=cache_dir).extract_pages(str(pdf_path))
+    assert parsed_pages['pages'] == 4
+    
+    # Aynı içerik bellekten (bytes) verildiğinde de aynı kayıt kullanılır
+    processor = PDFProcessor(cache_dir=cache_dir)
+    assert processor.extract_pages(pdf_path.read_bytes()) == first
+    assert processor.cache.hits == 1
+    assert parsed_pages['pages'] == 4
+
+def test_extraction_cache_concurrent_puts_do_not_collide(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), version="test")
+    key = cache.key_for_bytes(b"rapor")
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda i: cache.put(key, [f"sayfa {i}"] * 50), range(64)))
+    
+    assert all(results)
+    assert [path.name for path in cache.cache_dir.iterdir()] == [f"{key}.json"]
+    assert len(cache.get(key)) == 50
+
+def test_budgeted_extraction_stops_at_the_page_that_fills_the_budget(tmp_path, parsed_pages):
+    pages = report_pages(2, pages=6)
+    pdf_path = write_pdf(tmp_path / "rapor.pdf", pages)
+    
+    result = PDFProcessor(cache_dir=None).extract_pages_with_budget(str(pdf_path),
+                                                                    max_chars=len(pages[0]) + len(pages[1]))
+    
+    assert result['pages'] == pages[:2]
+    assert result['total_pages'] == 6
+    assert result['skipped_pages'] == 4
+    assert parsed_pages['pages'] == 2
+
+def test_budgeted_extraction_from_cache_matches_full_extraction(tmp_path):
+    pages = report_pages(3, pages=5)
+    pdf_path = write_pdf(tmp_path / "rapor.pdf", pages)
+    processor = PDFProcessor(cache_dir=str(tmp_path / "cache"))
+    
+    full = "".join(processor.extract_pages(str(pdf_path)))
+    result = processor.extract_pages_with_budget(str(pdf_path), max_chars=len(pages[0]) + 1)
+    
+    assert full.startswith("".join(result['pages']))
+    assert (result['pages_read'], result['total_pages']) == (2, 5)
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    pdf_path = write_pdf(tmp_path / "rapor.pdf", report_pages(4, pages=9))
+    
+    serial = PDFProcessor(cache_dir=None).extract_pages(str(pdf_path))
+    parallel = PDFProcessor(max_workers=2, parallel_page_threshold=1, cache_dir=None).extract_pages(str(pdf_path))
+    
+    assert parallel == serial
+
+def test_safe_processing_reports_the_parser_error(tmp_path):
+    data = pdf_bytes(report_pages(5))
+    pdf_path = tmp_path / "bozuk.pdf"
+    pdf_path.write_bytes(data[:len(data) // 2])
+    
+    result = PDFProcessor(cache_dir=None).process_pdf_file_safe(str(pdf_path))
+    
+    assert result['filename'] == "bozuk.pdf"
+    assert result['error_type'].startswith("Pdf")
+    assert result['error'] != "PDF'den metin çıkarılamadı"
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_process_directory_passes_unit(tmp_path, max_workers):
+    for seed in range(3):
+        write_pdf(tmp_path / "pdfs" / f"rapor{seed}.pdf", report_pages(seed, pages=2))
+    processor = PDFProcessor(cache_dir=None)
+    
+    results = list(processor.process_directory(str(tmp_path / "pdfs"), 60, 10, max_workers=max_workers,
+                                               unit='tokens'))
+    
+    assert len(results) == 3
+    for result in results:
+        expected = processor.process_pdf_file(result['metadata']['file_path'], 60, 10, unit='tokens')
+        assert list(result['chunks']) == list(expected['chunks'])
@@ -0,0 +1,70 @@
+"""
+VectorDatabase testleri: anlık görüntü, filtreli sözcüksel arama, embedding istekleri
+"""
+
+import pytest
+
+def _documents(count: int, source_file: str = "rapor.pdf", start: int = 0):
+    return [
+        {'id': f"{source_file}_{i}", 'text': f"aile ziyareti {i} gelir durumu {i * 7} konut bilgisi",
+         'metadata': {'source_file': source_file, 'chunk_index': i}}
+        for i in range(start, start + count)
+    ]
+
+def _contents(vector_db):
+    contents = {}
+    for ids, vectors, documents, metadatas in vector_db.backend.iter_batches():
+        for doc_id, vector, document, metadata in zip(ids, vectors, documents, metadatas):
+            contents[doc_id] = (vector.tolist(), document, metadata)
+    return contents
+
+@pytest.mark.parametrize("backend", ["numpy", "faiss"])
+def test_snapshot_round_trip_does_not_reembed(make_vector_db, fake_genai, tmp_path, backend):
+    if backend == "faiss":
+        pytest.importorskip("faiss")
+    source = make_vector_db("source", backend=backend)
+    assert source.add_multiple_documents(_documents(25)) == 25
+    
+    manifest = source.export_snapshot(str(tmp_path / "snapshot"))
+    assert manifest['count'] == 25
+    
+    requests = len(fake_genai.requests)
+    target = make_vector_db("target", backend=backend, embedding_cache_max_entries=0)
+    assert target.import_snapshot(str(tmp_path / "snapshot")) == 25
+    assert target.import_snapshot(str(tmp_path / "snapshot")) == 0
+    
+    assert len(fake_genai.requests) == requests
+    assert _contents(target) == _contents(source)
+    assert [hit['id'] for hit in target.search_lexical("ziyareti 3", n_results=1)] == ["rapor.pdf_3"]
+
+def test_filtered_lexical_search_ranks_only_matching_chunks(make_vector_db):
+    vector_db = make_vector_db()
+    # Filtreye uyan chunk'lar filtresiz sıralamada ilk sayfanın dışında kalır
+    strong = [{'id': f"a_{i}", 'text': "konut konut konut bilgisi", 'metadata': {'source_file': "a.pdf"}}
+              for i in range(30)]
+    vector_db.add_multiple_documents(strong + _documents(8, source_file="b.pdf"))
+    
+    hits = vector_db.search_lexical("konut", n_results=5, where={'source_file': "b.pdf"})
+    
+    assert len(hits) == 5
+    assert {hit['metadata']['source_file'] for hit in hits} == {"b.pdf"}
+    assert vector_db.search_lexical("konut", n_results=5, where={'source_file': "c.pdf"}) == []
+
+def test_fit_projection_respects_request_batch_limit(make_vector_db, fake_genai):
+    vector_db = make_vector_db(embedding_dimensions=4, dimension_reduction="pca", embedding_cache_max_entries=0)
+    
+    assert vector_db.fit_projection([f"örnek metin {i}" for i in range(250)])
+    
+    assert max(fake_genai.requests) <= 100
+    assert fake_genai.texts_sent == 250
+
+def test_repeated_embedding_text_is_sent_once_without_cache(make_vector_db, fake_genai):
+    vector_db = make_vector_db(embedding_cache_max_entries=0)
+    documents = [{'id': f"kopya_{i}", 'text': f"kopya {i}", 'embedding_text': "kanonik chunk metni",
+                  'metadata': {'source_file': f"kopya{i}.pdf"}} for i in range(3)]
+    
+    assert vector_db.add_multiple_documents(documents) == 3
+    
+    assert fake_genai.texts_sent == 1
+    assert vector_db.reused_embeddings['texts'] == 2
+    assert vector_db.backend.count() == 3
@@ -2,10 +2,25 @@
 Utils modülü
 """
 
-from .pdf_processor import PDFProcessor
-from .vector_db import VectorDatabase
-from .indexer import DocumentIndexer
-from .report_generator import ReportGenerator
-from .chatbot import ReportChatbot
+import importlib
 
-__all__ = ['PDFProcessor', 'VectorDatabase', 'DocumentIndexer', 'ReportGenerator', 'ReportChatbot']
\ No newline at end of file
+# Sınıflar ilk erişimde yüklenir; böylece `utils.pdf_processor` gibi hafif
+# modüller chromadb/genai bağımlılıklarını çekmeden kullanılabilir
+_EXPORTS = {
+    'PDFProcessor': '.pdf_processor',
+    'ChunkedText': '.chunks',
+    'VectorDatabase': '.vector_db',
+    'DocumentIndexer': '.indexer',
+    'ReportGenerator': '.report_generator',
+    'ReportChatbot': '.chatbot',
+}
+
+__all__ = ['PDFProcessor', 'ChunkedText', 'VectorDatabase', 'DocumentIndexer', 'ReportGenerator', 'ReportChatbot']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
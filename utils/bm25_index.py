@@ -0,0 +1,158 @@
+"""
+Yerel BM25 sözcüksel arama indeksi modülü (SQLite FTS5)
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+def turkish_lower(text: str) -> str:
+    """
+    Türkçe kurallarına göre küçük harfe çevirir
+    
+    str.lower() 'I' harfini 'i'ye, 'İ' harfini 'i̇' (birleşik nokta) dizisine
+    çevirir; Türkçede bunlar sırasıyla 'ı' ve 'i' olmalıdır.
+    """
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+def tokenize(text: str, stem_length: int = 5) -> List[str]:
+    """
+    Metni arama terimlerine ayırır
+    
+    Türkçe eklemeli bir dil olduğu için kelimeler ilk stem_length harfe
+    kısaltılır (örn. "raporları", "raporun" -> "rapor"); sayılar (kanun ve
+    madde numaraları) olduğu gibi korunur.
+    
+    Args:
+        text (str): Metin
+        stem_length (int): Kelime kökü uzunluğu (0 = kısaltma yok)
+    
+    Returns:
+        List[str]: Terimler
+    """
+    tokens = _WORD_PATTERN.findall(turkish_lower(text))
+    if not stem_length:
+        return tokens
+    return [token if token.isdigit() else token[:stem_length] for token in tokens]
+
+class BM25Index:
+    """
+    Chunk'lar üzerinde kalıcı ters indeks ve BM25 sıralaması
+    
+    Terimler Python tarafında Türkçe kurallarıyla üretilip FTS5 tablosuna
+    boşlukla ayrılmış olarak yazılır; FTS5 ters indeksi tutar ve bm25()
+    ile sıralar. Arama tamamen yereldir, ağ isteği gerektirmez.
+    """
+    
+    def __init__(self, db_path: str, stem_length: int = 5):
+        """
+        BM25Index initialization
+        
+        Args:
+            db_path (str): SQLite dosyasının yolu
+            stem_length (int): Kelime kökü uzunluğu (0 = kısaltma yok)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stem_length = stem_length
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS lexical_docs (
+                rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS lexical_fts
+                USING fts5(terms, tokenize = 'unicode61 remove_diacritics 0');
+        """)
+        self._connection.commit()
+    
+    def add(self, ids: Sequence[str], texts: Sequence[str]):
+        """Chunk'ları indeksle (mevcut ID'ler atlanır)"""
+        with self._lock:
+            for doc_id, text in zip(ids, texts):
+                cursor = self._connection.execute("INSERT OR IGNORE INTO lexical_docs (id) VALUES (?)", (doc_id,))
+                if cursor.rowcount:
+                    self._connection.execute(
+                        "INSERT INTO lexical_fts (rowid, terms) VALUES (?, ?)",
+                        (cursor.lastrowid, " ".join(tokenize(text, self.stem_length)))
+                    )
+            self._connection.commit()
+    
+    def delete(self, ids: Iterable[str]):
+        """Chunk'ları indeksten çıkar"""
+        ids = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._connection.execute(
+                    f"SELECT rowid FROM lexical_docs WHERE id IN ({placeholders})", part
+                ).fetchall()
+                self._connection.executemany("DELETE FROM lexical_fts WHERE rowid = ?", rows)
+                self._connection.execute(f"DELETE FROM lexical_docs WHERE id IN ({placeholders})", part)
+            self._connection.commit()
+    
+    def search(self, query: str, n_results: int = 5, ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Sorgu terimlerinden herhangi birini içeren chunk'ları BM25 ile sıralar
+        
+        Args:
+            query (str): Arama sorgusu
+            n_results (int): Döndürülecek sonuç sayısı
+            ids (Optional[Iterable[str]]): Yalnızca bu chunk'lar arasında ara (örn. metadata
+                filtresiyle eşleşenler); sıralama filtre sonrasında yapılır
+        
+        Returns:
+            List[Tuple[str, float]]: (chunk ID, BM25 skoru), skor azalan sırada
+        """
+        terms = list(dict.fromkeys(tokenize(query, self.stem_length)))
+        if not terms:
+            return []
+        
+        match = " OR ".join(f'"{term}"' for term in terms)
+        if ids is None:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT lexical_docs.id, bm25(lexical_fts) FROM lexical_fts "
+                    "JOIN lexical_docs ON lexical_docs.rowid = lexical_fts.rowid "
+                    "WHERE lexical_fts MATCH ? ORDER BY bm25(lexical_fts) LIMIT ?",
+                    (match, n_results)
+                ).fetchall()
+        else:
+            with self._lock:
+                # İzin verilen ID'ler bağlantıya özel geçici tabloya yazılıp birleştirilir
+                self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS lexical_filter (id TEXT PRIMARY KEY)")
+                self._connection.executemany("INSERT OR IGNORE INTO lexical_filter (id) VALUES (?)",
+                                             ((doc_id,) for doc_id in ids))
+                try:
+                    rows = self._connection.execute(
+                        "SELECT lexical_docs.id, bm25(lexical_fts) FROM lexical_fts "
+                        "JOIN lexical_docs ON lexical_docs.rowid = lexical_fts.rowid "
+                        "JOIN lexical_filter ON lexical_filter.id = lexical_docs.id "
+                        "WHERE lexical_fts MATCH ? ORDER BY bm25(lexical_fts) LIMIT ?",
+                        (match, n_results)
+                    ).fetchall()
+                finally:
+                    self._connection.execute("DELETE FROM lexical_filter")
+                    self._connection.commit()
+        
+        # FTS5 bm25() daha iyi eşleşmeler için daha küçük (negatif) değer döndürür
+        return [(doc_id, -score) for doc_id, score in rows]
+    
+    def count(self) -> int:
+        """İndekslenmiş chunk sayısı"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM lexical_docs").fetchone()[0]
+    
+    def clear(self):
+        """İndeksi temizle"""
+        with self._lock:
+            self._connection.execute("DELETE FROM lexical_docs")
+            self._connection.execute("DELETE FROM lexical_fts")
+            self._connection.commit()
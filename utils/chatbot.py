@@ -2,7 +2,6 @@
 Sohbet tabanlı rapor oluşturma sistemi
 """
 
-import google.generativeai as genai
 from typing import Dict, List, Optional, Any
 import os
 import json
@@ -18,6 +17,8 @@ class ReportChatbot:
         Args:
             api_key (str): Gemini API anahtarı
         """
+        import google.generativeai as genai
+        
         if api_key:
             genai.configure(api_key=api_key)
         elif os.getenv("GEMINI_API_KEY"):
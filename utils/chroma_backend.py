@@ -0,0 +1,142 @@
+"""
+ChromaDB indeks backend modülü
+"""
+
+import chromadb
+from chromadb.config import Settings
+from typing import Iterator, List, Dict, Optional, Tuple
+from pathlib import Path
+from .metadata_filter import normalize_where
+
+class ChromaBackend:
+    """ChromaDB collection'ı üzerinde vektör saklama ve arama"""
+    
+    name = "chroma"
+    
+    def __init__(self, db_path: str, collection_name: str = "sosyal_raporlar"):
+        """
+        ChromaBackend initialization
+        
+        Args:
+            db_path (str): Veritabanı klasörü
+            collection_name (str): Collection adı
+        """
+        self.db_path = Path(db_path)
+        
+        # ChromaDB client oluştur
+        self.client = chromadb.PersistentClient(
+            path=str(self.db_path),
+            settings=Settings(anonymized_telemetry=False)
+        )
+        
+        self.collection_name = collection_name
+        self.collection = self.get_or_create_collection()
+    
+    def get_or_create_collection(self):
+        """Collection oluştur veya mevcut olanı al"""
+        try:
+            collection = self.client.get_collection(self.collection_name)
+            print(f"Mevcut collection bulundu: {self.collection_name}")
+        except:
+            collection = self.client.create_collection(
+                name=self.collection_name,
+                metadata={"description": "Sosyal hizmet raporları vektör veritabanı"}
+            )
+            print(f"Yeni collection oluşturuldu: {self.collection_name}")
+        
+        return collection
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Vektörleri ekle (mevcut ID'ler atlanır)"""
+        # ChromaDB tek çağrıda en fazla get_max_batch_size() kayıt kabul eder
+        step = self.client.get_max_batch_size()
+        for start in range(0, len(ids), step):
+            end = start + step
+            self.collection.add(ids=ids[start:end], embeddings=embeddings[start:end],
+                                documents=documents[start:end], metadatas=metadatas[start:end])
+    
+    def query(self, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Her sorgu vektörü için en yakın dokümanları döndürür
+        
+        Args:
+            query_embeddings (List[List[float]]): Sorgu vektörleri
+            n_results (int): Sorgu başına sonuç sayısı
+            where (Optional[Dict]): Metadata filtresi (ChromaDB kendi metadata indeksini kullanır)
+        
+        Returns:
+            List[List[Dict]]: Sorgu başına id, document, metadata, distance içeren sonuçlar
+        """
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=normalize_where(where) if where else None,
+            include=['documents', 'metadatas', 'distances']
+        )
+        
+        # Sonuçları formatla
+        formatted_results = []
+        for q in range(len(query_embeddings)):
+            hits = []
+            if results['documents'] and results['documents'][q]:
+                for i in range(len(results['documents'][q])):
+                    hits.append({
+                        'id': results['ids'][q][i] if results['ids'] else None,
+                        'document': results['documents'][q][i],
+                        'metadata': results['metadatas'][q][i] if results['metadatas'] else {},
+                        'distance': results['distances'][q][i] if results['distances'] else None
+                    })
+            formatted_results.append(hits)
+        
+        return formatted_results
+    
+    def get(self, ids: List[str]) -> Dict[str, Dict]:
+        """ID'lere göre id, document, metadata kayıtları"""
+        if not ids:
+            return {}
+        results = self.collection.get(ids=list(ids), include=['documents', 'metadatas'])
+        return {
+            doc_id: {'id': doc_id, 'document': document, 'metadata': metadata or {}}
+            for doc_id, document, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+        }
+    
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[Tuple[List[str], List[List[float]], List[str], List[Dict]]]:
+        """Tüm kayıtları (ids, embeddings, documents, metadatas) grupları halinde döndürür"""
+        offset = 0
+        while True:
+            results = self.collection.get(limit=batch_size, offset=offset,
+                                          include=['embeddings', 'documents', 'metadatas'])
+            if not results['ids']:
+                return
+            yield (results['ids'], results['embeddings'], results['documents'],
+                   [metadata or {} for metadata in results['metadatas']])
+            offset += len(results['ids'])
+    
+    def filter_ids(self, where: Dict) -> List[str]:
+        """Metadata filtresiyle eşleşen kayıtların ID'leri"""
+        return self.collection.get(where=normalize_where(where), include=[])['ids']
+    
+    def delete(self, ids: List[str]):
+        """ID'leri sil"""
+        self.collection.delete(ids=list(ids))
+    
+    def count(self) -> int:
+        """Kayıt sayısı"""
+        return self.collection.count()
+    
+    def clear(self):
+        """Collection'ı sil ve yeniden oluştur"""
+        self.client.delete_collection(self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata={"description": "Sosyal hizmet raporları vektör veritabanı"}
+        )
+    
+    def persist(self):
+        """ChromaDB her yazmayı kendisi kalıcı hale getirir"""
+        pass
+    
+    def get_stats(self) -> Dict:
+        """Backend bilgileri"""
+        return {'backend': self.name, 'collection_name': self.collection_name}
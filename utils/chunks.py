@@ -0,0 +1,186 @@
+"""
+Ofset tabanlı metin parçaları (chunk) modülü
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Yaklaşık token: kelime veya tek noktalama işareti
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+class BoundaryIndex:
+    """
+    Metindeki cümle sonu ('.') ve satır sonu konumlarının sıralı indeksi
+    
+    Metin bir kez taranır; her chunk penceresi için en yakın sınır ikili
+    arama ile bulunur.
+    """
+    
+    __slots__ = ('text', 'periods', 'newlines', '_token_starts')
+    
+    def __init__(self, text: str):
+        self.text = text
+        # Sınır, ayraçtan hemen sonraki konumdur
+        self.periods = array('q', (match.end() for match in re.finditer(r'\.', text)))
+        self.newlines = array('q', (match.end() for match in re.finditer(r'\n', text)))
+        self._token_starts = None
+    
+    @property
+    def token_starts(self) -> array:
+        """Yaklaşık token başlangıç konumları (ilk kullanımda hesaplanır)"""
+        if self._token_starts is None:
+            self._token_starts = array('q', (match.start() for match in _TOKEN_PATTERN.finditer(self.text)))
+        return self._token_starts
+    
+    def last_boundary(self, start: int, limit: int, after: int = 0) -> Optional[int]:
+        """
+        (max(start + 1, after), limit] aralığındaki son sınırı döndürür
+        
+        Cümle sonu satır sonuna tercih edilir; aralıkta sınır yoksa None döner.
+        after, önceki chunk'ın bitişidir; örtüşmeyle başlayan pencerede
+        yalnızca ondan önceki bir '.' varsa satır sonu veya sert kesim kullanılır.
+        """
+        lower = max(start + 1, after)
+        for boundaries in (self.periods, self.newlines):
+            i = bisect_right(boundaries, limit)
+            if i and boundaries[i - 1] > lower:
+                return boundaries[i - 1]
+        return None
+
+class ChunkedText(Sequence):
+    """
+    Tek bir metin tamponu ve (start, end) ofsetlerinden oluşan chunk listesi
+    
+    Chunk metinleri kopya olarak saklanmaz; indeksleme veya iterasyon sırasında
+    ihtiyaç anında üretilir. List[str] yerine kullanılabilir (len, indeks,
+    dilim, iterasyon desteklenir).
+    """
+    
+    __slots__ = ('text', '_starts', '_ends')
+    
+    def __init__(self, text: str, spans: Iterable[Tuple[int, int]] = ()):
+        """
+        ChunkedText initialization
+        
+        Args:
+            text (str): Chunk'ların paylaştığı metin
+            spans (Iterable[Tuple[int, int]]): Chunk ofsetleri
+        """
+        self.text = text
+        self._starts = array('q')
+        self._ends = array('q')
+        
+        for start, end in spans:
+            self.append(start, end)
+    
+    def append(self, start: int, end: int):
+        """Yeni bir chunk ofseti ekle"""
+        self._starts.append(start)
+        self._ends.append(end)
+    
+    def span(self, index: int) -> Tuple[int, int]:
+        """Chunk'ın metin içindeki (start, end) ofsetini döndürür"""
+        return self._starts[index], self._ends[index]
+    
+    def spans(self) -> Iterator[Tuple[int, int]]:
+        """Tüm chunk ofsetlerini döndürür"""
+        return zip(self._starts, self._ends)
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ChunkedText(self.text, zip(self._starts[index], self._ends[index]))
+        return self.text[self._starts[index]:self._ends[index]]
+    
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        for start, end in zip(self._starts, self._ends):
+            yield text[start:end]
+    
+    def __repr__(self) -> str:
+        return f"ChunkedText(chunks={len(self)}, characters={len(self.text)})"
+    
+    @property
+    def offsets_nbytes(self) -> int:
+        """Ofset dizilerinin bellekte kapladığı bayt sayısı"""
+        return (len(self._starts) + len(self._ends)) * self._starts.itemsize
+    
+    def to_list(self) -> List[str]:
+        """Tüm chunk'ları string listesi olarak üret"""
+        return list(self)
+    
+    @classmethod
+    def from_text(cls, text: str, chunk_size: int = 1000, overlap: int = 200,
+                  unit: str = 'chars') -> 'ChunkedText':
+        """
+        Metni sınır indeksi üzerinden tek geçişte parçalara böler
+        
+        Her pencere chunk_size birim uzunluğundadır ve son cümle/satır sonunda
+        kesilir. Sonraki chunk, öncekinin bitişinden tam olarak overlap birim
+        önce başlar (chunk örtüşmeden kısa kaldıysa örtüşme uygulanmaz).
+        
+        Args:
+            text (str): Bölünecek metin
+            chunk_size (int): Chunk boyutu (karakter veya token)
+            overlap (int): Örtüşme miktarı (karakter veya token)
+            unit (str): 'chars' veya yaklaşık token için 'tokens'
+            
+        Returns:
+            ChunkedText: Ofset tabanlı chunk listesi
+        """
+        if unit not in ('chars', 'tokens'):
+            raise ValueError(f"Desteklenmeyen chunk birimi: {unit}")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size pozitif olmalı")
+        
+        chunks = cls(text)
+        if not text:
+            return chunks
+        
+        index = BoundaryIndex(text)
+        text_length = len(text)
+        
+        # Birim konumları: karakter modunda her karakter, token modunda her token başlangıcı
+        positions = range(text_length) if unit == 'chars' else index.token_starts
+        unit_count = len(positions)
+        
+        unit_start = 0
+        previous_end = 0
+        while unit_start < unit_count:
+            start = positions[unit_start]
+            unit_end = unit_start + chunk_size
+            
+            if unit_end < unit_count:
+                end = positions[unit_end]
+                boundary = index.last_boundary(start, end, after=previous_end)
+                if boundary is not None:
+                    end = boundary
+                    unit_end = bisect_left(positions, end)
+            else:
+                end = text_length
+                unit_end = unit_count
+            
+            # strip() ile aynı sonucu veren ofsetler
+            chunk_start, chunk_end = start, end
+            while chunk_start < chunk_end and text[chunk_start].isspace():
+                chunk_start += 1
+            while chunk_end > chunk_start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            
+            # Önceki chunk'ın içinde kalan parça eklenmez (bitişler kesin artan)
+            if chunk_start < chunk_end and (not chunks or chunk_end > chunks._ends[-1]):
+                chunks.append(chunk_start, chunk_end)
+            previous_end = end
+            
+            if unit_end >= unit_count:
+                break
+            
+            next_start = unit_end - overlap
+            unit_start = next_start if next_start > unit_start else unit_end
+        
+        return chunks
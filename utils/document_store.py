@@ -0,0 +1,240 @@
+"""
+Yerel vektör indeksleri için SQLite doküman deposu modülü
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+from .metadata_filter import normalize_where, split_values
+
+class DocumentStore:
+    """
+    Chunk ID, metin ve metadata'sını vektör indeksindeki konumuyla (pos) saklar
+    
+    Konumlar AUTOINCREMENT ile verilir ve silinen kayıtların konumları yeniden
+    kullanılmaz; böylece indekste kalan eski vektörler yeni bir kayıtla
+    karışmaz. Silinen konumlar indeks sıkıştırılana kadar tombstones
+    tablosunda tutulur.
+    
+    Metadata değerleri (anahtar, metin/sayı) ikincil indeksinde de tutulur;
+    filtreli aramada aday konumlar vektör puanlamasından önce bu indeksle
+    bulunur.
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        DocumentStore initialization
+        
+        Args:
+            db_path (str): SQLite dosyasının yolu
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                pos INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tombstones (pos INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS metadata_values (
+                pos INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                text_value TEXT,
+                number_value REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_metadata_text ON metadata_values(key, text_value);
+            CREATE INDEX IF NOT EXISTS idx_metadata_number ON metadata_values(key, number_value);
+            CREATE INDEX IF NOT EXISTS idx_metadata_pos ON metadata_values(pos);
+        """)
+        self._connection.commit()
+        
+        # İkincil indeksten önce oluşturulmuş depolar için indeksi doldur
+        if self.get_meta('metadata_index') != '1':
+            with self._lock:
+                self._connection.execute("DELETE FROM metadata_values")
+                rows = self._connection.execute("SELECT pos, metadata FROM documents").fetchall()
+                self._index_metadata((pos, json.loads(metadata)) for pos, metadata in rows)
+                self._connection.commit()
+            self.set_meta('metadata_index', '1')
+    
+    def _index_metadata(self, items: Iterable[Tuple[int, Dict]]):
+        rows = []
+        for pos, metadata in items:
+            for key, value in (metadata or {}).items():
+                if isinstance(value, str):
+                    rows.append((pos, key, value, None))
+                elif isinstance(value, (int, float)):
+                    rows.append((pos, key, None, float(value)))
+        self._connection.executemany(
+            "INSERT INTO metadata_values (pos, key, text_value, number_value) VALUES (?, ?, ?, ?)", rows
+        )
+    
+    def add(self, ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict]) -> List[Tuple[int, int]]:
+        """
+        Dokümanları ekle; zaten kayıtlı ID'ler atlanır
+        
+        Returns:
+            List[Tuple[int, int]]: Eklenen her doküman için (girdi sırası, konum)
+        """
+        added = []
+        with self._lock:
+            for i, (doc_id, document, metadata) in enumerate(zip(ids, documents, metadatas)):
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO documents (id, document, metadata) VALUES (?, ?, ?)",
+                    (doc_id, document, json.dumps(metadata or {}, ensure_ascii=False))
+                )
+                if cursor.rowcount:
+                    added.append((i, cursor.lastrowid))
+            self._index_metadata((pos, metadatas[i]) for i, pos in added)
+            self._connection.commit()
+        return added
+    
+    def get_by_positions(self, positions: Iterable[int]) -> Dict[int, Dict]:
+        """Konumlardaki kayıtları döndürür (silinmiş konumlar dahil edilmez)"""
+        positions = [int(pos) for pos in positions]
+        found = {}
+        with self._lock:
+            for start in range(0, len(positions), 500):
+                part = positions[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._connection.execute(
+                    f"SELECT pos, id, document, metadata FROM documents WHERE pos IN ({placeholders})",
+                    part
+                ).fetchall()
+                for pos, doc_id, document, metadata in rows:
+                    found[pos] = {'id': doc_id, 'document': document, 'metadata': json.loads(metadata)}
+        return found
+    
+    def get_by_ids(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        """ID'lere göre kayıtları döndürür"""
+        ids = list(ids)
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._connection.execute(
+                    f"SELECT id, document, metadata FROM documents WHERE id IN ({placeholders})", part
+                ).fetchall()
+                for doc_id, document, metadata in rows:
+                    found[doc_id] = {'id': doc_id, 'document': document, 'metadata': json.loads(metadata)}
+        return found
+    
+    def delete(self, ids: Iterable[str]) -> List[int]:
+        """ID'leri sil, silinen konumları tombstone olarak kaydet ve döndür"""
+        ids = list(ids)
+        removed = []
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._connection.execute(
+                    f"SELECT pos FROM documents WHERE id IN ({placeholders})", part
+                ).fetchall()
+                removed.extend(pos for (pos,) in rows)
+                self._connection.execute(f"DELETE FROM documents WHERE id IN ({placeholders})", part)
+            self._connection.executemany("INSERT OR IGNORE INTO tombstones (pos) VALUES (?)",
+                                         [(pos,) for pos in removed])
+            self._connection.executemany("DELETE FROM metadata_values WHERE pos = ?", [(pos,) for pos in removed])
+            self._connection.commit()
+        return removed
+    
+    def filter_positions(self, where: Dict) -> List[int]:
+        """
+        Metadata filtresiyle eşleşen konumları ikincil indeksten bulur
+        
+        Args:
+            where (Dict): Filtre (bkz. metadata_filter)
+            
+        Returns:
+            List[int]: Artan sırada eşleşen konumlar
+        """
+        sql, params = self._compile_where(normalize_where(where))
+        with self._lock:
+            rows = self._connection.execute(f"SELECT pos FROM ({sql}) ORDER BY pos", params).fetchall()
+        return [pos for (pos,) in rows]
+    
+    def filter_ids(self, where: Dict) -> List[str]:
+        """Metadata filtresiyle eşleşen kayıtların ID'leri"""
+        sql, params = self._compile_where(normalize_where(where))
+        with self._lock:
+            rows = self._connection.execute(f"SELECT id FROM documents WHERE pos IN ({sql})", params).fetchall()
+        return [doc_id for (doc_id,) in rows]
+    
+    def _compile_where(self, where: Dict) -> Tuple[str, List]:
+        if "$and" in where or "$or" in where:
+            operator, clauses = next(iter(where.items()))
+            compiled = [self._compile_where(clause) for clause in clauses]
+            joiner = " INTERSECT " if operator == "$and" else " UNION "
+            sql = joiner.join(f"SELECT pos FROM ({clause_sql})" for clause_sql, _ in compiled)
+            return sql, [param for _, clause_params in compiled for param in clause_params]
+        
+        (key, condition), = where.items()
+        (operator, operand), = condition.items()
+        base = "SELECT pos FROM metadata_values WHERE key = ? AND "
+        
+        if operator in ("$in", "$nin"):
+            texts, numbers = split_values(operand)
+            # Diğer tipteki sütun NULL'dur; COALESCE olmadan NOT (NULL) satırı eler
+            text_in = f"COALESCE(text_value IN ({','.join('?' * len(texts))}), 0)" if texts else "0"
+            number_in = f"COALESCE(number_value IN ({','.join('?' * len(numbers))}), 0)" if numbers else "0"
+            condition_sql = f"({text_in} OR {number_in})"
+            if operator == "$nin":
+                condition_sql = f"NOT {condition_sql}"
+            return base + condition_sql, [key, *texts, *numbers]
+        
+        column = "text_value" if isinstance(operand, str) else "number_value"
+        value = operand if isinstance(operand, str) else float(operand)
+        sql_operator = {"$eq": "=", "$ne": "IS NOT", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}[operator]
+        return base + f"{column} {sql_operator} ?", [key, value]
+    
+    def tombstones(self) -> List[int]:
+        """Silinmiş ama indeksten henüz çıkarılmamış konumlar"""
+        with self._lock:
+            return [pos for (pos,) in self._connection.execute("SELECT pos FROM tombstones ORDER BY pos")]
+    
+    def tombstone_count(self) -> int:
+        """Tombstone sayısı"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM tombstones").fetchone()[0]
+    
+    def clear_tombstones(self):
+        """İndeks sıkıştırıldıktan sonra tombstone'ları temizle"""
+        with self._lock:
+            self._connection.execute("DELETE FROM tombstones")
+            self._connection.commit()
+    
+    def count(self) -> int:
+        """Kayıtlı doküman sayısı"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+    
+    def get_meta(self, key: str, default: str = None) -> str:
+        """Depo ayarını oku"""
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, key: str, value: str):
+        """Depo ayarını yaz"""
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self._connection.commit()
+    
+    def clear(self):
+        """Tüm kayıtları sil (konum sayacı sıfırlanır)"""
+        with self._lock:
+            self._connection.execute("DELETE FROM documents")
+            self._connection.execute("DELETE FROM tombstones")
+            self._connection.execute("DELETE FROM metadata_values")
+            self._connection.execute("DELETE FROM meta WHERE key != 'metadata_index'")
+            self._connection.execute("DELETE FROM sqlite_sequence WHERE name = 'documents'")
+            self._connection.commit()
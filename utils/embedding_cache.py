@@ -0,0 +1,277 @@
+"""
+İki katmanlı (bellek LRU + SQLite) kalıcı embedding önbelleği modülü
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+class EmbeddingCache:
+    """
+    Embedding vektörlerini (model, task_type, sha256(metin)) anahtarıyla saklar
+    
+    Sık kullanılan vektörler bellekteki LRU katmanında tutulur; tüm vektörler
+    SQLite dosyasında float32 olarak saklanır. Disk katmanı max_entries'i
+    aştığında en uzun süredir kullanılmayan kayıtlar silinir.
+    """
+    
+    def __init__(self, db_path: str, memory_size: int = 10000, max_entries: int = 1_000_000):
+        """
+        EmbeddingCache initialization
+        
+        Args:
+            db_path (str): SQLite dosyasının yolu
+            memory_size (int): Bellek katmanındaki maksimum vektör sayısı
+            max_entries (int): Disk katmanındaki maksimum vektör sayısı
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, task_type, text_hash)
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._connection.commit()
+        self._disk_count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0
+        }
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Metnin SHA-256 özeti"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def _remember(self, key: tuple, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def get_many(self, model: str, task_type: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Metinlerin önbellekteki embedding'lerini döndürür
+        
+        Args:
+            model (str): Embedding modeli
+            task_type (str): Embedding görev tipi
+            texts (Sequence[str]): Metinler
+        
+        Returns:
+            List[Optional[List[float]]]: Her metin için vektör, yoksa None
+        """
+        hashes = [self.text_hash(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        missing = {}
+        
+        with self._lock:
+            for i, text_hash in enumerate(hashes):
+                key = (model, task_type, text_hash)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    results[i] = vector
+                else:
+                    missing.setdefault(text_hash, []).append(i)
+            
+            if missing:
+                found = self._load_from_disk(model, task_type, list(missing))
+                for text_hash, vector in found.items():
+                    self._remember((model, task_type, text_hash), vector)
+                    for i in missing[text_hash]:
+                        results[i] = vector
+                    self.stats['disk_hits'] += len(missing[text_hash])
+                
+                self.stats['misses'] += sum(len(indices) for text_hash, indices in missing.items()
+                                            if text_hash not in found)
+        
+        return results
+    
+    def _load_from_disk(self, model: str, task_type: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        now = time.time()
+        
+        # SQLite parametre sınırı için parçalar halinde sorgula
+        for start in range(0, len(hashes), 500):
+            part = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._connection.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND task_type = ? "
+                f"AND text_hash IN ({placeholders})",
+                [model, task_type, *part]
+            ).fetchall()
+            
+            for text_hash, blob in rows:
+                vector = array('f')
+                vector.frombytes(blob)
+                found[text_hash] = vector.tolist()
+            
+            if rows:
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND task_type = ? AND text_hash = ?",
+                    [(now, model, task_type, text_hash) for text_hash, _ in rows]
+                )
+        
+        if found:
+            self._connection.commit()
+        return found
+    
+    def put_many(self, model: str, task_type: str, texts: Sequence[str], vectors: Sequence[List[float]]):
+        """
+        Embedding'leri önbelleğe yaz (boş vektörler atlanır)
+        
+        Args:
+            model (str): Embedding modeli
+            task_type (str): Embedding görev tipi
+            texts (Sequence[str]): Metinler
+            vectors (Sequence[List[float]]): Metinlerin embedding'leri
+        """
+        now = time.time()
+        rows = []
+        
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if not vector:
+                    continue
+                text_hash = self.text_hash(text)
+                self._remember((model, task_type, text_hash), list(vector))
+                rows.append((model, task_type, text_hash, array('f', vector).tobytes(), now))
+            
+            if not rows:
+                return
+            
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, task_type, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._connection.commit()
+            self._disk_count += self._connection.total_changes - before
+            self.stats['writes'] += len(rows)
+            
+            if self._disk_count > self.max_entries:
+                self._evict()
+    
+    def _evict(self):
+        # Sınırın %10 altına inerek her yazmada silme yapılmasını önle
+        target = int(self.max_entries * 0.9)
+        excess = self._disk_count - target
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._connection.commit()
+        self._disk_count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.stats['evictions'] += excess
+    
+    def get_stats(self) -> Dict:
+        """Önbellek istatistiklerini al"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = self._disk_count
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._memory.clear()
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+            self._disk_count = 0
+
+class QueryEmbeddingCache:
+    """
+    Son sorgu vektörleri için süre sınırlı (TTL) LRU önbellek
+    
+    Aynı süreçteki tüm oturumlar (örn. Streamlit yeniden çalıştırmaları)
+    paylaşılan örneği kullanır; tekrarlanan aramalar ağa gitmez.
+    """
+    
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 3600.0):
+        """
+        QueryEmbeddingCache initialization
+        
+        Args:
+            max_size (int): Tutulacak maksimum sorgu sayısı
+            ttl_seconds (float): Bir vektörün geçerlilik süresi (saniye)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0}
+    
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        """Sorgunun geçerli vektörünü döndürür, yoksa None"""
+        key = (model, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            expires_at, vector = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return vector
+    
+    def put(self, model: str, query: str, vector: List[float]):
+        """Sorgu vektörünü önbelleğe yaz"""
+        if not vector:
+            return
+        key = (model, query)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict:
+        """Önbellek istatistiklerini al"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        return stats
+    
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+
+# Süreç genelinde paylaşılan sorgu önbelleği
+query_embedding_cache = QueryEmbeddingCache()
@@ -0,0 +1,296 @@
+"""
+Eşzamanlı ve hız sınırlı embedding çalıştırıcı modülü
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / kota aşımı hatalarını tanır (google.api_core'a bağımlı olmadan)"""
+    if getattr(error, 'code', None) == 429:
+        return True
+    if type(error).__name__ in ('ResourceExhausted', 'TooManyRequests'):
+        return True
+    message = str(error).lower()
+    return '429' in message or 'quota' in message or 'rate limit' in message
+
+class TokenBucket:
+    """Dakika başına hız sınırı için iş parçacığı güvenli token kovası"""
+    
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 10.0):
+        """
+        TokenBucket initialization
+        
+        Args:
+            rate_per_minute (float): Dakikada eklenen token sayısı
+            burst_seconds (float): Kovanın kaç saniyelik birikim tutabileceği
+        """
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.capacity = max(1.0, self.base_rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Yeterli token birikene kadar bekler
+        
+        Kapasiteden büyük istekler kova dolunca geçer ve tamamı düşülür; kova
+        borca girer ve sonraki istekler borç ödenene kadar bekler. Böylece
+        uzun vadeli hız, istek boyutundan bağımsız olarak sınırda kalır.
+        
+        Returns:
+            float: Beklenen süre (saniye)
+        """
+        needed = min(amount, self.capacity)
+        waited = 0.0
+        
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return waited
+                delay = (needed - self.tokens) / self.rate
+            
+            time.sleep(delay)
+            waited += delay
+    
+    def scale(self, factor: float, minimum: float = 0.1):
+        """Hızı temel hızın [minimum, 1] katı aralığında ölçekler"""
+        with self.lock:
+            self._refill()
+            self.rate = min(self.base_rate, max(self.base_rate * minimum, self.rate * factor))
+
+class EmbeddingExecutor:
+    """
+    Embedding isteklerini iş parçacığı havuzunda çalıştırır
+    
+    İstek/dakika ve token/dakika sınırları tüm iş parçacıkları arasında
+    paylaşılan token kovalarıyla uygulanır. 429 ve kota hatalarında üstel
+    geri çekilme yapılır ve hız geçici olarak düşürülür; başarılı istekler
+    hızı yeniden yapılandırılan sınıra doğru artırır.
+    """
+    
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]],
+                 fallback_fn: Callable[[List[str]], List[List[float]]] = None,
+                 max_workers: int = 4, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_retries: int = 5,
+                 base_backoff: float = 1.0, chars_per_token: int = 4):
+        """
+        EmbeddingExecutor initialization
+        
+        Args:
+            embed_fn (Callable): Metin listesi için embedding döndüren, hata fırlatan fonksiyon
+            fallback_fn (Callable): Hız sınırı dışındaki hatalarda her metin için tek öğeli
+                listeyle çağrılan, hata fırlatan yedek fonksiyon (hız sınırına tabidir)
+            max_workers (int): Eşzamanlı istek sayısı
+            requests_per_minute (Optional[float]): İstek/dakika sınırı (None = sınırsız)
+            tokens_per_minute (Optional[float]): Token/dakika sınırı (None = sınırsız)
+            max_retries (int): Hız sınırı hatalarında maksimum yeniden deneme
+            base_backoff (float): İlk geri çekilme süresi (saniye)
+            chars_per_token (int): Token tahmini için karakter/token oranı
+        """
+        self.embed_fn = embed_fn
+        self.fallback_fn = fallback_fn
+        self.max_workers = max(1, max_workers)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.chars_per_token = chars_per_token
+        
+        self._pool = None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Verim istatistiklerini sıfırla"""
+        with self._lock:
+            self._stats = {
+                'requests': 0,
+                'texts': 0,
+                'estimated_tokens': 0,
+                'retries': 0,
+                'rate_limited': 0,
+                'failed_texts': 0,
+                'throttle_wait_seconds': 0.0
+            }
+            self._first_started = None
+            self._last_finished = None
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="embedding")
+        return self._pool
+    
+    def estimate_tokens(self, texts: List[str]) -> int:
+        """Metinlerin yaklaşık token sayısı"""
+        return sum(len(text) for text in texts) // self.chars_per_token + 1
+    
+    def _throttle(self, token_count: int) -> float:
+        waited = 0.0
+        
+        # Bir 429 sonrası tüm iş parçacıkları birlikte bekler
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+        
+        if self.request_bucket:
+            waited += self.request_bucket.acquire(1)
+        if self.token_bucket:
+            waited += self.token_bucket.acquire(token_count)
+        
+        return waited
+    
+    def _on_rate_limited(self, attempt: int) -> float:
+        delay = self.base_backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+        with self._lock:
+            self._stats['rate_limited'] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket:
+                bucket.scale(0.75)
+        return delay
+    
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Tek bir grup metni hız sınırına uyarak embed eder (çağıran iş parçacığında)
+        
+        Args:
+            texts (List[str]): Embedding oluşturulacak metinler
+        
+        Returns:
+            List[List[float]]: Her metin için embedding (başarısızsa boş liste)
+        """
+        if not texts:
+            return []
+        
+        token_count = self.estimate_tokens(texts)
+        started = time.monotonic()
+        with self._lock:
+            if self._first_started is None:
+                self._first_started = started
+        
+        try:
+            embeddings = self._request(self.embed_fn, texts, token_count)
+        except Exception as e:
+            print(f"Embedding hatası: {e}")
+            if self.fallback_fn and not is_rate_limit_error(e):
+                # Sorunlu öğeleri ayırmak için tek tek; her istek yine hız sınırına tabidir
+                embeddings = [self._fallback_one(text) for text in texts]
+            else:
+                embeddings = [[] for _ in texts]
+        
+        with self._lock:
+            self._stats['texts'] += len(texts)
+            self._stats['estimated_tokens'] += token_count
+            self._stats['failed_texts'] += sum(1 for embedding in embeddings if not embedding)
+            self._last_finished = time.monotonic()
+        
+        return embeddings
+    
+    def _request(self, fn: Callable[[List[str]], List[List[float]]], texts: List[str],
+                 token_count: int) -> List[List[float]]:
+        """fn(texts) isteğini hız sınırına uyarak yapar; 429'larda geri çekilip yeniden dener"""
+        for attempt in range(self.max_retries + 1):
+            waited = self._throttle(token_count)
+            with self._lock:
+                self._stats['throttle_wait_seconds'] += waited
+                self._stats['requests'] += 1
+            
+            try:
+                embeddings = fn(texts)
+                for bucket in (self.request_bucket, self.token_bucket):
+                    if bucket:
+                        bucket.scale(1.05)
+                return embeddings
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._on_rate_limited(attempt)
+                with self._lock:
+                    self._stats['retries'] += 1
+                print(f"Embedding hız sınırı, {delay:.1f} sn bekleniyor: {e}")
+    
+    def _fallback_one(self, text: str) -> List[float]:
+        try:
+            return self._request(self.fallback_fn, [text], self.estimate_tokens([text]))[0]
+        except Exception as e:
+            print(f"Tekli embedding hatası: {e}")
+            return []
+    
+    def map_batches(self, batches: Iterable[Any], texts_of: Callable[[Any], List[str]] = None,
+                    max_in_flight: int = None,
+                    embed: Callable[[List[str]], List[List[float]]] = None) -> Iterator[Tuple[Any, List[List[float]]]]:
+        """
+        Grupları eşzamanlı olarak embed eder, sonuçları gönderim sırasıyla döndürür
+        
+        Aynı anda bekleyen grup sayısı sınırlıdır; tüketici yavaşsa yeni istek
+        gönderilmez.
+        
+        Args:
+            batches (Iterable[Any]): Metin grupları (veya texts_of ile metne çevrilen gruplar)
+            texts_of (Callable): Bir gruptan metin listesini çıkaran fonksiyon
+            max_in_flight (int): Aynı anda bekleyen grup sayısı (varsayılan: max_workers * 2)
+            embed (Callable): self.embed yerine çağrılacak fonksiyon (örn. önbellek katmanı)
+            
+        Yields:
+            Tuple[Any, List[List[float]]]: (grup, embedding'ler)
+        """
+        texts_of = texts_of or (lambda batch: batch)
+        embed = embed or self.embed
+        
+        if self.max_workers == 1:
+            for batch in batches:
+                yield batch, embed(texts_of(batch))
+            return
+        
+        limit = max_in_flight or self.max_workers * 2
+        pool = self._get_pool()
+        pending = deque()
+        
+        for batch in batches:
+            pending.append((batch, pool.submit(embed, texts_of(batch))))
+            if len(pending) >= limit:
+                done_batch, future = pending.popleft()
+                yield done_batch, future.result()
+        
+        while pending:
+            done_batch, future = pending.popleft()
+            yield done_batch, future.result()
+    
+    def get_stats(self) -> Dict:
+        """Ulaşılan verim dahil istatistikleri döndürür"""
+        with self._lock:
+            stats = dict(self._stats)
+            elapsed = 0.0
+            if self._first_started is not None and self._last_finished is not None:
+                elapsed = max(self._last_finished - self._first_started, 1e-9)
+        
+        stats['elapsed_seconds'] = elapsed
+        stats['texts_per_second'] = stats['texts'] / elapsed if elapsed else 0.0
+        stats['requests_per_minute'] = stats['requests'] * 60 / elapsed if elapsed else 0.0
+        stats['tokens_per_minute'] = stats['estimated_tokens'] * 60 / elapsed if elapsed else 0.0
+        stats['max_workers'] = self.max_workers
+        stats['configured_requests_per_minute'] = self.request_bucket.base_rate * 60 if self.request_bucket else None
+        stats['configured_tokens_per_minute'] = self.token_bucket.base_rate * 60 if self.token_bucket else None
+        return stats
+    
+    def shutdown(self):
+        """İş parçacığı havuzunu kapat"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
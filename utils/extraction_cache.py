@@ -0,0 +1,174 @@
+"""
+PDF metin çıkarma sonuçları için içerik adresli disk önbelleği
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Optional
+
+class ExtractionCache:
+    """
+    Sayfa metinlerini PDF içeriğinin SHA-256 özeti ve çıkarıcı sürümüyle
+    anahtarlayarak diskte saklar; toplam boyut sınırı aşıldığında en uzun
+    süredir kullanılmayan kayıtlar silinir (LRU)
+    """
+    
+    def __init__(self, cache_dir: str = "./data/extraction_cache", version: str = "",
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        ExtractionCache initialization
+        
+        Args:
+            cache_dir (str): Önbellek klasörü
+            version (str): Çıkarıcı sürümü; değiştiğinde eski kayıtlar kullanılmaz
+            max_bytes (int): Önbelleğin diskte kaplayabileceği maksimum boyut
+        """
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def _make_key(self, digest: str) -> str:
+        return hashlib.sha256(f"{self.version}\0{digest}".encode('utf-8')).hexdigest()
+    
+    def key_for_bytes(self, data: bytes) -> str:
+        """PDF içeriğinden önbellek anahtarı üretir"""
+        return self._make_key(hashlib.sha256(data).hexdigest())
+    
+    def key_for_stream(self, stream, block_size: int = 1024 * 1024) -> str:
+        """
+        Dosya benzeri nesneden önbellek anahtarı üretir
+        
+        getbuffer() destekleyen akışlar (BytesIO, UploadedFile) kopyalanmadan
+        özetlenir; diğerleri bloklar halinde okunup başa sarılır.
+        """
+        if hasattr(stream, 'getbuffer'):
+            with stream.getbuffer() as buffer:
+                return self.key_for_bytes(buffer)
+        
+        hasher = hashlib.sha256()
+        stream.seek(0)
+        for block in iter(lambda: stream.read(block_size), b''):
+            hasher.update(block)
+        stream.seek(0)
+        return self._make_key(hasher.hexdigest())
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Önbellekteki sayfa metinlerini döndürür
+        
+        Args:
+            key (str): Önbellek anahtarı
+        
+        Returns:
+            Optional[List[str]]: Sayfa metinleri, kayıt yoksa None
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                pages = json.load(f)['pages']
+            # LRU sırası için son kullanım zamanını güncelle
+            os.utime(entry_path)
+            self.hits += 1
+            return pages
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"Önbellek okuma hatası: {e}")
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, pages: List[str]) -> bool:
+        """
+        Sayfa metinlerini önbelleğe yazar
+        
+        Args:
+            key (str): Önbellek anahtarı
+            pages (List[str]): Sayfa metinleri
+        
+        Returns:
+            bool: İşlem başarılı mı
+        """
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(key)
+            
+            # Aynı süreçteki iş parçacıkları da çakışmasın diye benzersiz geçici dosya
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'pages': pages}, f, ensure_ascii=False)
+            
+            # Eşzamanlı okuyucular yarım yazılmış kayıt görmesin
+            os.replace(tmp_path, entry_path)
+            tmp_path = None
+            
+            self.evict()
+            return True
+        except Exception as e:
+            print(f"Önbellek yazma hatası: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+    
+    def evict(self) -> int:
+        """
+        Boyut sınırı aşıldıysa en eski kayıtları siler
+        
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        entries = []
+        total_size = 0
+        
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+        
+        return removed
+    
+    def clear(self) -> bool:
+        """Önbelleği temizle"""
+        try:
+            if self.cache_dir.exists():
+                for entry in self.cache_dir.glob("*.json"):
+                    entry.unlink()
+            return True
+        except Exception as e:
+            print(f"Önbellek temizleme hatası: {e}")
+            return False
+    
+    def get_stats(self) -> Dict:
+        """Önbellek istatistiklerini al"""
+        entries = list(self.cache_dir.glob("*.json")) if self.cache_dir.exists() else []
+        return {
+            'entries': len(entries),
+            'total_bytes': sum(entry.stat().st_size for entry in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
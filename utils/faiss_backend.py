@@ -0,0 +1,318 @@
+"""
+FAISS indeks backend modülü (flat, IVF-Flat, HNSW)
+"""
+
+import os
+import faiss
+import numpy as np
+from typing import Iterator, List, Dict, Optional, Tuple
+from pathlib import Path
+from .document_store import DocumentStore
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+class FaissBackend:
+    """
+    FAISS indeksi üzerinde vektör saklama ve arama
+    
+    Vektörler doküman deposundaki konumlarıyla (IndexIDMap2) indekslenir;
+    metin ve metadata SQLite deposunda tutulur. İndeks diskten bellek eşlemeli
+    (mmap) olarak açılır ve yalnızca ilk yazmada belleğe yüklenir.
+    
+    Silinen vektörler tombstone olarak işaretlenip aramada elenir; oranları
+    compact_ratio'yu aştığında indeks canlı vektörlerle yeniden oluşturulur.
+    
+    IVF indeksi eğitim için nlist * 39 vektör birikene kadar flat (birebir)
+    olarak çalışır, ardından bir kez IVF'e dönüştürülür.
+    
+    Metadata filtreli aramada aday konumlar doküman deposunun ikincil
+    indeksinden gelir. Az sayıda aday birebir puanlanır; çok sayıda aday
+    için FAISS araması bir ID seçicisiyle adaylarla sınırlandırılır.
+    """
+    
+    name = "faiss"
+    
+    def __init__(self, db_path: str, index_type: str = "flat", nlist: int = 1024, nprobe: int = 16,
+                 hnsw_m: int = 32, ef_construction: int = 200, ef_search: int = 64,
+                 compact_ratio: float = 0.2, exact_filter_limit: int = 20000):
+        """
+        FaissBackend initialization
+        
+        Args:
+            db_path (str): Veritabanı klasörü
+            index_type (str): "flat", "ivf" veya "hnsw"
+            nlist (int): IVF küme sayısı
+            nprobe (int): IVF aramasında taranan küme sayısı (yüksek = daha iyi recall, daha yavaş)
+            hnsw_m (int): HNSW komşu sayısı
+            ef_construction (int): HNSW oluşturma derinliği
+            ef_search (int): HNSW arama derinliği (yüksek = daha iyi recall, daha yavaş)
+            compact_ratio (float): Yeniden oluşturmayı tetikleyen silinmiş vektör oranı
+            exact_filter_limit (int): Filtreli aramada birebir puanlanacak en fazla aday sayısı
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Bilinmeyen FAISS indeks tipi: {index_type} ({', '.join(INDEX_TYPES)})")
+        
+        self.db_path = Path(db_path) / "faiss"
+        self.db_path.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.db_path / "index.faiss"
+        self.store = DocumentStore(self.db_path / "documents.sqlite3")
+        
+        stored_type = self.store.get_meta('index_type')
+        if stored_type and stored_type != index_type:
+            print(f"Uyarı: Mevcut indeks tipi '{stored_type}' kullanılıyor (istenen: '{index_type}')")
+            index_type = stored_type
+        
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.compact_ratio = compact_ratio
+        self.exact_filter_limit = exact_filter_limit
+        
+        self.index = None
+        self._mmapped = False
+        self._dirty = False
+        if self.index_path.exists():
+            self._load(mmap=True)
+    
+    def _load(self, mmap: bool):
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        self.index = faiss.read_index(str(self.index_path), flags)
+        self._mmapped = mmap
+        self._apply_search_params()
+    
+    def _ensure_writable(self):
+        # Bellek eşlemeli indeks salt okunurdur; ilk yazmada belleğe yükle
+        if self.index is not None and self._mmapped:
+            self._load(mmap=False)
+    
+    def _apply_search_params(self):
+        inner = faiss.downcast_index(self.index.index)
+        if isinstance(inner, faiss.IndexIVF):
+            inner.nprobe = self.nprobe
+        elif isinstance(inner, faiss.IndexHNSW):
+            inner.hnsw.efSearch = self.ef_search
+    
+    def _new_index(self, dimension: int, trained_ivf: bool = False):
+        if self.index_type == "hnsw":
+            inner = faiss.IndexHNSWFlat(dimension, self.hnsw_m)
+            inner.hnsw.efConstruction = self.ef_construction
+        elif self.index_type == "ivf" and trained_ivf:
+            inner = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimension), dimension, self.nlist)
+        else:
+            inner = faiss.IndexFlatL2(dimension)
+        return faiss.IndexIDMap2(inner)
+    
+    def _is_ivf(self) -> bool:
+        return isinstance(faiss.downcast_index(self.index.index), faiss.IndexIVF)
+    
+    def _vectors(self):
+        """İndeksteki tüm (konum, vektör) çiftleri"""
+        inner = faiss.downcast_index(self.index.index)
+        if isinstance(inner, faiss.IndexIVF):
+            inner.make_direct_map()
+        vectors = inner.reconstruct_n(0, self.index.ntotal)
+        positions = faiss.vector_to_array(self.index.id_map)
+        return positions, vectors
+    
+    def _rebuild(self, train_ivf: bool = False):
+        positions, vectors = self._vectors()
+        dead = self.store.tombstones()
+        if dead:
+            keep = ~np.isin(positions, np.asarray(dead, dtype='int64'))
+            positions, vectors = positions[keep], vectors[keep]
+        
+        if self._is_ivf():
+            # Eğitilmiş kümeler korunur, yalnızca listeler yeniden doldurulur
+            index = faiss.clone_index(self.index)
+            index.reset()
+        else:
+            index = self._new_index(self.index.d, train_ivf)
+            if train_ivf:
+                index.train(vectors)
+        if len(positions):
+            index.add_with_ids(vectors, positions)
+        
+        self.index = index
+        self._apply_search_params()
+        self.store.clear_tombstones()
+        self._dirty = True
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Vektörleri ekle (mevcut ID'ler atlanır)"""
+        added = self.store.add(ids, documents, metadatas)
+        if not added:
+            return
+        
+        vectors = np.asarray([embeddings[i] for i, _ in added], dtype='float32')
+        positions = np.asarray([pos for _, pos in added], dtype='int64')
+        
+        if self.index is None:
+            self.index = self._new_index(vectors.shape[1])
+            self._apply_search_params()
+            self.store.set_meta('index_type', self.index_type)
+        self._ensure_writable()
+        
+        self.index.add_with_ids(vectors, positions)
+        self._dirty = True
+        
+        # Yeterli vektör biriktiğinde IVF'i eğit
+        if self.index_type == "ivf" and not self._is_ivf() and self.index.ntotal >= self.nlist * 39:
+            self._rebuild(train_ivf=True)
+    
+    def query(self, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Her sorgu vektörü için en yakın dokümanları döndürür
+        
+        Args:
+            query_embeddings (List[List[float]]): Sorgu vektörleri
+            n_results (int): Sorgu başına sonuç sayısı
+            where (Optional[Dict]): Metadata filtresi; arama eşleşen vektörlerle sınırlanır
+        
+        Returns:
+            List[List[Dict]]: Sorgu başına id, document, metadata, distance içeren sonuçlar
+        """
+        if self.index is None or self.index.ntotal == 0:
+            return [[] for _ in query_embeddings]
+        
+        queries = np.asarray(query_embeddings, dtype='float32')
+        if where is None:
+            # Silinmiş vektörler elenebilsin diye fazladan aday iste
+            k = min(self.index.ntotal, n_results + self.store.tombstone_count())
+            distances, positions = self.index.search(queries, k)
+        else:
+            candidates = np.asarray(self.store.filter_positions(where), dtype='int64')
+            if len(candidates) == 0:
+                return [[] for _ in query_embeddings]
+            if len(candidates) <= self.exact_filter_limit:
+                distances, positions = self._search_exact(queries, candidates, n_results)
+            else:
+                distances, positions = self._search_selected(queries, candidates, n_results)
+        
+        records = self.store.get_by_positions({int(pos) for pos in positions.ravel() if pos >= 0})
+        
+        formatted_results = []
+        for row_distances, row_positions in zip(distances, positions):
+            hits = []
+            for distance, pos in zip(row_distances, row_positions):
+                record = records.get(int(pos))
+                if record is None:
+                    continue
+                hits.append({**record, 'distance': float(distance)})
+                if len(hits) == n_results:
+                    break
+            formatted_results.append(hits)
+        
+        return formatted_results
+    
+    def _search_exact(self, queries: np.ndarray, candidates: np.ndarray, n_results: int):
+        """Aday konumların vektörlerini indeksten alıp birebir puanlar"""
+        id_map = faiss.vector_to_array(self.index.id_map)
+        rows = np.searchsorted(id_map, candidates)
+        inside = rows < len(id_map)
+        rows = rows[inside][id_map[rows[inside]] == candidates[inside]]
+        if len(rows) == 0:
+            return np.empty((len(queries), 0), dtype='float32'), np.empty((len(queries), 0), dtype='int64')
+        
+        inner = faiss.downcast_index(self.index.index)
+        if isinstance(inner, faiss.IndexIVF):
+            inner.make_direct_map()
+        vectors = inner.reconstruct_batch(rows)
+        distances = (np.einsum('ij,ij->i', vectors, vectors)[None, :] - 2.0 * (queries @ vectors.T)
+                     + np.einsum('ij,ij->i', queries, queries)[:, None])
+        
+        k = min(n_results, len(rows))
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        top_distances = np.take_along_axis(distances, top, axis=1)
+        order = np.argsort(top_distances, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return np.maximum(np.take_along_axis(top_distances, order, axis=1), 0.0), id_map[rows][top]
+    
+    def _search_selected(self, queries: np.ndarray, candidates: np.ndarray, n_results: int):
+        """FAISS aramasını bir ID seçicisiyle aday konumlarla sınırlar"""
+        selector = faiss.IDSelectorBatch(candidates)
+        inner = faiss.downcast_index(self.index.index)
+        if isinstance(inner, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+        elif isinstance(inner, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(self.ef_search, n_results))
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        return self.index.search(queries, min(n_results, len(candidates)), params=params)
+    
+    def get(self, ids: List[str]) -> Dict[str, Dict]:
+        """ID'lere göre id, document, metadata kayıtları"""
+        return self.store.get_by_ids(ids)
+    
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[Tuple[List[str], np.ndarray, List[str], List[Dict]]]:
+        """Canlı kayıtları (ids, embeddings, documents, metadatas) grupları halinde döndürür"""
+        if self.index is None:
+            return
+        inner = faiss.downcast_index(self.index.index)
+        if isinstance(inner, faiss.IndexIVF):
+            inner.make_direct_map()
+        id_map = faiss.vector_to_array(self.index.id_map)
+        for start in range(0, len(id_map), batch_size):
+            positions = id_map[start:start + batch_size]
+            records = self.store.get_by_positions(positions)
+            live = np.asarray([int(pos) in records for pos in positions], dtype=bool)
+            if not live.any():
+                continue
+            vectors = inner.reconstruct_n(start, len(positions))[live]
+            batch = [records[int(pos)] for pos in positions[live]]
+            yield ([record['id'] for record in batch], vectors,
+                   [record['document'] for record in batch], [record['metadata'] for record in batch])
+    
+    def filter_ids(self, where: Dict) -> List[str]:
+        """Metadata filtresiyle eşleşen kayıtların ID'leri"""
+        return self.store.filter_ids(where)
+    
+    def delete(self, ids: List[str]):
+        """ID'leri sil; gerekirse indeksi sıkıştır"""
+        if not self.store.delete(ids) or self.index is None:
+            return
+        if self.store.tombstone_count() > self.index.ntotal * self.compact_ratio:
+            self.compact()
+    
+    def compact(self):
+        """Silinmiş vektörleri indeksten kaldır"""
+        if self.index is None:
+            return
+        self._ensure_writable()
+        self._rebuild()
+    
+    def count(self) -> int:
+        """Kayıt sayısı"""
+        return self.store.count()
+    
+    def clear(self):
+        """Tüm vektörleri ve dokümanları sil"""
+        self.store.clear()
+        self.index = None
+        self._mmapped = False
+        self._dirty = False
+        if self.index_path.exists():
+            self.index_path.unlink()
+    
+    def persist(self):
+        """Değişen indeksi diske atomik olarak yaz"""
+        if not self._dirty or self.index is None:
+            return
+        tmp_path = self.index_path.with_suffix('.tmp')
+        faiss.write_index(self.index, str(tmp_path))
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+    
+    def get_stats(self) -> Dict:
+        """Backend bilgileri"""
+        return {
+            'backend': self.name,
+            'index_type': self.index_type,
+            'ivf_trained': self.index is not None and self._is_ivf(),
+            'vectors': self.index.ntotal if self.index is not None else 0,
+            'tombstones': self.store.tombstone_count(),
+            'memory_mapped': self._mmapped
+        }
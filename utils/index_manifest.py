@@ -0,0 +1,115 @@
+"""
+İndekslenmiş dosyaların kaydını tutan manifest modülü
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Dosya içeriğinin SHA-256 özetini bloklar halinde okuyarak hesaplar"""
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+class IndexManifest:
+    """
+    Her indekslenmiş dosya için yol, boyut, değiştirilme zamanı, içerik özeti,
+    chunk ayarları ve oluşturulan chunk ID'lerini saklar
+    """
+    
+    def __init__(self, manifest_path: str):
+        """
+        IndexManifest initialization
+        
+        Args:
+            manifest_path (str): Manifest JSON dosyasının yolu
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+    
+    @staticmethod
+    def normalize_path(file_path: str) -> str:
+        """Manifest anahtarı olarak kullanılan mutlak yol"""
+        return str(Path(file_path).resolve())
+    
+    def load(self):
+        """Manifest'i diskten yükle"""
+        try:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('files', {})
+        except Exception as e:
+            print(f"Manifest okuma hatası: {e}")
+            self.entries = {}
+    
+    def save(self) -> bool:
+        """Manifest'i diske atomik olarak yaz"""
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+            return True
+        except Exception as e:
+            print(f"Manifest yazma hatası: {e}")
+            return False
+    
+    def get(self, file_path: str) -> Optional[Dict]:
+        """Dosyanın manifest kaydını döndürür"""
+        return self.entries.get(self.normalize_path(file_path))
+    
+    def is_unchanged(self, file_path: str, chunk_size: int, overlap: int) -> bool:
+        """
+        Dosya son indekslemeden beri değişmediyse True döndürür
+        
+        Boyut ve değiştirilme zamanı aynıysa dosya okunmaz; farklıysa içerik
+        özeti karşılaştırılır (örn. yalnızca dokunulmuş dosyalar).
+        """
+        entry = self.get(file_path)
+        if not entry or entry.get('chunk_size') != chunk_size or entry.get('overlap') != overlap:
+            return False
+        
+        stat = os.stat(file_path)
+        if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return True
+        
+        if entry['sha256'] == file_sha256(file_path):
+            entry['size'] = stat.st_size
+            entry['mtime'] = stat.st_mtime
+            return True
+        
+        return False
+    
+    def record(self, file_path: str, chunk_ids: List[str], chunk_size: int, overlap: int):
+        """Dosyanın indekslendiğini kaydet"""
+        stat = os.stat(file_path)
+        self.entries[self.normalize_path(file_path)] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': file_sha256(file_path),
+            'chunk_size': chunk_size,
+            'overlap': overlap,
+            'chunk_ids': chunk_ids,
+            'indexed_at': datetime.now().isoformat()
+        }
+    
+    def remove(self, file_path: str) -> Optional[Dict]:
+        """Dosyanın kaydını sil ve döndür"""
+        return self.entries.pop(self.normalize_path(file_path), None)
+    
+    def paths_under(self, directory_path: str) -> List[str]:
+        """Klasörün doğrudan altındaki kayıtlı dosya yolları"""
+        directory = self.normalize_path(directory_path)
+        return [path for path in self.entries if os.path.dirname(path) == directory]
+    
+    def clear(self):
+        """Tüm kayıtları sil"""
+        self.entries = {}
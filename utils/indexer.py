@@ -3,82 +3,313 @@ PDF dosyalarını indeksleme ve vektör veritabanına ekleme modülü
 """
 
 import os
-import uuid
+import json
+import time
+import hashlib
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 from .pdf_processor import PDFProcessor
+from .chunks import ChunkedText
 from .vector_db import VectorDatabase
+from .index_manifest import IndexManifest
+
+def chunk_ids(file_path: str, chunks: Iterable[str]) -> List[str]:
+    """
+    Kaynak dosya ve chunk içeriğinden türetilen deterministik chunk ID'leri
+    
+    ID "{dosya adı}_{yol özeti}_{içerik özeti}" biçimindedir; aynı dosyada
+    tekrarlanan chunk'lara sıra numarası eklenir. Düzeltilen bir raporda
+    değişmeyen chunk'lar aynı ID'yi aldığı için yeniden yazılmaz.
+    
+    Args:
+        file_path (str): PDF dosya yolu
+        chunks (Iterable[str]): Chunk metinleri
+        
+    Returns:
+        List[str]: Chunk ID'leri
+    """
+    source_digest = hashlib.sha256(IndexManifest.normalize_path(file_path).encode('utf-8')).hexdigest()[:8]
+    prefix = f"{Path(file_path).stem}_{source_digest}"
+    seen = {}
+    ids = []
+    for chunk in chunks:
+        digest = hashlib.sha256(chunk.encode('utf-8')).hexdigest()[:16]
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(f"{prefix}_{digest}_{occurrence}" if occurrence else f"{prefix}_{digest}")
+    return ids
 
 class DocumentIndexer:
     """PDF dosyalarını işleyip vektör veritabanına ekleyen sınıf"""
     
-    def __init__(self, vector_db: VectorDatabase = None, api_key: str = None):
+    def __init__(self, vector_db: VectorDatabase = None, api_key: str = None, manifest_path: str = None,
+                 embedding_workers: int = 1, requests_per_minute: float = None, tokens_per_minute: float = None,
+                 backend: str = "chroma", backend_options: Dict = None, embedding_dimensions: int = None,
+                 dimension_reduction: str = "api", dedup_threshold: float = 0.85):
         """
         DocumentIndexer initialization
         
         Args:
             vector_db (VectorDatabase): Mevcut VectorDatabase instance
             api_key (str): Gemini API key
+            manifest_path (str): İndeks manifest dosyası (varsayılan: veritabanı klasörü)
+            embedding_workers (int): Yeni VectorDatabase için eşzamanlı embedding isteği sayısı
+            requests_per_minute (float): Yeni VectorDatabase için istek/dakika kotası
+            tokens_per_minute (float): Yeni VectorDatabase için token/dakika kotası
+            backend (str): Yeni VectorDatabase için indeks backend'i
+            backend_options (Dict): Yeni VectorDatabase için backend ayarları
+            embedding_dimensions (int): Yeni VectorDatabase için saklanacak embedding boyutu
+            dimension_reduction (str): Yeni VectorDatabase için boyut indirgeme yöntemi ("api", "pca")
+            dedup_threshold (float): Yakın kopya sayılacak Jaccard benzerliği (0 = kopya ayıklama kapalı)
         """
         self.pdf_processor = PDFProcessor()
-        self.vector_db = vector_db or VectorDatabase(api_key=api_key)
+        self.vector_db = vector_db or VectorDatabase(
+            api_key=api_key,
+            embedding_workers=embedding_workers,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            backend=backend,
+            backend_options=backend_options,
+            embedding_dimensions=embedding_dimensions,
+            dimension_reduction=dimension_reduction
+        )
+        self.manifest = IndexManifest(manifest_path or self.vector_db.db_path / "index_manifest.json")
+        self.deduplicator = None
+        if dedup_threshold:
+            from .near_duplicates import NearDuplicateIndex
+            self.deduplicator = NearDuplicateIndex(
+                self.vector_db.db_path / "near_duplicates.sqlite3", threshold=dedup_threshold
+            )
+        # İşlenmekte olan pencerenin MinHash imzaları (chunk ID -> imza) ve ön
+        # yüklenen embedding'leri (metin -> embedding); yazma adımı bunları
+        # yeniden hesaplamadan kullanır
+        self._window_signatures = {}
+        self._window_embeddings = {}
+        self.reset_dedup_stats()
     
-    def index_single_file(self, file_path: str, chunk_size: int = 1000, overlap: int = 200) -> int:
+    def index_single_file(self, file_path: str, chunk_size: int = 1000, overlap: int = 200,
+                          processed_data: Dict = None, persist: bool = True) -> int:
         """
         Tek bir PDF dosyasını indeksle
         
+        Chunk ID'leri içerikten türetildiği için dosya yeniden indekslendiğinde
+        yalnızca değişen chunk'lar yazılır ve artık bulunmayanlar silinir.
+        
         Args:
             file_path (str): PDF dosya yolu
             chunk_size (int): Chunk boyutu
             overlap (int): Örtüşme miktarı
+            processed_data (Dict): Daha önce işlenmiş PDF verisi (None = dosyayı işle)
+            persist (bool): İndeksi ve manifest'i hemen diske yaz (False = çağıran taraf yazar)
             
         Returns:
-            int: Eklenen chunk sayısı
+            int: İndeksteki güncel chunk sayısı
         """
         try:
             # PDF'i işle
-            processed_data = self.pdf_processor.process_pdf_file(file_path, chunk_size, overlap)
+            if processed_data is None:
+                processed_data = self.pdf_processor.process_pdf_file(file_path, chunk_size, overlap)
             
-            # Her chunk için dokuman oluştur
-            documents = []
-            base_filename = Path(file_path).stem
+            # Her chunk için içerikten ID ve metadata oluştur; chunk metinleri
+            # ChunkedText içinde kalır ve yalnızca gerektiğinde üretilir
+            chunks = processed_data['chunks']
+            ids = chunk_ids(file_path, chunks)
+            metadatas = []
+            indexed_at = int(time.time())
             
-            for i, chunk in enumerate(processed_data['chunks']):
-                doc_id = f"{base_filename}_chunk_{i}_{uuid.uuid4().hex[:8]}"
-                
-                metadata = {
+            for i in range(len(chunks)):
+                metadatas.append({
                     'source_file': processed_data['metadata']['filename'],
                     'file_path': file_path,
                     'chunk_index': i,
                     'total_chunks': processed_data['metadata']['total_chunks'],
                     'file_size': processed_data['metadata']['file_size'],
-                    'document_type': 'social_service_report'
-                }
-                
-                documents.append({
-                    'id': doc_id,
-                    'text': chunk,
-                    'metadata': metadata
+                    'document_type': 'social_service_report',
+                    'indexed_at': indexed_at
                 })
             
-            # Veritabanına ekle
-            added_count = self.vector_db.add_multiple_documents(documents)
+            # Silme ve yazma grupları indeksi tek tek diske yazmaz
+            with self.vector_db.defer_persist():
+                # Dosya daha önce indekslendiyse artık bulunmayan chunk'larını kaldır
+                previous_entry = self.manifest.get(file_path)
+                if previous_entry:
+                    current_ids = set(ids)
+                    self.delete_chunks([doc_id for doc_id in previous_entry['chunk_ids'] if doc_id not in current_ids])
+                
+                # Veritabanına yaz (yakın kopyalar embed edilmeden kanonik chunk'a bağlanır)
+                if self.deduplicator:
+                    added_count = self._add_deduplicated(chunks, ids, metadatas)
+                else:
+                    added_count = self.vector_db.add_chunks(chunks, ids, metadatas, ignore_metadata_keys=('indexed_at',),
+                                                            embeddings=self._window_embeddings)
+            
+            # Eksik chunk'ı olan dosya kaydedilmez; sonraki artımlı çalıştırma yeniden dener
+            if added_count == len(ids):
+                self.manifest.record(file_path, ids, chunk_size, overlap)
+            else:
+                self.manifest.remove(file_path)
+            if persist:
+                self.checkpoint()
             
-            print(f"✅ {file_path} dosyasından {added_count}/{len(documents)} chunk eklendi")
+            print(f"✅ {file_path} dosyasından {added_count}/{len(chunks)} chunk indekste")
             return added_count
             
         except Exception as e:
             print(f"❌ {file_path} dosyası indekslenirken hata: {e}")
             return 0
     
-    def index_directory(self, directory_path: str, chunk_size: int = 1000, overlap: int = 200) -> Dict:
+    def _add_deduplicated(self, chunks: ChunkedText, ids: List[str], metadatas: List[Dict]) -> int:
+        """
+        Chunk'ları yakın kopyaları ayıklayarak yazar; indeksteki chunk sayısını döndürür
+        
+        Kopyalar kendi metni ve metadata'sıyla saklanır (metadata filtreleri
+        onları da bulur), vektörleri ise kanonik chunk'ın metninden üretilir;
+        bu embedding önbellekte veya aynı yazma çağrısında bulunuyorsa yeni
+        istek gönderilmez.
+        """
+        # Önceki çalıştırmalardan bilinen ID'ler yeniden karşılaştırılmaz
+        known = self.deduplicator.lookup(ids)
+        fresh = [i for i, doc_id in enumerate(ids) if doc_id not in known]
+        duplicates, signatures = self.deduplicator.deduplicate([ids[i] for i in fresh], (chunks[i] for i in fresh),
+                                                               self._window_signatures)
+        links = {doc_id: canonical_id for doc_id, canonical_id in known.items() if canonical_id != doc_id}
+        links.update(duplicates)
+        
+        # Kanonik chunk ya bu dosyayla birlikte yazılır ya da veritabanında bulunmalıdır
+        rows = {doc_id: i for i, doc_id in enumerate(ids)}
+        canonical_texts = {
+            doc_id: record['document']
+            for doc_id, record in self.vector_db.backend.get(list(set(links.values()))).items()
+        }
+        canonical_texts.update({doc_id: chunks[rows[doc_id]] for doc_id in signatures})
+        broken = [doc_id for doc_id, canonical_id in links.items() if canonical_id not in canonical_texts]
+        if broken:
+            # Bağlı olduğu kanonik chunk kalmamış kopyalar kendi embedding'leriyle yazılır
+            self.deduplicator.release([doc_id for doc_id in broken if doc_id in known])
+            for doc_id in broken:
+                del links[doc_id]
+                signature = self._window_signatures.get(doc_id)
+                signatures[doc_id] = signature if signature is not None else \
+                    self.deduplicator.signature(chunks[rows[doc_id]])
+        
+        documents = []
+        for i, doc_id in enumerate(ids):
+            document = {'id': doc_id, 'text': chunks[i], 'metadata': metadatas[i]}
+            if doc_id in links:
+                document['embedding_text'] = canonical_texts[links[doc_id]]
+            documents.append(document)
+        reused_before = dict(self.vector_db.reused_embeddings)
+        current = self.vector_db.upsert_documents(documents, ignore_metadata_keys=('indexed_at',),
+                                                  embeddings=self._window_embeddings)
+        self.deduplicator.retain([doc_id for doc_id, canonical_id in known.items() if canonical_id == doc_id])
+        
+        # Yalnızca gerçekten yazılan chunk'lar kaydedilir
+        stored = set(self.vector_db.backend.get(list(signatures) + list(links)))
+        new_links = {
+            doc_id: canonical_id for doc_id, canonical_id in links.items()
+            if doc_id not in known and doc_id in stored and (canonical_id in stored or canonical_id not in signatures)
+        }
+        source_file = metadatas[0]['source_file'] if metadatas else None
+        self.deduplicator.register({doc_id: signatures[doc_id] for doc_id in signatures if doc_id in stored},
+                                   new_links, source_file)
+        
+        self.dedup_stats['chunks'] += len(ids)
+        self.dedup_stats['duplicates'] += sum(1 for doc_id in links if doc_id in stored)
+        reused = self.vector_db.reused_embeddings
+        self.dedup_stats['embedding_texts_saved'] += reused['texts'] - reused_before['texts']
+        self.dedup_stats['index_bytes_saved'] += reused['cache_bytes'] - reused_before['cache_bytes']
+        return current
+    
+    def reset_dedup_stats(self):
+        """Çalıştırma başına kopya ayıklama istatistiklerini sıfırla"""
+        self.dedup_stats = {'chunks': 0, 'duplicates': 0, 'embedding_texts_saved': 0, 'index_bytes_saved': 0}
+    
+    def get_dedup_stats(self) -> Dict:
+        """
+        Son çalıştırmanın kopya ayıklama istatistikleri
+        
+        Returns:
+            Dict: chunks, duplicates, dedup_ratio, embedding_texts_saved (kanonik
+                chunk'ın embedding'i kullanıldığı için API'ye gönderilmeyen metin
+                sayısı) ve index_bytes_saved (bu kopyalar için embedding önbelleği
+                indeksine yazılmayan vektör baytları; önbellek kapalıysa 0)
+        """
+        chunks = self.dedup_stats['chunks']
+        duplicates = self.dedup_stats['duplicates']
+        return {
+            'chunks': chunks,
+            'duplicates': duplicates,
+            'dedup_ratio': duplicates / chunks if chunks else 0.0,
+            'embedding_texts_saved': self.dedup_stats['embedding_texts_saved'],
+            'index_bytes_saved': self.dedup_stats['index_bytes_saved']
+        }
+    
+    def checkpoint(self):
+        """
+        İndeksi ve ardından manifest'i diske yaz
+        
+        Manifest indeksten sonra yazılır; böylece manifest'te kayıtlı bir
+        dosyanın vektörleri her zaman diskte bulunur.
+        """
+        self.vector_db.persist()
+        self.manifest.save()
+    
+    def delete_file(self, file_path: str) -> int:
+        """
+        Bir dosyanın tüm chunk'larını veritabanından kaldır
+        
+        Chunk'lar manifest kaydından ve file_path metadata'sından bulunur; aynı
+        adlı fakat başka klasördeki dosyalar etkilenmez. Kopya bağlantıları
+        bırakılır ve manifest kaydı silinir, böylece dosya geri eklendiğinde
+        yeniden indekslenir.
+        
+        Args:
+            file_path (str): PDF dosya yolu
+            
+        Returns:
+            int: Silinen chunk sayısı
+        """
+        entry = self.manifest.remove(file_path)
+        chunk_ids = set(entry['chunk_ids']) if entry else set()
+        paths = list(dict.fromkeys([file_path, IndexManifest.normalize_path(file_path)]))
+        try:
+            chunk_ids.update(self.vector_db.backend.filter_ids({'file_path': {'$in': paths}}))
+        except Exception as e:
+            print(f"Dosya chunk'ları bulunamadı: {e}")
+        
+        self.manifest.save()
+        if chunk_ids and not self.delete_chunks(list(chunk_ids)):
+            return 0
+        return len(chunk_ids)
+    
+    def delete_chunks(self, chunk_ids: List[str]) -> bool:
+        """
+        Bir dosyanın chunk'larını sil
+        
+        Kopya bağlantıları bırakılır; silinen kanonik chunk'ın imzası başka
+        dosyalardaki kopyalarından birine devredilir.
+        """
+        if self.deduplicator:
+            chunk_ids = self.deduplicator.release(chunk_ids)
+        return self.vector_db.delete_documents(chunk_ids) if chunk_ids else True
+    
+    def index_directory(self, directory_path: str, chunk_size: int = 1000, overlap: int = 200,
+                        incremental: bool = True, persist_every: int = 50) -> Dict:
         """
         Bir klasördeki tüm PDF dosyalarını indeksle
         
+        Artımlı modda manifest'e göre değişmemiş dosyalar atlanır, değişen
+        dosyaların eski chunk'ları yenileriyle değiştirilir ve klasörden
+        silinmiş dosyaların chunk'ları veritabanından kaldırılır.
+        
         Args:
             directory_path (str): Klasör yolu
             chunk_size (int): Chunk boyutu
             overlap (int): Örtüşme miktarı
+            incremental (bool): Değişmemiş dosyaları atla
+            persist_every (int): İndeksin ve manifest'in diske yazılacağı dosya aralığı
+                (indeks ayrıca çalıştırma sonunda bir kez yazılır)
             
         Returns:
             Dict: İndeksleme sonuç raporu
@@ -88,49 +319,103 @@ class DocumentIndexer:
         if not directory.exists():
             raise FileNotFoundError(f"Klasör bulunamadı: {directory_path}")
         
+        # FAISS persist tüm indeksi yeniden yazar; dosya başına değil aralıklarla yazılır
+        with self.vector_db.defer_persist():
+            result = self._index_directory(directory_path, chunk_size, overlap, incremental, persist_every)
+        
+        # is_unchanged yalnızca zaman damgası değişen kayıtları güncelleyebilir
+        self.manifest.save()
+        return result
+    
+    def _index_directory(self, directory_path: str, chunk_size: int, overlap: int, incremental: bool,
+                         persist_every: int) -> Dict:
+        directory = Path(directory_path)
         pdf_files = list(directory.glob("*.pdf"))
         
+        # Klasörden silinmiş dosyaların chunk'larını temizle
+        current_paths = {IndexManifest.normalize_path(str(file_path)) for file_path in pdf_files}
+        removed_files = []
+        for indexed_path in self.manifest.paths_under(directory_path):
+            if indexed_path not in current_paths:
+                self.delete_file(indexed_path)
+                removed_files.append(indexed_path)
+        
+        if removed_files:
+            print(f"🗑️  {len(removed_files)} silinmiş dosyanın chunk'ları kaldırıldı")
+        
         if not pdf_files:
             print(f"⚠️  {directory_path} klasöründe PDF dosyası bulunamadı")
             return {
                 'total_files': 0,
                 'processed_files': 0,
+                'skipped_files': 0,
+                'removed_files': removed_files,
                 'total_chunks': 0,
                 'failed_files': []
             }
         
+        projection = self.vector_db.projection
+        if projection and not projection.is_fitted:
+            self.fit_projection(pdf_files, chunk_size, overlap)
+        
         total_chunks = 0
         processed_files = 0
+        skipped_files = 0
         failed_files = []
+        written_files = 0
+        self.vector_db.embedding_executor.reset_stats()
+        self.reset_dedup_stats()
         
         print(f"📂 {len(pdf_files)} PDF dosyası bulundu")
         print("🔄 İndeksleme başlıyor...")
         
+        pending_files = []
         for file_path in pdf_files:
-            try:
-                chunks_added = self.index_single_file(str(file_path), chunk_size, overlap)
+            if incremental and self.manifest.is_unchanged(str(file_path), chunk_size, overlap):
+                skipped_files += 1
+            else:
+                pending_files.append(file_path)
+        
+        for window in self._file_windows(pending_files, chunk_size, overlap, failed_files):
+            # Pencerenin chunk'ları dosyalar arası dolu gruplar halinde eşzamanlı embed edilir
+            self._window_signatures = {}
+            self._window_embeddings = self._prefetch_embeddings(window)
+            for file_path, processed_data in window:
+                chunks_added = self.index_single_file(str(file_path), chunk_size, overlap, processed_data,
+                                                      persist=False)
                 if chunks_added > 0:
                     total_chunks += chunks_added
                     processed_files += 1
                 else:
                     failed_files.append(str(file_path))
-            except Exception as e:
-                print(f"❌ {file_path.name}: {e}")
-                failed_files.append(str(file_path))
+                
+                written_files += 1
+                if persist_every and written_files % persist_every == 0:
+                    self.checkpoint()
+        self._window_signatures = {}
+        self._window_embeddings = {}
         
         # Sonuç raporu
         result = {
             'total_files': len(pdf_files),
             'processed_files': processed_files,
+            'skipped_files': skipped_files,
+            'removed_files': removed_files,
             'total_chunks': total_chunks,
-            'failed_files': failed_files
+            'failed_files': failed_files,
+            'embedding_stats': self.vector_db.embedding_executor.get_stats(),
+            'dedup_stats': self.get_dedup_stats()
         }
         
         print("\n📊 İndeksleme Raporu:")
         print(f"   📁 Toplam dosya: {result['total_files']}")
         print(f"   ✅ İşlenen dosya: {result['processed_files']}")
+        print(f"   ⏭️  Değişmeyen (atlanan) dosya: {result['skipped_files']}")
+        print(f"   🗑️  Kaldırılan dosya: {len(result['removed_files'])}")
         print(f"   📄 Toplam chunk: {result['total_chunks']}")
         print(f"   ❌ Başarısız: {len(result['failed_files'])}")
+        self.print_embedding_stats(result['embedding_stats'])
+        self.print_dedup_stats(result['dedup_stats'])
         
         if result['failed_files']:
             print("\n⚠️  Başarısız dosyalar:")
@@ -139,17 +424,136 @@ class DocumentIndexer:
         
         return result
     
+    def _file_windows(self, pdf_files: List[Path], chunk_size: int, overlap: int,
+                      failed_files: List[str]) -> Iterable[List[tuple]]:
+        """
+        Dosyaları işleyip toplam chunk sayısı eşzamanlı embedding kapasitesine
+        (embedding_batch_size * işçi sayısı * 2) ulaşan pencereler halinde döndürür
+        """
+        executor = self.vector_db.embedding_executor
+        window_chunks = self.vector_db.embedding_batch_size * executor.max_workers * 2
+        window = []
+        total = 0
+        for file_path in pdf_files:
+            try:
+                processed_data = self.pdf_processor.process_pdf_file(str(file_path), chunk_size, overlap)
+            except Exception as e:
+                print(f"❌ {file_path.name}: {e}")
+                failed_files.append(str(file_path))
+                continue
+            
+            window.append((file_path, processed_data))
+            total += len(processed_data['chunks'])
+            if total >= window_chunks:
+                yield window
+                window, total = [], 0
+        if window:
+            yield window
+    
+    def _prefetch_embeddings(self, window: List[tuple]) -> Dict[str, List[float]]:
+        """
+        Penceredeki dosyaların chunk'larını eşzamanlı embed eder
+        
+        Bir raporun chunk'ları genellikle tek bir embedding grubunu bile
+        doldurmaz; dosyalar tek tek yazılırken her dosya ayrı ve sıralı bir
+        istek olurdu. Yakın kopyalar (kanonik chunk'ın embedding'ini kullanır)
+        ve önbellekteki metinler için istek gönderilmez. Sonuçlar yazma adımına
+        doğrudan verilir; embedding önbelleği açıksa ayrıca oraya da yazılır.
+        
+        Returns:
+            Dict[str, List[float]]: Metin -> embedding
+        """
+        ids, texts = [], []
+        for file_path, processed_data in window:
+            chunks = processed_data['chunks']
+            ids.extend(chunk_ids(str(file_path), chunks))
+            texts.extend(chunks)
+        
+        if self.deduplicator:
+            known = self.deduplicator.lookup(ids)
+            fresh = [i for i, doc_id in enumerate(ids) if doc_id not in known]
+            duplicates, _ = self.deduplicator.deduplicate([ids[i] for i in fresh], (texts[i] for i in fresh),
+                                                          self._window_signatures)
+            texts = [texts[i] for i in fresh if ids[i] not in duplicates]
+        
+        texts = list(dict.fromkeys(texts))
+        batch_size = self.vector_db.embedding_batch_size
+        batches = (texts[start:start + batch_size] for start in range(0, len(texts), batch_size))
+        embeddings = {}
+        for batch, batch_embeddings in self.vector_db.embedding_executor.map_batches(
+                batches, embed=self.vector_db.generate_embeddings):
+            embeddings.update(zip(batch, batch_embeddings))
+        return embeddings
+    
+    def fit_projection(self, pdf_files: List[Path], chunk_size: int = 1000, overlap: int = 200) -> bool:
+        """
+        Dosyalara yayılmış örnek chunk'larla PCA projeksiyonunu hesapla
+        
+        Örnek embedding'ler önbelleğe yazıldığı için indeksleme sırasında
+        aynı chunk'lar için yeniden istek gönderilmez.
+        
+        Args:
+            pdf_files (List[Path]): Örneklenecek PDF dosyaları
+            chunk_size (int): Chunk boyutu
+            overlap (int): Örtüşme miktarı
+            
+        Returns:
+            bool: İşlem başarılı mı
+        """
+        sample_size = self.vector_db.pca_sample_size
+        per_file = max(1, sample_size // max(1, len(pdf_files)))
+        sample = []
+        
+        for file_path in pdf_files:
+            result = self.pdf_processor.process_pdf_file_safe(str(file_path), chunk_size, overlap)
+            if 'error' in result:
+                continue
+            sample.extend(islice(result['chunks'], per_file))
+            if len(sample) >= sample_size:
+                break
+        
+        print(f"📐 PCA projeksiyonu {len(sample)} örnek chunk ile hesaplanıyor...")
+        if self.vector_db.fit_projection(sample):
+            stats = self.vector_db.projection.get_stats()
+            print(f"   ✅ {stats['dimensions']} boyut, açıklanan varyans: {stats['explained_variance_ratio']:.1%}")
+            return True
+        return False
+    
+    def print_embedding_stats(self, stats: Dict):
+        """Embedding verim istatistiklerini yazdır"""
+        if not stats.get('requests'):
+            return
+        print(f"   ⚡ Embedding: {stats['texts']} metin, {stats['requests']} istek, {stats['elapsed_seconds']:.1f} sn")
+        print(f"   ⚡ Verim: {stats['texts_per_second']:.1f} metin/sn, "
+              f"{stats['requests_per_minute']:.0f} istek/dk, {stats['tokens_per_minute']:.0f} token/dk")
+        if stats['rate_limited']:
+            print(f"   ⏳ Hız sınırı: {stats['rate_limited']} kez, {stats['retries']} yeniden deneme")
+    
+    def print_dedup_stats(self, stats: Dict):
+        """Kopya ayıklama istatistiklerini yazdır"""
+        if not stats.get('chunks'):
+            return
+        print(f"   ♻️  Yakın kopya: {stats['duplicates']}/{stats['chunks']} chunk ({stats['dedup_ratio']:.1%}), "
+              f"{stats['embedding_texts_saved']} metin embed edilmedi, "
+              f"{stats['index_bytes_saved'] / 1e6:.2f} MB önbellek tasarrufu")
+    
     def get_database_stats(self) -> Dict:
         """Vektör veritabanı istatistiklerini al"""
         return self.vector_db.get_collection_stats()
     
-    def search_documents(self, query: str, n_results: int = 5) -> List[Dict]:
-        """Dokümanlarda arama yap"""
-        return self.vector_db.search_similar(query, n_results)
+    def search_documents(self, query: str, n_results: int = 5, mode: str = "vector",
+                         where: Optional[Dict] = None) -> List[Dict]:
+        """Dokümanlarda arama yap (where: metadata filtresi)"""
+        return self.vector_db.search_similar(query, n_results, mode, where)
     
     def clear_database(self) -> bool:
         """Veritabanını temizle"""
-        return self.vector_db.clear_collection()
+        if not self.vector_db.clear_collection():
+            return False
+        if self.deduplicator:
+            self.deduplicator.clear()
+        self.manifest.clear()
+        return self.manifest.save()
 
 def main():
     """Standalone indeksleme scripti"""
@@ -160,18 +564,62 @@ def main():
     parser.add_argument("--file", "-f", type=str, help="İndekslenecek tek dosya")
     parser.add_argument("--chunk-size", type=int, default=1000, help="Chunk boyutu")
     parser.add_argument("--overlap", type=int, default=200, help="Örtüşme miktarı")
+    parser.add_argument("--workers", type=int, default=1, help="Eşzamanlı embedding isteği sayısı")
+    parser.add_argument("--rpm", type=float, default=None, help="Embedding istek/dakika kotası")
+    parser.add_argument("--tpm", type=float, default=None, help="Embedding token/dakika kotası")
+    parser.add_argument("--backend", choices=["chroma", "faiss", "numpy", "sharded"], default="chroma", help="Vektör indeks backend'i")
+    parser.add_argument("--index-type", choices=["flat", "ivf", "hnsw"], default="flat", help="FAISS indeks tipi")
+    parser.add_argument("--shards", type=int, default=4, help="Parça sayısı (sharded backend)")
+    parser.add_argument("--shard-backend", choices=["numpy", "faiss"], default="numpy", help="Parçaların backend'i")
+    parser.add_argument("--shard-key", type=str, default=None,
+                        help="Parçalara yönlendiren metadata alanı, örn. document_type (varsayılan: ID özeti)")
+    parser.add_argument("--dimensions", type=int, default=None, help="Saklanacak embedding boyutu (örn. 256)")
+    parser.add_argument("--reduction", choices=["api", "pca"], default="api", help="Boyut indirgeme yöntemi")
+    parser.add_argument("--dedup-threshold", type=float, default=0.85,
+                        help="Yakın kopya chunk benzerlik eşiği (0 = kapalı)")
+    parser.add_argument("--search", "-s", type=str, help="Veritabanında arama yap")
+    parser.add_argument("--mode", choices=["vector", "lexical", "hybrid"], default="hybrid", help="Arama modu")
+    parser.add_argument("--where", type=str, default=None,
+                        help='Metadata filtresi (JSON), örn. \'{"source_file": "rapor.pdf"}\'')
+    parser.add_argument("--persist-every", type=int, default=50,
+                        help="Klasör indekslenirken indeksin diske yazılacağı dosya aralığı")
+    parser.add_argument("--full", action="store_true", help="Değişmemiş dosyalar dahil tüm klasörü yeniden indeksle")
     parser.add_argument("--clear", action="store_true", help="Veritabanını temizle")
     parser.add_argument("--stats", action="store_true", help="Veritabanı istatistiklerini göster")
+    parser.add_argument("--export-snapshot", type=str, metavar="KLASÖR", help="Koleksiyonu anlık görüntü olarak dışa aktar")
+    parser.add_argument("--import-snapshot", type=str, metavar="KLASÖR", help="Anlık görüntüyü embedding isteği olmadan yükle")
     
     args = parser.parse_args()
     
-    # API key kontrolü
+    # API key kontrolü (sözcüksel arama ve anlık görüntüler ağ isteği göndermez)
     api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    offline = (args.search and args.mode == "lexical") or args.export_snapshot or args.import_snapshot
+    if not api_key and not offline:
         print("❌ GEMINI_API_KEY çevre değişkeni bulunamadı")
         return
     
-    indexer = DocumentIndexer(api_key=api_key)
+    backend_options = None
+    if args.backend == "faiss":
+        backend_options = {'index_type': args.index_type}
+    elif args.backend == "sharded":
+        backend_options = {
+            'shards': args.shards,
+            'shard_backend': args.shard_backend,
+            'shard_key': args.shard_key,
+            'shard_options': {'index_type': args.index_type} if args.shard_backend == "faiss" else None
+        }
+    
+    indexer = DocumentIndexer(
+        api_key=api_key,
+        embedding_workers=args.workers,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        backend=args.backend,
+        backend_options=backend_options,
+        embedding_dimensions=args.dimensions,
+        dimension_reduction=args.reduction,
+        dedup_threshold=args.dedup_threshold
+    )
     
     if args.clear:
         print("🗑️  Veritabanı temizleniyor...")
@@ -187,16 +635,54 @@ def main():
         print(f"   📄 Dokuman sayısı: {stats.get('document_count', 0)}")
         print(f"   📁 Collection: {stats.get('collection_name', 'N/A')}")
         print(f"   💾 Veritabanı yolu: {stats.get('db_path', 'N/A')}")
+        print(f"   🧭 Backend: {stats.get('backend', 'N/A')}"
+              + (f" ({stats['index_type']})" if stats.get('index_type') else ""))
+        if stats.get('shards'):
+            print(f"   🧩 Parçalar: {stats['shards']} x {stats['shard_backend']}, "
+                  f"dağılım {stats['shard_counts']}")
+        cache_stats = stats.get('embedding_cache')
+        if cache_stats:
+            print(f"   🗃️ Embedding önbelleği: {cache_stats['disk_entries']} kayıt")
+        if 'lexical_document_count' in stats:
+            print(f"   🔤 BM25 indeksi: {stats['lexical_document_count']} chunk")
+        return
+    
+    if args.export_snapshot:
+        print(f"📦 Anlık görüntü dışa aktarılıyor: {args.export_snapshot}")
+        manifest = indexer.vector_db.export_snapshot(args.export_snapshot)
+        if manifest:
+            size = sum(info['bytes'] for info in manifest['files'].values())
+            print(f"✅ {manifest['count']} kayıt, {size / 1e6:.1f} MB")
+        else:
+            print("❌ Dışa aktarma başarısız")
+        return
+    
+    if args.import_snapshot:
+        print(f"📦 Anlık görüntü yükleniyor: {args.import_snapshot}")
+        loaded = indexer.vector_db.import_snapshot(args.import_snapshot)
+        print(f"✅ {loaded} yeni kayıt yüklendi, toplam {indexer.vector_db.backend.count()} kayıt")
+        return
+    
+    if args.search:
+        print(f"🔍 Arama ({args.mode}): {args.search}")
+        where = json.loads(args.where) if args.where else None
+        for i, result in enumerate(indexer.search_documents(args.search, 5, args.mode, where), 1):
+            source = result['metadata'].get('source_file', result['id'])
+            print(f"   {i}. {source}: {result['document'][:120].replace(chr(10), ' ')}")
         return
     
     if args.file:
         print(f"📄 Tek dosya indeksleniyor: {args.file}")
         chunks_added = indexer.index_single_file(args.file, args.chunk_size, args.overlap)
         print(f"✅ {chunks_added} chunk eklendi")
+        indexer.print_embedding_stats(indexer.vector_db.embedding_executor.get_stats())
+        indexer.vector_db.close()
     
     elif args.directory:
         print(f"📂 Klasör indeksleniyor: {args.directory}")
-        result = indexer.index_directory(args.directory, args.chunk_size, args.overlap)
+        result = indexer.index_directory(args.directory, args.chunk_size, args.overlap, incremental=not args.full,
+                                         persist_every=args.persist_every)
+        indexer.vector_db.close()
         print("✅ İndeksleme tamamlandı")
     
     else:
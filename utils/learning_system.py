@@ -6,7 +6,6 @@ import json
 import os
 from datetime import datetime
 from typing import Dict, List
-import google.generativeai as genai
 
 class LearningSystem:
     """AI'ın sürekli öğrenmesini sağlayan sistem"""
@@ -18,6 +17,8 @@ class LearningSystem:
         Args:
             api_key (str): Gemini API anahtarı
         """
+        import google.generativeai as genai
+        
         if api_key:
             genai.configure(api_key=api_key)
         elif os.getenv("GEMINI_API_KEY"):
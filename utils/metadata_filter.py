@@ -0,0 +1,102 @@
+"""
+Chunk metadata filtreleri modülü
+
+Filtreler ChromaDB'nin `where` sözdizimini kullanır:
+    
+    {"source_file": "rapor.pdf"}
+    {"document_type": {"$in": ["social_service_report", "ek"]}}
+    {"chunk_index": {"$gte": 2, "$lt": 10}, "indexed_at": {"$gt": 1700000000}}
+    {"$or": [{"source_file": "a.pdf"}, {"source_file": "b.pdf"}]}
+
+Desteklenen operatörler: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and, $or.
+"""
+
+from typing import Any, Dict, List
+
+COMPARISON_OPERATORS = ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte")
+
+def normalize_where(where: Dict) -> Dict:
+    """
+    Filtreyi her düğümde tek anahtar ve tek operatör içeren biçime getirir
+    
+    Örn. {"a": 1, "b": {"$gte": 2, "$lt": 5}} ->
+    {"$and": [{"a": {"$eq": 1}}, {"b": {"$gte": 2}}, {"b": {"$lt": 5}}]}
+    
+    Args:
+        where (Dict): Filtre
+    
+    Returns:
+        Dict: Normalize edilmiş filtre
+    """
+    if not isinstance(where, dict) or not where:
+        raise ValueError(f"Geçersiz filtre: {where!r}")
+    
+    clauses = []
+    for key, value in where.items():
+        if key in ("$and", "$or"):
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"{key} boş olmayan bir liste olmalı")
+            items = [normalize_where(item) for item in value]
+            clauses.append(items[0] if len(items) == 1 else {key: items})
+        elif key.startswith("$"):
+            raise ValueError(f"Bilinmeyen mantıksal operatör: {key}")
+        elif isinstance(value, dict):
+            if not value:
+                raise ValueError(f"{key} için operatör belirtilmeli")
+            for operator, operand in value.items():
+                if operator not in COMPARISON_OPERATORS:
+                    raise ValueError(f"Bilinmeyen operatör: {operator}")
+                if operator in ("$in", "$nin") and not isinstance(operand, (list, tuple)):
+                    raise ValueError(f"{operator} bir liste olmalı")
+                clauses.append({key: {operator: list(operand) if operator in ("$in", "$nin") else operand}})
+        else:
+            clauses.append({key: {"$eq": value}})
+    
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+def matches(where: Dict, metadata: Dict) -> bool:
+    """
+    Metadata filtreyle eşleşiyor mu (normalize edilmiş filtre beklenir)
+    
+    Args:
+        where (Dict): normalize_where çıktısı
+        metadata (Dict): Chunk metadata'sı
+    
+    Returns:
+        bool: Eşleşme durumu
+    """
+    if "$and" in where:
+        return all(matches(clause, metadata) for clause in where["$and"])
+    if "$or" in where:
+        return any(matches(clause, metadata) for clause in where["$or"])
+    
+    (key, condition), = where.items()
+    (operator, operand), = condition.items()
+    if key not in metadata:
+        return False
+    value = metadata[key]
+    
+    try:
+        if operator == "$eq":
+            return value == operand
+        if operator == "$ne":
+            return value != operand
+        if operator == "$in":
+            return value in operand
+        if operator == "$nin":
+            return value not in operand
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        return value <= operand
+    except TypeError:
+        return False
+
+def split_values(values: List[Any]):
+    """Değerleri metin ve sayı olarak ayırır (ikincil indeks sütunları için)"""
+    texts = [value for value in values if isinstance(value, str)]
+    numbers = [float(value) for value in values if isinstance(value, (int, float))]
+    return texts, numbers
@@ -0,0 +1,302 @@
+"""
+İndeksleme öncesi yakın kopya (near-duplicate) chunk tespiti modülü (MinHash + LSH)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .bm25_index import tokenize
+
+# 2^32'den büyük asal; 32 bitlik shingle özetleriyle a * x + b taşmadan hesaplanır
+_PRIME = 4294967311
+
+class NearDuplicateIndex:
+    """
+    Chunk'ların MinHash imzalarını LSH bantlarıyla indeksler
+    
+    Raporlardaki başlıklar, mevzuat metinleri ve şablon paragraflar çok sayıda
+    dosyada tekrarlanır. Tahmini Jaccard benzerliği threshold'u aşan chunk
+    yeniden embed edilmez; mevcut kanonik chunk'a bağlanır ve kendi metni ve
+    metadata'sıyla, kanonik chunk'ın embedding'i kullanılarak saklanır. Kanonik
+    chunk silindiğinde imzası kopyalarından birine devredilir.
+    """
+    
+    def __init__(self, db_path: str, threshold: float = 0.85, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3):
+        """
+        NearDuplicateIndex initialization
+        
+        Args:
+            db_path (str): SQLite dosyasının yolu
+            threshold (float): Kopya sayılacak en düşük tahmini Jaccard benzerliği
+            num_perm (int): MinHash permütasyon sayısı
+            bands (int): LSH bant sayısı (num_perm'i tam bölmeli)
+            shingle_size (int): Kelime n-gram uzunluğu
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) bant sayısına ({bands}) tam bölünmeli")
+        
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        # İmzalar kalıcı olduğu için permütasyonlar sabit tohumla üretilir
+        rng = np.random.default_rng(20240601)
+        self._a = rng.integers(1, 2 ** 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 31, num_perm, dtype=np.uint64)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                released INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, id TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_bands_id ON bands(id);
+            CREATE TABLE IF NOT EXISTS duplicates (
+                id TEXT PRIMARY KEY,
+                canonical_id TEXT NOT NULL,
+                source_file TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_duplicates_canonical ON duplicates(canonical_id);
+        """)
+        self._connection.commit()
+    
+    def signature(self, text: str) -> np.ndarray:
+        """Metnin kelime n-gram'larından MinHash imzası"""
+        tokens = tokenize(text, stem_length=0)
+        size = self.shingle_size
+        shingles = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+    
+    def _buckets(self, signature: np.ndarray) -> List[int]:
+        buckets = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8)
+            buckets.append(int.from_bytes(digest.digest(), 'little', signed=True))
+        return buckets
+    
+    def deduplicate(self, ids: Sequence[str], texts: Iterable[str],
+                    signature_cache: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Dict[str, str], Dict[str, np.ndarray]]:
+        """
+        Chunk'ları indeksteki ve aynı gruptaki önceki chunk'larla karşılaştırır
+        
+        İndeks değiştirilmez; chunk'lar eklendikten sonra register çağrılmalıdır.
+        
+        Args:
+            ids (Sequence[str]): Chunk ID'leri
+            texts (Iterable[str]): Chunk metinleri
+            signature_cache (Optional[Dict[str, np.ndarray]]): ID -> imza; bulunan
+                imzalar yeniden hesaplanmaz, hesaplananlar sözlüğe eklenir
+        
+        Returns:
+            Tuple[Dict[str, str], Dict[str, np.ndarray]]: (kopya ID -> kanonik ID,
+                yeni kanonik ID -> imza)
+        """
+        duplicates = {}
+        signatures = {}
+        pending = {}
+        
+        for doc_id, text in zip(ids, texts):
+            signature = signature_cache.get(doc_id) if signature_cache is not None else None
+            if signature is None:
+                signature = self.signature(text)
+                if signature_cache is not None:
+                    signature_cache[doc_id] = signature
+            buckets = self._buckets(signature)
+            
+            candidates = set()
+            for band, bucket in enumerate(buckets):
+                candidates.update(pending.get((band, bucket), ()))
+            candidates.update(self._indexed_candidates(buckets))
+            
+            canonical_id = self._best_match(signature, candidates, signatures)
+            if canonical_id:
+                duplicates[doc_id] = canonical_id
+                continue
+            
+            signatures[doc_id] = signature
+            for band, bucket in enumerate(buckets):
+                pending.setdefault((band, bucket), []).append(doc_id)
+        
+        return duplicates, signatures
+    
+    def _indexed_candidates(self, buckets: List[int]) -> List[str]:
+        condition = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        with self._lock:
+            rows = self._connection.execute(f"SELECT DISTINCT id FROM bands WHERE {condition}", params).fetchall()
+        return [doc_id for (doc_id,) in rows]
+    
+    def _best_match(self, signature: np.ndarray, candidates: Iterable[str],
+                    pending_signatures: Dict[str, np.ndarray]) -> Optional[str]:
+        candidates = list(candidates)
+        stored = [doc_id for doc_id in candidates if doc_id not in pending_signatures]
+        if stored:
+            placeholders = ",".join("?" * len(stored))
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT id, signature FROM signatures WHERE id IN ({placeholders})", stored
+                ).fetchall()
+            candidate_signatures = {doc_id: np.frombuffer(blob, dtype=np.uint64) for doc_id, blob in rows}
+        else:
+            candidate_signatures = {}
+        candidate_signatures.update({doc_id: pending_signatures[doc_id]
+                                     for doc_id in candidates if doc_id in pending_signatures})
+        
+        best_id, best_similarity = None, self.threshold
+        for doc_id, candidate in candidate_signatures.items():
+            similarity = float(np.mean(candidate == signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = doc_id, similarity
+        return best_id
+    
+    def lookup(self, ids: Iterable[str]) -> Dict[str, str]:
+        """
+        İndekste zaten bulunan ID'ler
+        
+        Returns:
+            Dict[str, str]: ID -> kanonik ID (kanonik chunk'lar kendilerine eşlenir)
+        """
+        ids = list(ids)
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                found.update(self._connection.execute(
+                    f"SELECT id, id FROM signatures WHERE id IN ({placeholders}) "
+                    f"UNION ALL SELECT id, canonical_id FROM duplicates WHERE id IN ({placeholders})", part + part
+                ).fetchall())
+        return found
+    
+    def retain(self, ids: Iterable[str]):
+        """Yeniden indekslenen dosyanın kanonik chunk'larını tekrar sahiplen (released bayrağını kaldır)"""
+        with self._lock:
+            self._connection.executemany("UPDATE signatures SET released = 0 WHERE id = ?", [(doc_id,) for doc_id in ids])
+            self._connection.commit()
+    
+    def register(self, signatures: Dict[str, np.ndarray], duplicates: Dict[str, str],
+                 source_file: Optional[str] = None):
+        """
+        Veritabanına eklenen kanonik chunk'ları ve kopya bağlantılarını kaydet
+        
+        Args:
+            signatures (Dict[str, np.ndarray]): Kanonik chunk ID -> imza
+            duplicates (Dict[str, str]): Kopya chunk ID -> kanonik chunk ID
+            source_file (Optional[str]): Kopyaların kaynak dosyası
+        """
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO signatures (id, signature, released) VALUES (?, ?, 0)",
+                [(doc_id, signature.tobytes()) for doc_id, signature in signatures.items()]
+            )
+            self._connection.executemany(
+                "INSERT INTO bands (band, bucket, id) VALUES (?, ?, ?)",
+                [(band, bucket, doc_id) for doc_id, signature in signatures.items()
+                 for band, bucket in enumerate(self._buckets(signature))]
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO duplicates (id, canonical_id, source_file) VALUES (?, ?, ?)",
+                [(doc_id, canonical_id, source_file) for doc_id, canonical_id in duplicates.items()]
+            )
+            self._connection.commit()
+    
+    def release(self, ids: Iterable[str]) -> List[str]:
+        """
+        Silinen chunk'ları bırakır
+        
+        Kopya bağlantıları kaldırılır. Kopyaları kalan kanonik chunk'ın imzası
+        kopyalardan birine devredilir; böylece yeni chunk'lar kalan kopyalarla
+        eşleşmeye devam eder. Diğer kanonik chunk'lar indeksten çıkarılır.
+        
+        Args:
+            ids (Iterable[str]): Silinen chunk ID'leri
+        
+        Returns:
+            List[str]: Vektör veritabanından silinebilecek chunk ID'leri (verilen
+                ID'ler ve eski sürümlerin yalnızca kopyaları için tuttuğu kanonik chunk'lar)
+        """
+        ids = list(ids)
+        removable = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                linked = self._connection.execute(
+                    f"SELECT id, canonical_id FROM duplicates WHERE id IN ({placeholders})", part
+                ).fetchall()
+                self._connection.execute(f"DELETE FROM duplicates WHERE id IN ({placeholders})", part)
+                duplicate_ids = {doc_id for doc_id, _ in linked}
+                
+                for doc_id in part:
+                    if doc_id in duplicate_ids:
+                        continue
+                    heir = self._connection.execute(
+                        "SELECT id FROM duplicates WHERE canonical_id = ? LIMIT 1", (doc_id,)
+                    ).fetchone()
+                    if heir:
+                        self._promote(doc_id, heir[0])
+                    else:
+                        self._forget(doc_id)
+                
+                # Eski sürümlerde sahibi silinip kopyaları için tutulan kanonik chunk'lar
+                for canonical_id in {canonical_id for _, canonical_id in linked}:
+                    released = self._connection.execute(
+                        "SELECT released FROM signatures WHERE id = ?", (canonical_id,)
+                    ).fetchone()
+                    if released and released[0] and not self._has_duplicates(canonical_id):
+                        self._forget(canonical_id)
+                        removable.append(canonical_id)
+            self._connection.commit()
+        return removable
+    
+    def _promote(self, canonical_id: str, heir_id: str):
+        # İmza ve bantlar kopyaya taşınır, diğer kopyalar ona bağlanır
+        self._connection.execute("UPDATE signatures SET id = ?, released = 0 WHERE id = ?", (heir_id, canonical_id))
+        self._connection.execute("UPDATE bands SET id = ? WHERE id = ?", (heir_id, canonical_id))
+        self._connection.execute("DELETE FROM duplicates WHERE id = ?", (heir_id,))
+        self._connection.execute("UPDATE duplicates SET canonical_id = ? WHERE canonical_id = ?",
+                                 (heir_id, canonical_id))
+    
+    def _has_duplicates(self, canonical_id: str) -> bool:
+        return self._connection.execute(
+            "SELECT 1 FROM duplicates WHERE canonical_id = ? LIMIT 1", (canonical_id,)
+        ).fetchone() is not None
+    
+    def _forget(self, doc_id: str):
+        self._connection.execute("DELETE FROM signatures WHERE id = ?", (doc_id,))
+        self._connection.execute("DELETE FROM bands WHERE id = ?", (doc_id,))
+    
+    def get_stats(self) -> Dict:
+        """İndeks bilgileri"""
+        with self._lock:
+            canonical = self._connection.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+            duplicates = self._connection.execute("SELECT COUNT(*) FROM duplicates").fetchone()[0]
+        return {
+            'threshold': self.threshold,
+            'canonical_chunks': canonical,
+            'duplicate_chunks': duplicates
+        }
+    
+    def clear(self):
+        """İndeksi temizle"""
+        with self._lock:
+            self._connection.execute("DELETE FROM signatures")
+            self._connection.execute("DELETE FROM bands")
+            self._connection.execute("DELETE FROM duplicates")
+            self._connection.commit()
@@ -0,0 +1,405 @@
+"""
+NumPy kaba kuvvet (brute-force) vektör backend modülü
+"""
+
+import io
+import os
+import numpy as np
+from typing import Iterator, List, Dict, Optional, Tuple
+from pathlib import Path
+from .document_store import DocumentStore
+
+QUANTIZATIONS = ("none", "float16", "int8")
+
+def _read_npy_header(file):
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(file)
+    else:
+        shape, _, dtype = np.lib.format.read_array_header_2_0(file)
+    return shape, dtype, file.tell()
+
+def _append_npy(path: Path, rows: np.ndarray, at_row: Optional[int] = None):
+    """
+    .npy dosyasına ilk eksen boyunca satır ekler
+    
+    Satırlar at_row'dan itibaren yazılır ve dosya yeni sonunda kesilir; böylece
+    yarım kalmış bir eklemeden artakalan satırlar (konum dosyasında karşılığı
+    olmayanlar) yeni satırların yerini kaydırmaz. Başlıktaki şekil yerinde
+    güncellenir; başlık uzunluğu değişirse dosya geçici dosya üzerinden
+    yeniden yazılır.
+    
+    Args:
+        path (Path): .npy dosyası
+        rows (np.ndarray): Eklenecek satırlar
+        at_row (Optional[int]): Geçerli satır sayısı (None = dosyadaki tüm satırlar)
+    """
+    if not path.exists():
+        np.save(path, rows)
+        return
+    
+    with open(path, 'r+b') as file:
+        shape, dtype, header_length = _read_npy_header(file)
+        keep = shape[0] if at_row is None else at_row
+        if keep > shape[0]:
+            raise ValueError(f"{path.name} beklenenden az satır içeriyor ({shape[0]} < {keep})")
+        new_shape = (keep + rows.shape[0],) + tuple(shape[1:])
+        
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': new_shape}
+        )
+        
+        if len(header.getvalue()) == header_length:
+            row_bytes = dtype.itemsize * int(np.prod(shape[1:], dtype='int64'))
+            file.seek(header_length + keep * row_bytes)
+            file.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+            file.truncate()
+            file.flush()
+            file.seek(0)
+            file.write(header.getvalue())
+            return
+    
+    combined = np.concatenate([np.load(path, mmap_mode='r')[:keep], rows.astype(dtype)])
+    tmp_path = path.with_suffix('.tmp.npy')
+    np.save(tmp_path, combined)
+    os.replace(tmp_path, path)
+
+def fit_int8(low: np.ndarray, high: np.ndarray, margin: float = 0.05):
+    """
+    Boyut başına en küçük/en büyük değerlerden int8 ölçek ve ofset hesaplar
+    
+    Kodlar x ≈ offset + scale * c (c ∈ [0, 255]) şeklinde çözülür; sonradan
+    eklenen vektörlerin aralık dışına taşmaması için aralık margin kadar
+    genişletilir.
+    """
+    pad = (high - low) * margin
+    low, high = low - pad, high + pad
+    scale = np.maximum((high - low) / 255.0, 1e-12).astype('float32')
+    return scale, low.astype('float32')
+
+def quantize(vectors: np.ndarray, quantization: str, scale: np.ndarray = None, offset: np.ndarray = None) -> np.ndarray:
+    """float32 vektörleri float16 veya uint8 kodlara çevirir"""
+    if quantization == "float16":
+        return vectors.astype('float16')
+    codes = np.rint((vectors - offset) / scale)
+    return np.clip(codes, 0, 255).astype('uint8')
+
+class NumpyBackend:
+    """
+    Bitişik float32 .npy matrisi üzerinde kaba kuvvet arama
+    
+    Matris, satır normları ve doküman deposu konumları ayrı .npy dosyalarında
+    tutulur ve np.load(mmap_mode='r') ile açılır; açılış anlıktır ve aynı
+    makinedeki işçi süreçler sayfa önbelleğindeki tek kopyayı paylaşır.
+    Metin ve metadata SQLite doküman deposundadır.
+    
+    Mesafe diğer backend'lerle uyumlu olarak kare L2'dir ve
+    ||x||² - 2·x·q + ||q||² şeklinde tek matris çarpımıyla hesaplanır.
+    
+    quantization "float16" veya "int8" olduğunda arama, float32 matrisin
+    yerine 2 veya 4 kat küçük nicemlenmiş matris üzerinde bloklar halinde
+    yapılır. int8 için boyut başına ölçek/ofset kullanılır ve satır sayısı
+    iki katına çıktıkça yeniden hesaplanır. float32 matris diskte kaynak
+    olarak kalır; rerank_candidates > 0 ise en iyi adaylar yalnızca bu
+    satırlar okunarak birebir yeniden sıralanır.
+    """
+    
+    name = "numpy"
+    
+    def __init__(self, db_path: str, compact_ratio: float = 0.2, quantization: str = "none",
+                 rerank_candidates: int = 0, block_rows: int = 65536):
+        """
+        NumpyBackend initialization
+        
+        Args:
+            db_path (str): Veritabanı klasörü
+            compact_ratio (float): Yeniden yazmayı tetikleyen silinmiş satır oranı
+            quantization (str): Arama matrisi tipi ("none", "float16", "int8")
+            rerank_candidates (int): float32 ile yeniden sıralanacak aday sayısı (0 = kapalı)
+            block_rows (int): Nicemlenmiş aramada bir blokta çözülen satır sayısı
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Bilinmeyen nicemleme: {quantization} ({', '.join(QUANTIZATIONS)})")
+        
+        self.db_path = Path(db_path) / "numpy"
+        self.db_path.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = self.db_path / "embeddings.npy"
+        self.norms_path = self.db_path / "norms.npy"
+        self.positions_path = self.db_path / "positions.npy"
+        self.store = DocumentStore(self.db_path / "documents.sqlite3")
+        self.compact_ratio = compact_ratio
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        self.block_rows = block_rows
+        self.quantized_path = self.db_path / f"embeddings.{quantization}.npy"
+        self.quantization_params_path = self.db_path / "int8_params.npz"
+        
+        self._load()
+    
+    def _load(self):
+        self._dead_mask = None
+        if not self.positions_path.exists():
+            self.matrix = None
+            self.norms = None
+            self.positions = np.empty(0, dtype='int64')
+            self._load_quantized()
+            return
+        
+        # Konum dosyası en son güncellenir; satır sayısını o belirler
+        self.positions = np.load(self.positions_path, mmap_mode='r')
+        rows = len(self.positions)
+        self.matrix = np.load(self.matrix_path, mmap_mode='r')[:rows]
+        self.norms = np.load(self.norms_path, mmap_mode='r')[:rows]
+        self._load_quantized()
+    
+    def _load_quantized(self):
+        self.quantized = None
+        self.scale = self.offset = None
+        self._fitted_rows = 0
+        if self.quantization == "none" or self.matrix is None:
+            return
+        
+        if self.quantization == "int8" and self.quantization_params_path.exists():
+            params = np.load(self.quantization_params_path)
+            self.scale, self.offset = params['scale'], params['offset']
+            self._fitted_rows = int(params['fitted_rows'])
+        
+        quantized = np.load(self.quantized_path, mmap_mode='r') if self.quantized_path.exists() else None
+        if quantized is None or len(quantized) < len(self.matrix) or (self.quantization == "int8" and self.scale is None):
+            # Eksik veya yarım kalmış nicemleme float32 matristen yeniden üretilir
+            self._requantize()
+            return
+        self.quantized = quantized[:len(self.matrix)]
+    
+    def _requantize(self):
+        """Nicemlenmiş matrisi float32 matristen bloklar halinde yeniden yazar"""
+        rows, dimension = self.matrix.shape
+        if self.quantization == "int8":
+            low = np.full(dimension, np.inf, dtype='float32')
+            high = np.full(dimension, -np.inf, dtype='float32')
+            for start in range(0, rows, self.block_rows):
+                block = self.matrix[start:start + self.block_rows]
+                np.minimum(low, block.min(axis=0), out=low)
+                np.maximum(high, block.max(axis=0), out=high)
+            self.scale, self.offset = fit_int8(low, high)
+            self._fitted_rows = rows
+            np.savez(self.quantization_params_path, scale=self.scale, offset=self.offset, fitted_rows=rows)
+        
+        dtype = 'float16' if self.quantization == "float16" else 'uint8'
+        tmp_path = self.quantized_path.with_suffix('.tmp.npy')
+        output = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(rows, dimension))
+        for start in range(0, rows, self.block_rows):
+            block = np.asarray(self.matrix[start:start + self.block_rows])
+            output[start:start + len(block)] = quantize(block, self.quantization, self.scale, self.offset)
+        output.flush()
+        del output
+        os.replace(tmp_path, self.quantized_path)
+        self.quantized = np.load(self.quantized_path, mmap_mode='r')
+    
+    def _dead_rows(self) -> np.ndarray:
+        if self._dead_mask is None:
+            dead = self.store.tombstones()
+            self._dead_mask = np.isin(self.positions, np.asarray(dead, dtype='int64')) if dead else None
+        return self._dead_mask
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Vektörleri ekle (mevcut ID'ler atlanır)"""
+        added = self.store.add(ids, documents, metadatas)
+        if not added:
+            return
+        
+        vectors = np.asarray([embeddings[i] for i, _ in added], dtype='float32')
+        positions = np.asarray([pos for _, pos in added], dtype='int64')
+        if self.matrix is not None and vectors.shape[1] != self.matrix.shape[1]:
+            raise ValueError(f"Embedding boyutu uyuşmuyor ({vectors.shape[1]} != {self.matrix.shape[1]})")
+        
+        # int8 aralığı satır sayısı iki katına çıktığında yeniden hesaplanır
+        refit = self.quantization == "int8" and (
+            self.scale is None or len(self.positions) + len(vectors) >= 2 * self._fitted_rows)
+        
+        # Konum dosyası yetkilidir; diğer dosyalar onun satır sayısından itibaren yazılır
+        rows = len(self.positions)
+        _append_npy(self.matrix_path, vectors, rows)
+        _append_npy(self.norms_path, np.einsum('ij,ij->i', vectors, vectors), rows)
+        if self.quantization != "none" and not refit:
+            _append_npy(self.quantized_path, quantize(vectors, self.quantization, self.scale, self.offset), rows)
+        _append_npy(self.positions_path, positions)
+        self._load()
+    
+    def query(self, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Her sorgu vektörü için en yakın dokümanları döndürür
+        
+        Args:
+            query_embeddings (List[List[float]]): Sorgu vektörleri
+            n_results (int): Sorgu başına sonuç sayısı
+            where (Optional[Dict]): Metadata filtresi; yalnızca eşleşen satırlar puanlanır
+        
+        Returns:
+            List[List[Dict]]: Sorgu başına id, document, metadata, distance içeren sonuçlar
+        """
+        if self.matrix is None or len(self.matrix) == 0:
+            return [[] for _ in query_embeddings]
+        
+        candidates = None
+        if where is not None:
+            candidates = self._candidate_rows(where)
+            if len(candidates) == 0:
+                return [[] for _ in query_embeddings]
+        
+        queries = np.asarray(query_embeddings, dtype='float32')
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        norms = self.norms if candidates is None else self.norms[candidates]
+        distances = norms[None, :] - 2.0 * self._dot(queries, candidates)
+        distances += query_norms[:, None]
+        
+        # Filtre adayları ikincil indeksten geldiği için silinmiş satır içermez
+        dead = self._dead_rows() if candidates is None else None
+        if dead is not None:
+            distances[:, dead] = np.inf
+        
+        rerank = self.quantized is not None and self.rerank_candidates > 0
+        k = min(max(n_results, self.rerank_candidates) if rerank else n_results, distances.shape[1])
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        top_distances = np.take_along_axis(distances, top, axis=1)
+        if candidates is not None:
+            top = candidates[top]
+        
+        if rerank:
+            # Adayların birebir mesafesi float32 satırlardan hesaplanır
+            for i, query in enumerate(queries):
+                order = np.argsort(top[i])
+                rows = top[i][order]
+                exact = self.norms[rows] - 2.0 * (self.matrix[rows] @ query) + query_norms[i]
+                top[i] = rows
+                top_distances[i] = np.where(np.isfinite(top_distances[i][order]), exact, np.inf)
+        
+        order = np.argsort(top_distances, axis=1)[:, :n_results]
+        top = np.take_along_axis(top, order, axis=1)
+        top_distances = np.take_along_axis(top_distances, order, axis=1)
+        
+        records = self.store.get_by_positions({int(self.positions[row]) for row in top.ravel()})
+        
+        formatted_results = []
+        for rows, row_distances in zip(top, top_distances):
+            hits = []
+            for row, distance in zip(rows, row_distances):
+                record = records.get(int(self.positions[row]))
+                if record is None or not np.isfinite(distance):
+                    continue
+                hits.append({**record, 'distance': float(max(distance, 0.0))})
+            formatted_results.append(hits)
+        
+        return formatted_results
+    
+    def _candidate_rows(self, where: Dict) -> np.ndarray:
+        """Filtreyle eşleşen konumların matris satır numaraları (artan sırada)"""
+        wanted = np.asarray(self.store.filter_positions(where), dtype='int64')
+        rows = np.searchsorted(self.positions, wanted)
+        inside = rows < len(self.positions)
+        rows, wanted = rows[inside], wanted[inside]
+        return rows[self.positions[rows] == wanted]
+    
+    def _dot(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sorguların satırlarla iç çarpımı (nicemlenmiş matris üzerinde yaklaşık)"""
+        if self.quantized is None:
+            return queries @ (self.matrix if rows is None else self.matrix[rows]).T
+        
+        total = len(self.quantized) if rows is None else len(rows)
+        weights = queries * self.scale if self.quantization == "int8" else queries
+        scores = np.empty((len(queries), total), dtype='float32')
+        for start in range(0, total, self.block_rows):
+            if rows is None:
+                block = self.quantized[start:start + self.block_rows]
+            else:
+                block = self.quantized[rows[start:start + self.block_rows]]
+            block = block.astype('float32')
+            scores[:, start:start + len(block)] = weights @ block.T
+        
+        if self.quantization == "int8":
+            scores += (queries @ self.offset)[:, None]
+        return scores
+    
+    def get(self, ids: List[str]) -> Dict[str, Dict]:
+        """ID'lere göre id, document, metadata kayıtları"""
+        return self.store.get_by_ids(ids)
+    
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[Tuple[List[str], np.ndarray, List[str], List[Dict]]]:
+        """Canlı kayıtları (ids, embeddings, documents, metadatas) grupları halinde döndürür"""
+        if self.matrix is None:
+            return
+        dead = self._dead_rows()
+        for start in range(0, len(self.positions), batch_size):
+            rows = np.arange(start, min(start + batch_size, len(self.positions)))
+            if dead is not None:
+                rows = rows[~dead[rows]]
+            records = self.store.get_by_positions(self.positions[rows])
+            rows = [row for row in rows if int(self.positions[row]) in records]
+            if not rows:
+                continue
+            batch = [records[int(self.positions[row])] for row in rows]
+            yield ([record['id'] for record in batch], np.asarray(self.matrix[rows], dtype='float32'),
+                   [record['document'] for record in batch], [record['metadata'] for record in batch])
+    
+    def filter_ids(self, where: Dict) -> List[str]:
+        """Metadata filtresiyle eşleşen kayıtların ID'leri"""
+        return self.store.filter_ids(where)
+    
+    def delete(self, ids: List[str]):
+        """ID'leri sil; gerekirse matrisi sıkıştır"""
+        if not self.store.delete(ids):
+            return
+        self._dead_mask = None
+        if self.store.tombstone_count() > len(self.positions) * self.compact_ratio:
+            self.compact()
+    
+    def compact(self):
+        """Silinmiş satırları dosyalardan kaldır"""
+        dead = self._dead_rows()
+        if dead is None:
+            return
+        
+        keep = ~dead
+        for path, values in ((self.matrix_path, self.matrix), (self.norms_path, self.norms),
+                             (self.positions_path, self.positions)):
+            tmp_path = path.with_suffix('.tmp.npy')
+            np.save(tmp_path, np.ascontiguousarray(values[keep]))
+            os.replace(tmp_path, path)
+        
+        self.store.clear_tombstones()
+        if self.quantized_path.exists():
+            self.quantized_path.unlink()
+        self._load()
+    
+    def count(self) -> int:
+        """Kayıt sayısı"""
+        return self.store.count()
+    
+    def clear(self):
+        """Tüm vektörleri ve dokümanları sil"""
+        self.store.clear()
+        for path in (self.positions_path, self.matrix_path, self.norms_path, self.quantized_path,
+                     self.quantization_params_path):
+            if path.exists():
+                path.unlink()
+        self._load()
+    
+    def persist(self):
+        """Eklemeler dosyalara doğrudan yazıldığı için ek işlem gerekmez"""
+        pass
+    
+    def get_stats(self) -> Dict:
+        """Backend bilgileri"""
+        return {
+            'backend': self.name,
+            'vectors': len(self.positions),
+            'dimension': self.matrix.shape[1] if self.matrix is not None else None,
+            'matrix_bytes': self.matrix.nbytes if self.matrix is not None else 0,
+            'quantization': self.quantization,
+            'search_bytes': (self.quantized if self.quantized is not None else self.matrix).nbytes
+                            if self.matrix is not None else 0,
+            'tombstones': self.store.tombstone_count(),
+            'memory_mapped': True
+        }
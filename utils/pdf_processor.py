@@ -3,41 +3,332 @@ PDF işleme ve metin çıkarma modülü
 """
 
 import os
-from typing import List, Dict
-import pypdf
+import io
+import math
+import mmap
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Tuple, Optional, Union, BinaryIO
 from pathlib import Path
+from .extraction_cache import ExtractionCache
+from .chunks import ChunkedText
+
+# Çıkarma mantığı değiştiğinde artırılır; önbellek anahtarına dahildir
+EXTRACTOR_REVISION = 1
+
+def extractor_version() -> str:
+    """Önbellek anahtarındaki çıkarıcı sürümü (pypdf'i içe aktarmadan okunur)"""
+    from importlib.metadata import version
+    return f"pypdf-{version('pypdf')}/{EXTRACTOR_REVISION}"
+
+def _pdf_reader(stream: BinaryIO):
+    """pypdf ilk PDF okunurken yüklenir; modülü içe aktarmak ucuz kalır"""
+    import pypdf
+    return pypdf.PdfReader(stream)
+
+# Token bütçelerini karakter bütçesine çevirmek için yaklaşık oran
+CHARS_PER_TOKEN = 4
+
+# Dosya yolu, bellekteki içerik veya ikili dosya benzeri nesne
+PDFSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+class _MemoryStream(io.RawIOBase):
+    """Bellekteki PDF içeriğini kopyalamadan okuyan salt okunur akış"""
+    
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        super().__init__()
+        self._view = memoryview(data).cast('B')
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+    
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        data = self._view[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+    
+    def getbuffer(self) -> memoryview:
+        # Çağıran tarafın serbest bırakabileceği ayrı bir görünüm
+        return self._view[:]
+
+@contextmanager
+def open_pdf_source(source: PDFSource) -> Iterator[BinaryIO]:
+    """
+    PDF kaynağını pypdf'in okuyabileceği bir akış olarak açar
+    
+    Diskteki dosyalar mmap ile eşlenir; bytes/memoryview içerik kopyalanmadan
+    okunur; dosya benzeri nesneler (örn. Streamlit UploadedFile) başa sarılıp
+    doğrudan kullanılır. Hiçbir durumda geçici dosya oluşturulmaz.
+    
+    Args:
+        source (PDFSource): PDF kaynağı
+        
+    Yields:
+        BinaryIO: Okunabilir, konumlanabilir akış
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            # Boş dosyalar mmap ile eşlenemez
+            if os.fstat(file.fileno()).st_size == 0:
+                yield file
+                return
+            
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield _MemoryStream(source)
+    else:
+        source.seek(0)
+        yield source
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """
+    Process havuzu işçisi: dosyayı kendisi açar ve [start, stop) aralığındaki
+    sayfaların metnini sırayla döndürür
+    """
+    with open_pdf_source(pdf_path) as stream:
+        pdf_reader = _pdf_reader(stream)
+        return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
+def _process_file_worker(pdf_path: str, chunk_size: int, overlap: int, unit: str,
+                         cache_dir: Optional[str]) -> Dict:
+    """Process havuzu işçisi: tek bir dosyayı işler, hatayı sonuç olarak döndürür"""
+    return PDFProcessor(cache_dir=cache_dir).process_pdf_file_safe(pdf_path, chunk_size, overlap, unit)
 
 class PDFProcessor:
     """PDF dosyalarını işlemek için yardımcı sınıf"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 1, parallel_page_threshold: int = 64,
+                 cache_dir: Optional[str] = "./data/extraction_cache"):
+        """
+        PDFProcessor initialization
+        
+        Args:
+            max_workers (int): Paralel sayfa çıkarma için process sayısı (1 = seri)
+            parallel_page_threshold (int): Paralel moda geçmek için gereken
+                minimum sayfa sayısı; daha küçük dosyalar havuz açma maliyeti
+                ödemeden seri işlenir
+            cache_dir (Optional[str]): Çıkarma önbelleği klasörü (None = önbellek yok)
+        """
         self.supported_extensions = ['.pdf']
+        self.max_workers = max(1, max_workers)
+        self.parallel_page_threshold = parallel_page_threshold
+        self.cache = ExtractionCache(cache_dir, version=extractor_version()) if cache_dir else None
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    @contextmanager
+    def open_pages(self, source: PDFSource) -> Iterator[Tuple[int, Iterator[Tuple[int, str]]]]:
         """
-        PDF dosyasından metin çıkarır
+        PDF'i bir kez açar; sayfa sayısını ve sayfaları ihtiyaç anında okuyan
+        bir iterator'ı verir
+        
+        Sayfa sayısı yalnızca sayfa ağacından okunur; metni istenmeyen sayfalar
+        ayrıştırılmaz. Blok bittiğinde kaynak kapanır.
+        
+        Args:
+            source (PDFSource): PDF dosya yolu, bytes/memoryview veya dosya benzeri nesne
+            
+        Yields:
+            Tuple[int, Iterator[Tuple[int, str]]]: (sayfa sayısı, (sayfa numarası, sayfa metni) iterator'ı)
+        """
+        with open_pdf_source(source) as stream:
+            pdf_reader = _pdf_reader(stream)
+            yield len(pdf_reader.pages), (
+                (page_num, page.extract_text()) for page_num, page in enumerate(pdf_reader.pages, start=1)
+            )
+    
+    def iter_pages(self, source: PDFSource) -> Iterator[Tuple[int, str]]:
+        """
+        PDF sayfalarını tek tek, ihtiyaç anında okuyarak döndürür
+        
+        Generator kapatıldığında (örn. döngüden erken çıkıldığında) dosya da
+        kapanır; kalan sayfalar hiç ayrıştırılmaz.
+        
+        Args:
+            source (PDFSource): PDF dosya yolu, bytes/memoryview veya dosya benzeri nesne
+            
+        Yields:
+            Tuple[int, str]: (1'den başlayan sayfa numarası, sayfa metni)
+        """
+        with self.open_pages(source) as (_, page_texts):
+            yield from page_texts
+    
+    def count_pages(self, source: PDFSource) -> int:
+        """PDF dosyasının sayfa sayısını döndürür"""
+        with self.open_pages(source) as (page_count, _):
+            return page_count
+    
+    def extract_pages_parallel(self, pdf_path: str, page_count: int = None) -> List[str]:
+        """
+        Sayfa aralığını process havuzuna bölerek sayfa metinlerini çıkarır
+        
+        Her işçi dosyayı kendisi açar; sonuçlar sayfa sırasıyla döner ve seri
+        çıkarmayla birebir aynıdır.
         
         Args:
             pdf_path (str): PDF dosyasının yolu
+            page_count (int): Biliniyorsa toplam sayfa sayısı
+            
+        Returns:
+            List[str]: Sayfa sırasına göre sayfa metinleri
+        """
+        if page_count is None:
+            page_count = self.count_pages(pdf_path)
+        
+        if page_count == 0:
+            return []
+        
+        workers = min(self.max_workers, page_count)
+        
+        # Yük dengesi için işçi başına birkaç aralık
+        batch_size = math.ceil(page_count / (workers * 4))
+        starts = list(range(0, page_count, batch_size))
+        stops = [min(start + batch_size, page_count) for start in starts]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_extract_page_range, [pdf_path] * len(starts), starts, stops)
+            return [page_text for batch in results for page_text in batch]
+    
+    def extract_pages(self, source: PDFSource) -> List[str]:
+        """
+        PDF sayfalarının metinlerini önbellek üzerinden çıkarır
+        
+        Aynı içerikli dosya daha önce işlendiyse yalnızca SHA-256 özeti
+        hesaplanır; aksi halde sayfalar çıkarılıp önbelleğe yazılır. Paralel
+        çıkarma yalnızca diskteki dosyalar için kullanılır.
+        
+        Args:
+            source (PDFSource): PDF dosya yolu, bytes/memoryview veya dosya benzeri nesne
+            
+        Returns:
+            List[str]: Sayfa sırasına göre sayfa metinleri
+        """
+        with open_pdf_source(source) as stream:
+            cache_key = None
+            if self.cache:
+                cache_key = self._cache_key(stream)
+                cached_pages = self.cache.get(cache_key)
+                if cached_pages is not None:
+                    return cached_pages
+            
+            with self.open_pages(stream) as (page_count, page_texts):
+                if (self.max_workers > 1 and isinstance(source, (str, os.PathLike))
+                        and page_count >= self.parallel_page_threshold):
+                    pages = self.extract_pages_parallel(source, page_count)
+                else:
+                    pages = [page_text for _, page_text in page_texts]
+        
+        if cache_key:
+            self.cache.put(cache_key, pages)
+        
+        return pages
+    
+    @staticmethod
+    def _read_within_budget(page_count: int, page_texts: Iterator[Tuple[int, str]],
+                            char_budget: Optional[int]) -> Tuple[int, List[str], int]:
+        """Bütçeyi dolduran sayfaya kadar okur: (sayfa sayısı, okunan sayfalar, karakter sayısı)"""
+        pages = []
+        characters = 0
+        for _, page_text in page_texts:
+            pages.append(page_text)
+            characters += len(page_text)
+            if char_budget is not None and characters >= char_budget:
+                break
+        return page_count, pages, characters
+    
+    def _cache_key(self, stream: BinaryIO) -> str:
+        """Açık akışın içeriğinden önbellek anahtarı üretir"""
+        if isinstance(stream, mmap.mmap):
+            return self.cache.key_for_bytes(stream)
+        return self.cache.key_for_stream(stream)
+    
+    def extract_pages_with_budget(self, source: PDFSource, max_chars: int = None,
+                                  max_tokens: int = None) -> Dict:
+        """
+        Bütçe dolana kadar sayfa çıkarır, kalan sayfaları hiç ayrıştırmaz
+        
+        Yalnızca metnin başını kullanan analiz istemleri için tasarlanmıştır:
+        bütçeyi dolduran sayfadan sonra durur ve sonraki sayfalar ayrıştırılmaz;
+        döndürülen metnin ilk max_chars karakteri tam çıkarmayla aynıdır.
+        Önbellekte tam çıkarma varsa oradan kesilir; yalnızca belgenin tamamı
+        okunduysa sonuç önbelleğe yazılır.
+        
+        Args:
+            source (PDFSource): PDF dosya yolu, bytes/memoryview veya dosya benzeri nesne
+            max_chars (int): Karakter bütçesi
+            max_tokens (int): Yaklaşık token bütçesi (CHARS_PER_TOKEN ile karaktere çevrilir)
+            
+        Returns:
+            Dict: pages (okunan sayfa metinleri), pages_read, total_pages,
+                skipped_pages, skipped_ratio, characters, truncated
+        """
+        budgets = [b for b in (max_chars, max_tokens * CHARS_PER_TOKEN if max_tokens else None) if b]
+        char_budget = min(budgets) if budgets else None
+        
+        with open_pdf_source(source) as stream:
+            cache_key = None
+            all_pages = None
+            if self.cache:
+                cache_key = self._cache_key(stream)
+                all_pages = self.cache.get(cache_key)
+            
+            if all_pages is not None:
+                total_pages, pages, characters = self._read_within_budget(
+                    len(all_pages), enumerate(all_pages, start=1), char_budget)
+            else:
+                # Sayfa sayısı açık okuyucudan gelir; belge ikinci kez ayrıştırılmaz
+                with self.open_pages(stream) as (page_count, page_texts):
+                    total_pages, pages, characters = self._read_within_budget(page_count, page_texts, char_budget)
+        
+        skipped_pages = total_pages - len(pages)
+        
+        # Bütçe tüm belgeyi kapsadıysa sonuç tam çıkarmadır
+        if cache_key and all_pages is None and skipped_pages == 0:
+            self.cache.put(cache_key, pages)
+        
+        return {
+            'pages': pages,
+            'pages_read': len(pages),
+            'total_pages': total_pages,
+            'skipped_pages': skipped_pages,
+            'skipped_ratio': skipped_pages / total_pages if total_pages else 0.0,
+            'characters': characters,
+            'truncated': skipped_pages > 0
+        }
+    
+    def extract_text_from_pdf(self, pdf_path: PDFSource) -> str:
+        """
+        PDF dosyasından metin çıkarır
+        
+        Args:
+            pdf_path (PDFSource): PDF dosyasının yolu veya bellekteki içeriği
             
         Returns:
             str: Çıkarılan metin
+            
+        Raises:
+            Exception: PDF okunamazsa pypdf'in özgün hatası (örn. PdfReadError)
         """
-        try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = pypdf.PdfReader(file)
-                
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text += page.extract_text()
-                    
-            return text.strip()
-        except Exception as e:
-            print(f"PDF işleme hatası: {e}")
-            return ""
+        # Sayfalar tek seferde birleştirilir (doğrusal süre)
+        return "".join(self.extract_pages(pdf_path)).strip()
     
-    def split_text_into_chunks(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    def split_text_into_chunks(self, text: str, chunk_size: int = 1000, overlap: int = 200,
+                               unit: str = 'chars') -> List[str]:
         """
         Metni anlalmlı parçalara böler
         
@@ -45,42 +336,34 @@ class PDFProcessor:
             text (str): Bölünecek metin
             chunk_size (int): Her parçanın boyutu
             overlap (int): Parçalar arası örtüşme
+            unit (str): Boyut birimi ('chars' veya 'tokens')
             
         Returns:
             List[str]: Metin parçaları listesi
         """
-        if not text:
-            return []
+        return self.split_text_into_spans(text, chunk_size, overlap, unit).to_list()
+    
+    def split_text_into_spans(self, text: str, chunk_size: int = 1000, overlap: int = 200,
+                              unit: str = 'chars') -> ChunkedText:
+        """
+        Metni parçalara böler; parçaları kopyalamak yerine ofsetlerini saklar
         
-        chunks = []
-        start = 0
+        Cümle/satır sonu konumları bir kez indekslenir ve pencereler tek
+        geçişte oluşturulur; ardışık parçalar tam olarak overlap kadar örtüşür.
         
-        while start < len(text):
-            # Chunk'ın sonunu bul
-            end = start + chunk_size
-            
-            # Eğer son değilse, cümle sonunu bul
-            if end < len(text):
-                # Son nokta veya yeni satırı bul
-                last_period = text.rfind('.', start, end)
-                last_newline = text.rfind('\n', start, end)
-                
-                # En yakın uygun noktayı seç
-                if last_period > start:
-                    end = last_period + 1
-                elif last_newline > start:
-                    end = last_newline + 1
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+        Args:
+            text (str): Bölünecek metin
+            chunk_size (int): Her parçanın boyutu
+            overlap (int): Parçalar arası örtüşme
+            unit (str): Boyut birimi ('chars' veya yaklaşık token için 'tokens')
             
-            # Sonraki başlangıç noktası (örtüşme ile)
-            start = max(start + chunk_size - overlap, end)
-        
-        return chunks
+        Returns:
+            ChunkedText: Metni paylaşan, ofset tabanlı parça listesi
+        """
+        return ChunkedText.from_text(text, chunk_size, overlap, unit)
     
-    def process_pdf_file(self, pdf_path: str, chunk_size: int = 1000, overlap: int = 200) -> Dict:
+    def process_pdf_file(self, pdf_path: str, chunk_size: int = 1000, overlap: int = 200,
+                         unit: str = 'chars') -> Dict:
         """
         PDF dosyasını işler ve metadata ile birlikte döndürür
         
@@ -88,9 +371,10 @@ class PDFProcessor:
             pdf_path (str): PDF dosyasının yolu
             chunk_size (int): Chunk boyutu
             overlap (int): Örtüşme miktarı
+            unit (str): Chunk boyutu birimi ('chars' veya 'tokens')
             
         Returns:
-            Dict: İşlenmiş veri (chunks, metadata)
+            Dict: İşlenmiş veri (chunks: ChunkedText, metadata, full_text)
         """
         file_path = Path(pdf_path)
         
@@ -106,8 +390,8 @@ class PDFProcessor:
         if not text:
             raise ValueError("PDF'den metin çıkarılamadı")
         
-        # Metni parçalara böl
-        chunks = self.split_text_into_chunks(text, chunk_size, overlap)
+        # Metni parçalara böl (chunk'lar full_text'i paylaşır, kopyalanmaz)
+        chunks = self.split_text_into_spans(text, chunk_size, overlap, unit)
         
         # Metadata oluştur
         metadata = {
@@ -124,31 +408,74 @@ class PDFProcessor:
             'full_text': text
         }
     
-    def process_directory(self, directory_path: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict]:
+    def process_pdf_file_safe(self, pdf_path: str, chunk_size: int = 1000, overlap: int = 200,
+                              unit: str = 'chars') -> Dict:
+        """
+        process_pdf_file ile aynıdır; ancak hata fırlatmak yerine hata nesnesi döndürür
+        
+        Returns:
+            Dict: İşlenmiş veri veya {'error', 'error_type', 'filename', 'file_path'}
+                (error ve error_type ayrıştırma hatasının kendisinden gelir)
+        """
+        try:
+            return self.process_pdf_file(pdf_path, chunk_size, overlap, unit)
+        except Exception as e:
+            return {
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'filename': Path(pdf_path).name,
+                'file_path': str(pdf_path)
+            }
+    
+    def process_directory(self, directory_path: str, chunk_size: int = 1000, overlap: int = 200,
+                          max_workers: int = None, max_in_flight: int = None,
+                          unit: str = 'chars') -> Iterator[Dict]:
         """
         Bir klasördeki tüm PDF dosyalarını işler
         
+        Sonuçlar liste olarak biriktirilmez; dosyalar bittikçe döndürülür.
+        Aynı anda bekleyen sonuç sayısı max_in_flight ile sınırlıdır, bu yüzden
+        tüketici yavaşsa yeni dosya işlenmeye başlanmaz.
+        
         Args:
             directory_path (str): Klasör yolu
             chunk_size (int): Chunk boyutu
             overlap (int): Örtüşme miktarı
+            max_workers (int): Dosya işleyen process sayısı (varsayılan: self.max_workers)
+            max_in_flight (int): Aynı anda işlenen/bekleyen maksimum dosya sayısı
+                (varsayılan: max_workers * 2)
+            unit (str): Chunk boyutu birimi ('chars' veya 'tokens')
             
-        Returns:
-            List[Dict]: İşlenmiş dosyalar listesi
+        Yields:
+            Dict: İşlenmiş dosya veya hata nesnesi ('error' anahtarı içerir)
         """
         directory = Path(directory_path)
         
         if not directory.exists():
             raise FileNotFoundError(f"Klasör bulunamadı: {directory_path}")
         
-        processed_files = []
+        workers = max(1, max_workers or self.max_workers)
+        cache_dir = str(self.cache.cache_dir) if self.cache else None
+        pdf_files = directory.glob("*.pdf")
+        
+        if workers == 1:
+            for file_path in pdf_files:
+                yield self.process_pdf_file_safe(str(file_path), chunk_size, overlap, unit)
+            return
         
-        for file_path in directory.glob("*.pdf"):
-            try:
-                result = self.process_pdf_file(str(file_path), chunk_size, overlap)
-                processed_files.append(result)
-                print(f"İşlendi: {file_path.name}")
-            except Exception as e:
-                print(f"Hata ({file_path.name}): {e}")
+        in_flight_limit = max(workers, max_in_flight or workers * 2)
         
-        return processed_files
\ No newline at end of file
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            
+            for file_path in pdf_files:
+                pending.add(executor.submit(_process_file_worker, str(file_path), chunk_size, overlap, unit,
+                                             cache_dir))
+                
+                if len(pending) >= in_flight_limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            
+            for future in as_completed(pending):
+                yield future.result()
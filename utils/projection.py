@@ -0,0 +1,88 @@
+"""
+Embedding boyut indirgeme (PCA) modülü
+"""
+
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict
+
+class PCAProjection:
+    """
+    Örnek embedding'lerden NumPy ile hesaplanan ve indeksle birlikte saklanan
+    PCA projeksiyonu
+    
+    Aynı projeksiyon hem saklanan vektörlere hem sorgulara uygulanır; bu
+    yüzden bir kez hesaplandıktan sonra değiştirilmez.
+    """
+    
+    def __init__(self, path: str, n_components: int):
+        """
+        PCAProjection initialization
+        
+        Args:
+            path (str): Projeksiyonun saklandığı .npz dosyası
+            n_components (int): Hedef boyut
+        """
+        self.path = Path(path)
+        self.n_components = n_components
+        self.mean = None
+        self.components = None
+        self.explained_variance_ratio = None
+        
+        if self.path.exists():
+            data = np.load(self.path)
+            self.mean = data['mean']
+            self.components = data['components']
+            self.explained_variance_ratio = float(data['explained_variance_ratio'])
+            if len(self.components) != n_components:
+                print(f"Uyarı: Kayıtlı PCA projeksiyonu {len(self.components)} boyutlu "
+                      f"(istenen: {n_components}), kayıtlı olan kullanılıyor")
+                self.n_components = len(self.components)
+    
+    @property
+    def is_fitted(self) -> bool:
+        """Projeksiyon hesaplanmış mı"""
+        return self.components is not None
+    
+    def fit(self, embeddings) -> bool:
+        """
+        Projeksiyonu örnek embedding'lerden hesapla ve kaydet
+        
+        Args:
+            embeddings: (örnek sayısı, boyut) embedding matrisi
+        
+        Returns:
+            bool: İşlem başarılı mı
+        """
+        sample = np.asarray(embeddings, dtype='float32')
+        if sample.ndim != 2 or len(sample) <= self.n_components or sample.shape[1] < self.n_components:
+            print(f"PCA için yetersiz örnek: {len(sample)} (en az {self.n_components + 1} gerekli)")
+            return False
+        
+        self.mean = sample.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(sample - self.mean, full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:self.n_components], dtype='float32')
+        variance = singular_values ** 2
+        self.explained_variance_ratio = float(variance[:self.n_components].sum() / variance.sum())
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, mean=self.mean, components=self.components,
+                 explained_variance_ratio=self.explained_variance_ratio)
+        os.replace(tmp_path, self.path)
+        return True
+    
+    def transform(self, embeddings) -> np.ndarray:
+        """Embedding'leri indirgenmiş boyuta projekte et"""
+        vectors = np.asarray(embeddings, dtype='float32')
+        return (vectors - self.mean) @ self.components.T
+    
+    def get_stats(self) -> Dict:
+        """Projeksiyon bilgileri"""
+        return {
+            'method': 'pca',
+            'dimensions': self.n_components,
+            'fitted': self.is_fitted,
+            'explained_variance_ratio': self.explained_variance_ratio
+        }
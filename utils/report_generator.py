@@ -2,7 +2,6 @@
 Rapor oluşturma ve şablon yönetimi modülü
 """
 
-import google.generativeai as genai
 from typing import Dict, List, Optional
 import os
 from datetime import datetime
@@ -17,6 +16,8 @@ class ReportGenerator:
         Args:
             api_key (str): Gemini API anahtarı
         """
+        import google.generativeai as genai
+        
         if api_key:
             genai.configure(api_key=api_key)
         elif os.getenv("GEMINI_API_KEY"):
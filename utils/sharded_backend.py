@@ -0,0 +1,293 @@
+"""
+Parçalı (sharded) indeks backend modülü: çok süreçli dağıt-topla arama
+"""
+
+import os
+import json
+import heapq
+import uuid
+import zlib
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
+from pathlib import Path
+from .metadata_filter import normalize_where
+
+# Parçalar ayrı süreçlerde diskten açılabilen backend'ler
+SHARD_BACKENDS = {
+    'numpy': ('.numpy_backend', 'NumpyBackend'),
+    'faiss': ('.faiss_backend', 'FaissBackend'),
+}
+
+# İşçi süreçte açık parçalar: parça klasörü -> (nesil, backend)
+_open_shards = {}
+
+def shard_of(value, shards: int) -> int:
+    """Yönlendirme değerinin parça numarası (süreçler arasında kararlı)"""
+    # Filtrelerde 1 == 1.0 olduğu için tam sayı değerli float'lar aynı parçaya gider
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return zlib.crc32(str(value).encode('utf-8')) % shards
+
+def _create_shard(backend: str, path: str, options: Dict):
+    module_name, class_name = SHARD_BACKENDS[backend]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)(path, **options)
+
+def _init_worker(threads: int):
+    # Her işçi kendi parçasını tek çekirdekte tarar; BLAS/OpenMP iş parçacıkları
+    # süreç sayısıyla çarpılıp çekirdekleri aşırı doldurmasın
+    for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+
+def _query_shard(backend: str, path: str, options: Dict, queries, n_results: int,
+                 where: Optional[Dict]) -> List[List[Dict]]:
+    """İşçi süreçte bir parçayı ara; parça yazıldıysa (nesil değiştiyse) yeniden aç"""
+    cached = _open_shards.get(path)
+    if cached is None:
+        shard = _create_shard(backend, path, options)
+        if backend == "faiss":
+            import faiss
+            faiss.omp_set_num_threads(int(os.environ.get("OMP_NUM_THREADS", "1")))
+        cached = (shard.store.get_meta('shard_generation'), shard)
+    
+    generation = cached[1].store.get_meta('shard_generation')
+    if generation != cached[0]:
+        cached = (generation, _create_shard(backend, path, options))
+    _open_shards[path] = cached
+    return cached[1].query(queries, n_results, where=where)
+
+class ShardedBackend:
+    """
+    Koleksiyonu N parçaya (ayrı numpy/FAISS indeks dosyalarına) bölen backend
+    
+    Kayıtlar ID'nin veya shard_key metadata alanının (örn. kurum, rapor türü)
+    özetine göre bir parçaya yönlendirilir. Vektör araması süreç havuzuna
+    dağıtılır; her işçi parçaları diskten (mmap) açar, sorguları kendi
+    parçasında arar ve parça başına en iyi n sonuç mesafeye göre birleştirilir.
+    Korpus büyüdükçe parça sayısı artırılarak sorgu süresi sabit tutulabilir.
+    
+    Filtre shard_key için $eq/$in içeriyorsa yalnızca ilgili parçalar aranır.
+    İşçiler yazılan parçayı persist sonrasında (parça nesli değişince)
+    yeniden açar; yazma ve okuma (get) ana süreçte yapılır.
+    """
+    
+    name = "sharded"
+    
+    def __init__(self, db_path: str, shards: int = 4, shard_backend: str = "numpy", shard_key: str = None,
+                 workers: int = None, shard_options: Dict = None):
+        """
+        ShardedBackend initialization
+        
+        Args:
+            db_path (str): Veritabanı klasörü
+            shards (int): Parça sayısı
+            shard_backend (str): Her parçanın backend'i ("numpy", "faiss")
+            shard_key (str): Yönlendirmede kullanılan metadata alanı (None = ID özeti)
+            workers (int): Arama süreci sayısı (None = çekirdek sayısı, 0 = aynı süreçte ara)
+            shard_options (Dict): Parça backend'i ayarları (örn. {"index_type": "hnsw"})
+        """
+        if shard_backend not in SHARD_BACKENDS:
+            raise ValueError(f"Parça backend'i olarak desteklenmiyor: {shard_backend} ({', '.join(SHARD_BACKENDS)})")
+        
+        self.db_path = Path(db_path) / "shards"
+        self.db_path.mkdir(parents=True, exist_ok=True)
+        
+        # Parça düzeni veriyle birlikte saklanır; değiştirilirse kayıtlar bulunamaz
+        layout = {'shards': shards, 'shard_backend': shard_backend, 'shard_key': shard_key}
+        layout_path = self.db_path / "layout.json"
+        if layout_path.exists():
+            with open(layout_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored != layout:
+                print(f"Uyarı: Mevcut parça düzeni kullanılıyor: {stored} (istenen: {layout})")
+                layout = stored
+        else:
+            with open(layout_path, 'w', encoding='utf-8') as f:
+                json.dump(layout, f)
+        
+        self.shard_count = layout['shards']
+        self.shard_backend = layout['shard_backend']
+        self.shard_key = layout['shard_key']
+        self.shard_options = dict(shard_options or {})
+        self.shard_paths = [str(self.db_path / f"shard_{i:03d}") for i in range(self.shard_count)]
+        self.shards = [_create_shard(self.shard_backend, path, self.shard_options) for path in self.shard_paths]
+        
+        cpu_count = os.cpu_count() or 1
+        self.workers = min(self.shard_count, cpu_count) if workers is None else workers
+        self._threads_per_worker = max(1, cpu_count // max(self.workers, 1))
+        self._pool = None
+        self._dirty = set()
+    
+    def _route(self, doc_id: str, metadata: Dict) -> int:
+        if self.shard_key is None:
+            return shard_of(doc_id, self.shard_count)
+        return shard_of((metadata or {}).get(self.shard_key), self.shard_count)
+    
+    def _group_ids(self, ids: List[str]) -> Dict[int, List[str]]:
+        """ID'leri bulundukları parçalara göre gruplar (metadata ile yönlendirmede tüm parçalar)"""
+        if self.shard_key is not None:
+            return {i: list(ids) for i in range(self.shard_count)}
+        groups = {}
+        for doc_id in ids:
+            groups.setdefault(shard_of(doc_id, self.shard_count), []).append(doc_id)
+        return groups
+    
+    def _target_shards(self, where: Optional[Dict]) -> List[int]:
+        """Filtrenin eşleşebileceği parçalar"""
+        values = self._routed_values(normalize_where(where)) if where and self.shard_key else None
+        if values is None:
+            return list(range(self.shard_count))
+        return sorted({shard_of(value, self.shard_count) for value in values})
+    
+    def _routed_values(self, where: Dict):
+        """Filtrenin shard_key için izin verdiği değerler (sınırlamıyorsa None)"""
+        if "$and" in where:
+            sets = [values for values in map(self._routed_values, where["$and"]) if values is not None]
+            return set.intersection(*sets) if sets else None
+        if "$or" in where:
+            sets = [self._routed_values(clause) for clause in where["$or"]]
+            return None if any(values is None for values in sets) else set().union(*sets)
+        
+        (key, condition), = where.items()
+        (operator, operand), = condition.items()
+        if key != self.shard_key:
+            return None
+        if operator == "$eq":
+            return {operand}
+        if operator == "$in":
+            return set(operand)
+        return None
+    
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._threads_per_worker,)
+            )
+        return self._pool
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Vektörleri parçalarına yaz (mevcut ID'ler atlanır)"""
+        skip = set(self.get(ids)) if self.shard_key is not None else set()
+        groups = {}
+        for i, (doc_id, metadata) in enumerate(zip(ids, metadatas)):
+            if doc_id not in skip:
+                groups.setdefault(self._route(doc_id, metadata), []).append(i)
+        
+        for shard_index, rows in groups.items():
+            self.shards[shard_index].add(
+                [ids[i] for i in rows], [embeddings[i] for i in rows],
+                [documents[i] for i in rows], [metadatas[i] for i in rows]
+            )
+            self._dirty.add(shard_index)
+    
+    def query(self, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Sorguları ilgili parçalarda paralel ara, en iyi n_results sonucu birleştir
+        
+        Args:
+            query_embeddings (List[List[float]]): Sorgu vektörleri
+            n_results (int): Sorgu başına sonuç sayısı
+            where (Optional[Dict]): Metadata filtresi
+        
+        Returns:
+            List[List[Dict]]: Sorgu başına id, document, metadata, distance içeren sonuçlar
+        """
+        import numpy as np
+        
+        queries = np.asarray(query_embeddings, dtype='float32')
+        targets = [i for i in self._target_shards(where) if self.shards[i].count() > 0]
+        if not targets:
+            return [[] for _ in query_embeddings]
+        
+        shard_results = None
+        if self.workers > 0 and len(targets) > 1:
+            try:
+                pool = self._get_pool()
+                futures = [
+                    pool.submit(_query_shard, self.shard_backend, self.shard_paths[i], self.shard_options,
+                                queries, n_results, where)
+                    for i in targets
+                ]
+                shard_results = [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                print(f"Arama süreç havuzu hatası, aynı süreçte aranıyor: {e}")
+                self._pool = None
+        if shard_results is None:
+            shard_results = [self.shards[i].query(queries, n_results, where=where) for i in targets]
+        
+        return [
+            heapq.nsmallest(n_results, chain.from_iterable(results[q] for results in shard_results),
+                            key=lambda hit: hit['distance'])
+            for q in range(len(queries))
+        ]
+    
+    def get(self, ids: List[str]) -> Dict[str, Dict]:
+        """ID'lere göre kayıtlar"""
+        records = {}
+        for shard_index, shard_ids in self._group_ids(ids).items():
+            records.update(self.shards[shard_index].get(shard_ids))
+        return records
+    
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[Tuple[List[str], object, List[str], List[Dict]]]:
+        """Tüm parçaların kayıtlarını sırayla gruplar halinde döndürür"""
+        for shard in self.shards:
+            yield from shard.iter_batches(batch_size)
+    
+    def filter_ids(self, where: Dict) -> List[str]:
+        """Metadata filtresiyle eşleşen kayıtların ID'leri"""
+        return [doc_id for i in self._target_shards(where) for doc_id in self.shards[i].filter_ids(where)]
+    
+    def delete(self, ids: List[str]):
+        """ID'leri bulundukları parçalardan sil"""
+        for shard_index, shard_ids in self._group_ids(ids).items():
+            self.shards[shard_index].delete(shard_ids)
+            self._dirty.add(shard_index)
+    
+    def count(self) -> int:
+        """Kayıt sayısı"""
+        return sum(shard.count() for shard in self.shards)
+    
+    def clear(self):
+        """Tüm parçaları temizle"""
+        for shard_index, shard in enumerate(self.shards):
+            shard.clear()
+            self._bump_generation(shard_index)
+        self._dirty.clear()
+    
+    def persist(self):
+        """Değişen parçaları diske yaz ve işçilerin yeniden açması için neslini değiştir"""
+        for shard_index in sorted(self._dirty):
+            self.shards[shard_index].persist()
+            self._bump_generation(shard_index)
+        self._dirty.clear()
+    
+    def _bump_generation(self, shard_index: int):
+        self.shards[shard_index].store.set_meta('shard_generation', uuid.uuid4().hex)
+    
+    def close(self):
+        """Arama süreç havuzunu kapat"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def get_stats(self) -> Dict:
+        """Backend bilgileri"""
+        counts = [shard.count() for shard in self.shards]
+        return {
+            'backend': self.name,
+            'shard_backend': self.shard_backend,
+            'shards': self.shard_count,
+            'shard_key': self.shard_key,
+            'shard_counts': counts,
+            'search_workers': self.workers,
+            'vectors': sum(shard.get_stats().get('vectors', 0) for shard in self.shards),
+            'tombstones': sum(shard.store.tombstone_count() for shard in self.shards)
+        }
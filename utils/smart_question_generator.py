@@ -2,7 +2,6 @@
 PDF'lerden akıllı soru çıkarma sistemi
 """
 
-import google.generativeai as genai
 from typing import List, Dict, Optional
 import os
 import json
@@ -19,6 +18,8 @@ class SmartQuestionGenerator:
         Args:
             api_key (str): Gemini API anahtarı
         """
+        import google.generativeai as genai
+        
         if api_key:
             genai.configure(api_key=api_key)
         elif os.getenv("GEMINI_API_KEY"):
@@ -40,9 +41,10 @@ class SmartQuestionGenerator:
             Dict: Analiz sonucu
         """
         try:
-            # PDF'den metin çıkar
-            processed_data = self.pdf_processor.process_pdf_file(pdf_path)
-            full_text = processed_data['full_text']
+            # PDF'den metin çıkar; istem yalnızca ilk 3000 karakteri kullandığı
+            # için bütçe dolunca kalan sayfalar ayrıştırılmaz
+            extraction = self.pdf_processor.extract_pages_with_budget(pdf_path, max_chars=3000)
+            full_text = "".join(extraction['pages']).strip()
             
             if len(full_text) < 500:
                 return {
@@ -92,8 +94,17 @@ JSON formatında yanıt ver:
                     return {
                         "success": True,
                         "analysis": analysis_result,
-                        "full_text_length": len(full_text),
-                        "metadata": processed_data['metadata']
+                        # Bütçe nedeniyle yalnızca okunan metnin uzunluğu bilinir
+                        "analyzed_text_length": len(full_text),
+                        "text_truncated": extraction['truncated'],
+                        "metadata": {
+                            'filename': os.path.basename(pdf_path),
+                            'file_path': pdf_path,
+                            'file_size': os.path.getsize(pdf_path),
+                            'total_pages': extraction['total_pages'],
+                            'pages_read': extraction['pages_read'],
+                            'skipped_pages': extraction['skipped_pages']
+                        }
                     }
             
             return {
@@ -1,62 +1,190 @@
 """
-ChromaDB vektör veritabanı modülü
+Vektör veritabanı modülü (ChromaDB veya FAISS backend)
 """
 
-import chromadb
-from chromadb.config import Settings
-import google.generativeai as genai
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 import os
+import gzip
+import json
+import shutil
+import importlib
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
+from .chunks import ChunkedText
+from .embedding_executor import EmbeddingExecutor
+from .embedding_cache import EmbeddingCache, query_embedding_cache
+from .bm25_index import BM25Index
+from .metadata_filter import normalize_where
+from .index_manifest import file_sha256
+
+# Backend'ler yalnızca seçildiklerinde yüklenir (chromadb / faiss bağımlılıkları)
+BACKENDS = {
+    'chroma': ('.chroma_backend', 'ChromaBackend'),
+    'faiss': ('.faiss_backend', 'FaissBackend'),
+    'numpy': ('.numpy_backend', 'NumpyBackend'),
+    'sharded': ('.sharded_backend', 'ShardedBackend'),
+}
+
+# Anlık görüntü dosya biçimi; uyumsuz değişikliklerde artırılır
+SNAPSHOT_FORMAT = 1
+
+def create_backend(name: str, db_path: str, **options):
+    """
+    Adı verilen indeks backend'ini oluşturur
+    
+    Args:
+        name (str): Backend adı ("chroma", "faiss", "numpy", "sharded")
+        db_path (str): Veritabanı klasörü
+        **options: Backend'e özel ayarlar (örn. FAISS index_type, nprobe, ef_search)
+        
+    Returns:
+        Backend nesnesi
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen backend: {name} ({', '.join(BACKENDS)})")
+    module_name, class_name = BACKENDS[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)(db_path, **options)
 
 class VectorDatabase:
-    """ChromaDB ile vektör veritabanı yönetimi"""
+    """Vektör veritabanı yönetimi"""
     
-    def __init__(self, db_path: str = "./data/vector_db", api_key: str = None):
+    def __init__(self, db_path: str = "./data/vector_db", api_key: str = None, embedding_batch_size: int = 100,
+                 embedding_workers: int = 1, requests_per_minute: float = None, tokens_per_minute: float = None,
+                 embedding_cache_size: int = 10000, embedding_cache_max_entries: int = 1_000_000,
+                 backend: str = "chroma", backend_options: Dict = None, embedding_dimensions: int = None,
+                 dimension_reduction: str = "api", pca_sample_size: int = 2000, lexical_index: bool = True):
         """
         VectorDatabase initialization
         
         Args:
             db_path (str): Veritabanı dosya yolu
             api_key (str): Gemini API anahtarı
+            embedding_batch_size (int): Tek embedding isteğindeki maksimum metin sayısı
+            embedding_workers (int): Eşzamanlı embedding isteği sayısı
+            requests_per_minute (float): Embedding istek/dakika kotası (None = sınırsız)
+            tokens_per_minute (float): Embedding token/dakika kotası (None = sınırsız)
+            embedding_cache_size (int): Bellekte tutulan embedding sayısı
+            embedding_cache_max_entries (int): Diskte tutulan embedding sayısı (0 = önbellek kapalı)
+            backend (str): İndeks backend'i ("chroma", "faiss", "numpy", "sharded")
+            backend_options (Dict): Backend ayarları (örn. {"index_type": "hnsw", "ef_search": 128}
+                veya {"shards": 8, "shard_key": "document_type"})
+            embedding_dimensions (int): Saklanacak embedding boyutu (None = modelin tam boyutu)
+            dimension_reduction (str): "api" (output_dimensionality) veya "pca" (yerel projeksiyon)
+            pca_sample_size (int): PCA projeksiyonunun hesaplandığı örnek sayısı
+            lexical_index (bool): Chunk'lar için yerel BM25 indeksi tut
         """
         self.db_path = Path(db_path)
         self.db_path.mkdir(parents=True, exist_ok=True)
         
-        # ChromaDB client oluştur
-        self.client = chromadb.PersistentClient(
-            path=str(self.db_path),
-            settings=Settings(anonymized_telemetry=False)
-        )
-        
-        # Gemini API yapılandır
-        if api_key:
-            genai.configure(api_key=api_key)
-        elif os.getenv("GEMINI_API_KEY"):
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        else:
+        # Gemini API ilk embedding isteğinde yüklenip yapılandırılır (bkz. _genai)
+        self._api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._genai_module = None
+        if not self._api_key:
             print("Uyarı: GEMINI_API_KEY çevre değişkeni bulunamadı")
         
         # Embedding model
         self.embedding_model = "models/text-embedding-004"
+        self.embedding_batch_size = embedding_batch_size
         
-        # Collection oluştur veya al
+        # Boyut indirgeme: API tarafında kesme veya yerel PCA projeksiyonu
+        self.embedding_dimensions = embedding_dimensions
+        self.pca_sample_size = pca_sample_size
+        self.projection = None
+        self._embed_options = {}
+        self.embedding_cache_key = self.embedding_model
+        if embedding_dimensions:
+            if dimension_reduction == "api":
+                self._embed_options = {'output_dimensionality': embedding_dimensions}
+                self.embedding_cache_key = f"{self.embedding_model}@{embedding_dimensions}"
+            elif dimension_reduction == "pca":
+                from .projection import PCAProjection
+                self.projection = PCAProjection(self.db_path / "pca_projection.npz", embedding_dimensions)
+            else:
+                raise ValueError(f"Bilinmeyen boyut indirgeme yöntemi: {dimension_reduction} (api, pca)")
+        
+        self.embedding_executor = EmbeddingExecutor(
+            embed_fn=self._embed_batch,
+            fallback_fn=self._embed_batch,
+            max_workers=embedding_workers,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute
+        )
+        
+        # Embedding önbelleği (bellek LRU + SQLite)
+        self.embedding_cache = None
+        if embedding_cache_max_entries:
+            self.embedding_cache = EmbeddingCache(
+                self.db_path / "embedding_cache.sqlite3",
+                memory_size=embedding_cache_size,
+                max_entries=embedding_cache_max_entries
+            )
+        
+        # İndeks backend'i oluştur
         self.collection_name = "sosyal_raporlar"
-        self.collection = self.get_or_create_collection()
+        options = dict(backend_options or {})
+        if backend == "chroma":
+            options.setdefault('collection_name', self.collection_name)
+        self.backend = create_backend(backend, str(self.db_path), **options)
+        
+        # Yerel BM25 indeksi (sözcüksel ve hibrit arama için)
+        self.lexical_index = BM25Index(self.db_path / "lexical_index.sqlite3") if lexical_index else None
+        
+        # defer_persist bloklarının iç içe derinliği (0 = her yazma çağrısı kalıcı)
+        self._persist_deferred = 0
+        
+        # embedding_text ile kanonik chunk'ın embedding'ini kullanan dokümanlar:
+        # API'ye gönderilmeyen metin sayısı ve embedding önbelleğine yazılmayan bayt
+        self.reused_embeddings = {'texts': 0, 'cache_bytes': 0}
     
-    def get_or_create_collection(self):
-        """Collection oluştur veya mevcut olanı al"""
+    @contextmanager
+    def defer_persist(self):
+        """
+        Blok süresince yazma çağrılarının indeksi diske yazmasını erteler
+        
+        FAISS gibi backend'lerde persist tüm indeksi yeniden yazar; çok
+        dosyalı indekslemede her grup için yazmak yerine çağıran taraf
+        persist() ile ara noktalarda yazar. Dıştaki blok bittiğinde indeks
+        bir kez diske yazılır.
+        """
+        self._persist_deferred += 1
         try:
-            collection = self.client.get_collection(self.collection_name)
-            print(f"Mevcut collection bulundu: {self.collection_name}")
-        except:
-            collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Sosyal hizmet raporları vektör veritabanı"}
-            )
-            print(f"Yeni collection oluşturuldu: {self.collection_name}")
+            yield
+        finally:
+            self._persist_deferred -= 1
+            if not self._persist_deferred:
+                self.persist()
+    
+    def persist(self):
+        """Backend'deki değişiklikleri diske yaz"""
+        self.backend.persist()
+    
+    def _persist_unless_deferred(self):
+        if not self._persist_deferred:
+            self.backend.persist()
+    
+    def close(self):
+        """Bekleyen değişiklikleri diske yaz ve iş parçacığı/süreç havuzlarını kapat"""
+        self.persist()
+        self.embedding_executor.shutdown()
+        if hasattr(self.backend, 'close'):
+            self.backend.close()
+    
+    def _genai(self):
+        """
+        google.generativeai modülünü ilk kullanımda yükler ve yapılandırır
         
-        return collection
+        Modülün yüklenmesi saniyeler sürdüğü için sözcüksel arama, istatistik
+        ve önbellekten karşılanan işlemler bu maliyeti ödemez.
+        """
+        if self._genai_module is None:
+            import google.generativeai as genai
+            if self._api_key:
+                genai.configure(api_key=self._api_key)
+            self._genai_module = genai
+        return self._genai_module
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -68,17 +196,180 @@ class VectorDatabase:
         Returns:
             List[float]: Embedding vektörü
         """
+        if self.embedding_cache:
+            cached = self.embedding_cache.get_many(self.embedding_cache_key, "retrieval_document", [text])[0]
+            if cached:
+                return cached
+        
         try:
-            response = genai.embed_content(
+            response = self._genai().embed_content(
                 model=self.embedding_model,
                 content=text,
-                task_type="retrieval_document"
+                task_type="retrieval_document",
+                **self._embed_options
             )
-            return response['embedding']
+            embedding = response['embedding']
+            if self.embedding_cache:
+                self.embedding_cache.put_many(self.embedding_cache_key, "retrieval_document", [text], [embedding])
+            return embedding
         except Exception as e:
             print(f"Embedding oluşturma hatası: {e}")
             return []
     
+    def generate_query_embedding(self, query: str) -> List[float]:
+        """
+        Arama sorgusu için embedding oluştur
+        
+        Sorgular "retrieval_query" görev tipiyle embed edilir. Son sorguların
+        vektörleri süreç genelinde paylaşılan önbellekte tutulur; aynı sorgu
+        tekrarlandığında istek gönderilmez.
+        
+        Args:
+            query (str): Arama sorgusu
+            
+        Returns:
+            List[float]: Embedding vektörü
+        """
+        cached = query_embedding_cache.get(self.embedding_cache_key, query)
+        if cached:
+            return cached
+        
+        try:
+            response = self._genai().embed_content(
+                model=self.embedding_model,
+                content=query,
+                task_type="retrieval_query",
+                **self._embed_options
+            )
+            embedding = response['embedding']
+            query_embedding_cache.put(self.embedding_cache_key, query, embedding)
+            return embedding
+        except Exception as e:
+            print(f"Query embedding oluşturma hatası: {e}")
+            return []
+    
+    def generate_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """
+        Birden fazla arama sorgusu için toplu embedding oluştur
+        
+        Önbellekte olmayan sorgular tekrarları ayıklanarak embedding_batch_size'lık
+        gruplar halinde tek istekle embed edilir (15 sorgu = 1 istek).
+        
+        Args:
+            queries (List[str]): Arama sorguları
+            
+        Returns:
+            List[List[float]]: Her sorgu için embedding (başarısızsa boş liste)
+        """
+        embeddings = [query_embedding_cache.get(self.embedding_cache_key, query) for query in queries]
+        missing = list(dict.fromkeys(query for query, embedding in zip(queries, embeddings) if not embedding))
+        
+        generated = {}
+        for start in range(0, len(missing), self.embedding_batch_size):
+            part = missing[start:start + self.embedding_batch_size]
+            try:
+                for query, embedding in zip(part, self._embed_batch(part, task_type="retrieval_query")):
+                    query_embedding_cache.put(self.embedding_cache_key, query, embedding)
+                    generated[query] = embedding
+            except Exception as e:
+                print(f"Toplu query embedding oluşturma hatası: {e}")
+        
+        return [embedding or generated.get(query, []) for query, embedding in zip(queries, embeddings)]
+    
+    def _embed_batch(self, texts: List[str], task_type: str = "retrieval_document") -> List[List[float]]:
+        """Tek istekte toplu embedding; hata durumunda exception fırlatır"""
+        response = self._genai().embed_content(
+            model=self.embedding_model,
+            content=list(texts),
+            task_type=task_type,
+            **self._embed_options
+        )
+        embeddings = response['embedding']
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Toplu embedding eksik döndü ({len(embeddings)}/{len(texts)})")
+        return embeddings
+    
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Birden fazla metin için tek istekte embedding oluştur
+        
+        İstek hız sınırlarına uyar ve 429/kota hatalarında geri çekilerek
+        yeniden dener. Diğer hatalarda metinler tek tek denenir; böylece
+        yalnızca sorunlu öğeler boş embedding ile döner. Önbellekte bulunan
+        metinler ve grup içindeki tekrarlar için istek gönderilmez.
+        
+        Args:
+            texts (List[str]): Embedding oluşturulacak metinler
+            
+        Returns:
+            List[List[float]]: Her metin için embedding (başarısızsa boş liste)
+        """
+        return self._generate_embeddings(texts)[0]
+    
+    def _generate_embeddings(self, texts: List[str]) -> Tuple[List[List[float]], List[str]]:
+        """generate_embeddings ile aynıdır; ayrıca API'ye gönderilen metinleri döndürür"""
+        texts = list(texts)
+        if not self.embedding_cache:
+            unique = list(dict.fromkeys(texts))
+            generated = dict(zip(unique, self.embedding_executor.embed(unique)))
+            return [generated[text] for text in texts], unique
+        
+        embeddings = self.embedding_cache.get_many(self.embedding_cache_key, "retrieval_document", texts)
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if not missing:
+            return embeddings, []
+        
+        generated = dict(zip(missing, self.embedding_executor.embed(missing)))
+        self.embedding_cache.put_many(self.embedding_cache_key, "retrieval_document", missing,
+                                      [generated[text] for text in missing])
+        return [embedding if embedding is not None else generated[text]
+                for text, embedding in zip(texts, embeddings)], missing
+    
+    def fit_projection(self, texts: List[str]) -> bool:
+        """
+        PCA projeksiyonunu örnek metinlerin embedding'lerinden hesapla
+        
+        Args:
+            texts (List[str]): Korpustan örnek metinler
+            
+        Returns:
+            bool: İşlem başarılı mı
+        """
+        if not self.projection:
+            return False
+        
+        # API istek başına en fazla embedding_batch_size metin kabul eder
+        texts = list(texts)
+        batches = (texts[start:start + self.embedding_batch_size]
+                   for start in range(0, len(texts), self.embedding_batch_size))
+        embeddings = [
+            embedding
+            for _, batch_embeddings in self.embedding_executor.map_batches(batches, embed=self.generate_embeddings)
+            for embedding in batch_embeddings if embedding
+        ]
+        return self.projection.fit(embeddings)
+    
+    def _to_index_space(self, embeddings: List[List[float]]) -> List[List[float]]:
+        """Embedding'leri indeksin boyutuna getirir (PCA varsa projekte eder)"""
+        if not self.projection:
+            return embeddings
+        return self.projection.transform(embeddings).tolist()
+    
+    def _fit_projection_from_stream(self, embedded: Iterator[Tuple[List[Dict], List[List[float]]]]):
+        """PCA henüz hesaplanmamışsa ilk grupların embedding'lerinden hesaplar"""
+        pending = []
+        sample = []
+        for batch, embeddings in embedded:
+            pending.append((batch, embeddings))
+            sample.extend(embedding for embedding in embeddings if embedding)
+            if len(sample) >= self.pca_sample_size:
+                break
+        
+        if not self.projection.fit(sample):
+            print("PCA projeksiyonu hesaplanamadığı için dokümanlar eklenmedi")
+            return iter(())
+        return chain(pending, embedded)
+    
     def add_document(self, document_id: str, text: str, metadata: Dict = None) -> bool:
         """
         Veritabanına dokuman ekle
@@ -99,6 +390,10 @@ class VectorDatabase:
                 print("Embedding oluşturulamadı")
                 return False
             
+            if self.projection and not self.projection.is_fitted:
+                print("PCA projeksiyonu henüz hesaplanmadı (fit_projection)")
+                return False
+            
             # Metadata hazırla
             doc_metadata = metadata or {}
             doc_metadata.update({
@@ -107,12 +402,15 @@ class VectorDatabase:
             })
             
             # Veritabanına ekle
-            self.collection.add(
+            self.backend.add(
                 ids=[document_id],
-                embeddings=[embedding],
+                embeddings=self._to_index_space([embedding]),
                 documents=[text],
                 metadatas=[doc_metadata]
             )
+            self._persist_unless_deferred()
+            if self.lexical_index:
+                self.lexical_index.add([document_id], [text])
             
             return True
             
@@ -120,85 +418,366 @@ class VectorDatabase:
             print(f"Dokuman ekleme hatası: {e}")
             return False
     
-    def add_multiple_documents(self, documents: List[Dict]) -> int:
+    def add_multiple_documents(self, documents: Iterable[Dict], batch_size: int = None,
+                               embeddings: Dict[str, List[float]] = None) -> int:
         """
         Birden fazla dokuman ekle
         
+        Dokümanlar batch_size'lık gruplar halinde tek embedding isteği ve tek
+        backend.add çağrısıyla yazılır. Çağrı içinde tekrar eden embedding
+        metinleri (örn. aynı kanonik chunk'a bağlı kopyalar) önbellek kapalı
+        olsa da yalnızca bir kez gönderilir.
+        
         Args:
-            documents (List[Dict]): Dokuman listesi (id, text, metadata içeren dict'ler)
+            documents (Iterable[Dict]): Dokuman listesi (id, text, metadata içeren dict'ler;
+                isteğe bağlı embedding_text verilirse vektör text yerine ondan üretilir)
+            batch_size (int): Grup boyutu (varsayılan: embedding_batch_size)
+            embeddings (Dict[str, List[float]]): Önceden üretilmiş embedding'ler (embedding metni ->
+                embedding); bulunan metinler için istek gönderilmez, yeni üretilenler sözlüğe eklenir
             
         Returns:
             int: Başarıyla eklenen dokuman sayısı
         """
+        batch_size = batch_size or self.embedding_batch_size
+        iterator = iter(documents)
+        resolved = embeddings if embeddings is not None else {}
+        submitted = set()
+        needed = set()
+        
+        def valid_batches():
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    return
+                batch = [doc for doc in batch if doc.get('id') and doc.get('text')]
+                if batch:
+                    yield batch
+        
+        def embedding_texts(batch: List[Dict]) -> List[str]:
+            return [doc.get('embedding_text') or doc['text'] for doc in batch]
+        
+        def texts_to_embed(batch: List[Dict]) -> List[str]:
+            # Önceki gruplarda istenmiş metinler yeniden istenmez
+            texts = [text for text in dict.fromkeys(embedding_texts(batch))
+                     if text not in submitted and not resolved.get(text)]
+            submitted.update(texts)
+            return texts
+        
+        def embed(texts: List[str]) -> Tuple[Dict[str, List[float]], List[str]]:
+            embeddings, sent = self._generate_embeddings(texts)
+            return dict(zip(texts, embeddings)), sent
+        
+        def resolved_batches():
+            # Gruplar gönderim sırasıyla döner; önceki grupların sonuçları resolved'dadır
+            for batch, (generated, sent) in self.embedding_executor.map_batches(
+                    valid_batches(), texts_of=texts_to_embed, embed=embed):
+                resolved.update(generated)
+                embeddings = [resolved.get(text, []) for text in embedding_texts(batch)]
+                self._count_reused(batch, embeddings, needed, set(sent))
+                yield batch, embeddings
+        
+        # Gruplar eşzamanlı embed edilir, yazma sırayla bu iş parçacığında yapılır
+        embedded = resolved_batches()
+        if self.projection and not self.projection.is_fitted:
+            embedded = self._fit_projection_from_stream(embedded)
+        
         added_count = 0
+        for batch, embeddings in embedded:
+            added_count += self._write_batch(batch, embeddings)
         
-        for doc in documents:
-            doc_id = doc.get('id')
-            text = doc.get('text')
-            metadata = doc.get('metadata', {})
+        self._persist_unless_deferred()
+        return added_count
+    
+    def _count_reused(self, batch: List[Dict], embeddings: List[List[float]], needed: set, sent: set):
+        """Kanonik embedding'i istek gönderilmeden kullanılan kopyaları say"""
+        for doc, embedding in zip(batch, embeddings):
+            text = doc.get('embedding_text') or doc['text']
+            # Metin çağrıda ilk kez gerekiyor ve API'ye gönderildiyse bu doküman için istek yapılmıştır
+            if doc.get('embedding_text') and embedding and (text in needed or text not in sent):
+                self.reused_embeddings['texts'] += 1
+                if self.embedding_cache:
+                    self.reused_embeddings['cache_bytes'] += len(embedding) * 4
+            needed.add(text)
+    
+    def _write_batch(self, batch: List[Dict], embeddings: List[List[float]]) -> int:
+        """Embed edilmiş bir grup dokümanı yaz, eklenen sayısını döndür"""
+        ids, vectors, texts, metadatas = [], [], [], []
+        for doc, embedding in zip(batch, embeddings):
+            if not embedding:
+                print(f"Eklenemedi: {doc['id']}")
+                continue
+            
+            # Metadata hazırla
+            doc_metadata = dict(doc.get('metadata') or {})
+            doc_metadata.update({
+                'character_count': len(doc['text']),
+                'word_count': len(doc['text'].split())
+            })
             
-            if doc_id and text:
-                if self.add_document(doc_id, text, metadata):
-                    added_count += 1
-                    print(f"Eklendi: {doc_id}")
-                else:
-                    print(f"Eklenemedi: {doc_id}")
+            ids.append(doc['id'])
+            vectors.append(embedding)
+            texts.append(doc['text'])
+            metadatas.append(doc_metadata)
+        
+        if not ids:
+            return 0
+        
+        vectors = self._to_index_space(vectors)
+        try:
+            self.backend.add(ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas)
+            if self.lexical_index:
+                self.lexical_index.add(ids, texts)
+            print(f"Eklendi: {len(ids)} dokuman")
+            return len(ids)
+        except Exception as e:
+            print(f"Toplu ekleme hatası: {e}")
+        
+        # Toplu yazma başarısızsa hangi öğelerin sorunlu olduğunu bulmak için tek tek yaz
+        added_count = 0
+        for doc_id, embedding, text, metadata in zip(ids, vectors, texts, metadatas):
+            try:
+                self.backend.add(ids=[doc_id], embeddings=[embedding], documents=[text], metadatas=[metadata])
+                if self.lexical_index:
+                    self.lexical_index.add([doc_id], [text])
+                added_count += 1
+            except Exception as e:
+                print(f"Eklenemedi: {doc_id} ({e})")
         
         return added_count
     
-    def search_similar(self, query: str, n_results: int = 5) -> List[Dict]:
+    def add_chunks(self, chunks: ChunkedText, ids: List[str], metadatas: List[Dict],
+                   ignore_metadata_keys: Iterable[str] = (), embeddings: Dict[str, List[float]] = None) -> int:
+        """
+        Ofset tabanlı chunk'ları ekle veya güncelle (bkz. upsert_documents)
+        
+        Chunk metinleri yalnızca veritabanına yazılırken, birer birer üretilir;
+        böylece belgenin tamamı bellekte ikinci kez kopyalanmaz.
+        
+        Args:
+            chunks (ChunkedText): Ofset tabanlı chunk listesi
+            ids (List[str]): Her chunk için benzersiz ID
+            metadatas (List[Dict]): Her chunk için metadata
+            ignore_metadata_keys (Iterable[str]): Karşılaştırmada yok sayılacak metadata anahtarları
+            embeddings (Dict[str, List[float]]): Önceden üretilmiş embedding'ler (bkz. add_multiple_documents)
+            
+        Returns:
+            int: Güncel durumdaki (yazılan veya değişmeyen) dokuman sayısı
+        """
+        documents = (
+            {'id': doc_id, 'text': chunk, 'metadata': metadata}
+            for doc_id, chunk, metadata in zip(ids, chunks, metadatas)
+        )
+        return self.upsert_documents(documents, ignore_metadata_keys, embeddings)
+    
+    def upsert_documents(self, documents: Iterable[Dict], ignore_metadata_keys: Iterable[str] = (),
+                         embeddings: Dict[str, List[float]] = None) -> int:
+        """
+        Dokümanları ekle veya güncelle
+        
+        Aynı ID, metin ve metadata ile zaten kayıtlı dokümanlar atlanır; metni
+        veya metadata'sı değişenler silinip yeniden yazılır (embedding'leri
+        önbellekten gelir). Yeni ID'ler normal şekilde eklenir.
+        
+        Args:
+            documents (Iterable[Dict]): Dokuman listesi (id, text, metadata içeren dict'ler)
+            ignore_metadata_keys (Iterable[str]): Karşılaştırmada yok sayılacak metadata
+                anahtarları (örn. indexed_at)
+            embeddings (Dict[str, List[float]]): Önceden üretilmiş embedding'ler (bkz. add_multiple_documents)
+            
+        Returns:
+            int: Güncel durumdaki (yazılan veya değişmeyen) dokuman sayısı
+        """
+        # character_count ve word_count metinden türetilir; metin ayrıca karşılaştırılır
+        ignored = set(ignore_metadata_keys) | {'character_count', 'word_count'}
+        
+        def comparable(metadata: Dict) -> Dict:
+            return {key: value for key, value in (metadata or {}).items() if key not in ignored}
+        
+        iterator = iter(documents)
+        current = 0
+        new_count = changed_count = 0
+        while True:
+            batch = list(islice(iterator, 500))
+            if not batch:
+                break
+            batch = [doc for doc in batch if doc.get('id') and doc.get('text')]
+            
+            existing = self.backend.get([doc['id'] for doc in batch])
+            changed = [
+                doc for doc in batch if doc['id'] in existing and (
+                    existing[doc['id']]['document'] != doc['text']
+                    or comparable(existing[doc['id']]['metadata']) != comparable(doc.get('metadata'))
+                )
+            ]
+            pending = [doc for doc in batch if doc['id'] not in existing] + changed
+            current += len(batch) - len(pending)
+            new_count += len(pending) - len(changed)
+            changed_count += len(changed)
+            
+            if changed:
+                self.delete_documents([doc['id'] for doc in changed])
+            if pending:
+                current += self.add_multiple_documents(pending, embeddings=embeddings)
+        
+        print(f"Upsert: {new_count} yeni, {changed_count} güncellenen dokuman")
+        return current
+    
+    def search_similar(self, query: str, n_results: int = 5, mode: str = "vector",
+                       where: Optional[Dict] = None) -> List[Dict]:
         """
         Benzer dokümanları ara
         
         Args:
             query (str): Arama sorgusu
             n_results (int): Döndürülecek sonuç sayısı
+            mode (str): "vector" (embedding), "lexical" (yalnızca BM25, ağ isteği yok)
+                veya "hybrid" (ikisi reciprocal rank fusion ile birleştirilir)
+            where (Optional[Dict]): Metadata filtresi, örn. {"source_file": "rapor.pdf"} veya
+                {"chunk_index": {"$lt": 5}} (bkz. metadata_filter)
             
         Returns:
             List[Dict]: Benzer dokümanlar
         """
+        return self.search_many([query], n_results, mode, where)[0]
+    
+    def search_many(self, queries: List[str], n_results: int = 5, mode: str = "vector",
+                    where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Birden fazla sorgu için benzer dokümanları ara
+        
+        Tüm sorgular tek toplu embedding isteğiyle embed edilir ve indekste tek
+        backend.query çağrısıyla (NumPy'da tek matris çarpımı) aranır; örneğin
+        15 görüşme cevabı için bağlam tek ağ isteğiyle getirilir.
+        
+        Args:
+            queries (List[str]): Arama sorguları
+            n_results (int): Sorgu başına döndürülecek sonuç sayısı
+            mode (str): "vector", "lexical" veya "hybrid" (bkz. search_similar)
+            where (Optional[Dict]): Tüm sorgulara uygulanan metadata filtresi
+            
+        Returns:
+            List[List[Dict]]: Sorgu sırasıyla benzer dokümanlar
+        """
+        if mode not in ("vector", "lexical", "hybrid"):
+            raise ValueError(f"Bilinmeyen arama modu: {mode} (vector, lexical, hybrid)")
+        if where:
+            where = normalize_where(where)
+        
+        queries = list(queries)
+        if not queries:
+            return []
+        
+        if mode != "vector" and not self.lexical_index:
+            print("Sözcüksel indeks kapalı, vektör araması yapılıyor")
+            mode = "vector"
+        
+        if mode == "lexical":
+            return [self.search_lexical(query, n_results, where) for query in queries]
+        
         try:
-            # Query için embedding oluştur
-            query_embedding = self.generate_embedding(query)
-            
-            if not query_embedding:
-                print("Query embedding oluşturulamadı")
-                return []
-            
-            # Arama yap
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                include=['documents', 'metadatas', 'distances']
-            )
+            # Füzyonda her iki listeden de daha derin aday alınır
+            depth = n_results if mode == "vector" else max(n_results * 4, 20)
+            
+            # Sorgular için tek istekte embedding oluştur
+            query_embeddings = self.generate_query_embeddings(queries)
+            embedded = [i for i, embedding in enumerate(query_embeddings) if embedding]
+            if len(embedded) < len(queries):
+                print(f"Query embedding oluşturulamadı: {len(queries) - len(embedded)} sorgu")
             
-            # Sonuçları formatla
-            formatted_results = []
+            # Arama yap (filtre backend'de, puanlamadan önce uygulanır)
+            vector_results = [None] * len(queries)
+            if embedded:
+                found = self.backend.query(
+                    self._to_index_space([query_embeddings[i] for i in embedded]), depth, where=where or None
+                )
+                for i, results in zip(embedded, found):
+                    vector_results[i] = results
             
-            if results['documents'] and results['documents'][0]:
-                for i in range(len(results['documents'][0])):
-                    formatted_results.append({
-                        'id': results['ids'][0][i] if results['ids'] else None,
-                        'document': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                        'distance': results['distances'][0][i] if results['distances'] else None
-                    })
+            if mode == "vector":
+                return [results or [] for results in vector_results]
             
-            return formatted_results
+            all_results = []
+            for query, results in zip(queries, vector_results):
+                if results is None:
+                    all_results.append(self.search_lexical(query, n_results, where))
+                    continue
+                lexical_hits, _ = self._lexical_hits(query, depth, where)
+                all_results.append(self._fuse_results(results, lexical_hits, n_results))
+            return all_results
             
         except Exception as e:
             print(f"Arama hatası: {e}")
+            return [[] for _ in queries]
+    
+    def search_lexical(self, query: str, n_results: int = 5, where: Optional[Dict] = None) -> List[Dict]:
+        """
+        Yalnızca yerel BM25 indeksiyle ara (embedding isteği gönderilmez)
+        
+        Args:
+            query (str): Arama sorgusu
+            n_results (int): Döndürülecek sonuç sayısı
+            where (Optional[Dict]): Metadata filtresi
+            
+        Returns:
+            List[Dict]: id, document, metadata, score içeren sonuçlar (distance: None)
+        """
+        try:
+            hits, records = self._lexical_hits(query, n_results, normalize_where(where) if where else None)
+            return [{**records[doc_id], 'distance': None, 'score': score} for doc_id, score in hits]
+        except Exception as e:
+            print(f"Sözcüksel arama hatası: {e}")
             return []
     
+    def _lexical_hits(self, query: str, n_results: int, where: Optional[Dict]):
+        """BM25 sonuçları ve kayıtları; filtre varsa BM25 yalnızca eşleşen chunk'lar arasında sıralar"""
+        allowed = self.backend.filter_ids(where) if where else None
+        if allowed is not None and not allowed:
+            return [], {}
+        hits = self.lexical_index.search(query, n_results, ids=allowed)
+        records = self.backend.get([doc_id for doc_id, _ in hits])
+        return [(doc_id, score) for doc_id, score in hits if doc_id in records], records
+    
+    def _fuse_results(self, vector_results: List[Dict], lexical_hits: List[tuple], n_results: int,
+                      rrf_k: int = 60) -> List[Dict]:
+        """Vektör ve BM25 sıralamalarını reciprocal rank fusion ile birleştirir"""
+        scores = {}
+        records = {}
+        for rank, result in enumerate(vector_results):
+            scores[result['id']] = scores.get(result['id'], 0.0) + 1.0 / (rrf_k + rank + 1)
+            records[result['id']] = result
+        for rank, (doc_id, _) in enumerate(lexical_hits):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+        
+        ranked = sorted(scores, key=scores.get, reverse=True)[:n_results]
+        missing = [doc_id for doc_id in ranked if doc_id not in records]
+        if missing:
+            records.update({
+                doc_id: {**record, 'distance': None}
+                for doc_id, record in self.backend.get(missing).items()
+            })
+        
+        return [{**records[doc_id], 'score': scores[doc_id]} for doc_id in ranked if doc_id in records]
+    
     def get_collection_stats(self) -> Dict:
         """Collection istatistiklerini al"""
         try:
-            count = self.collection.count()
-            return {
+            count = self.backend.count()
+            stats = {
                 'document_count': count,
                 'collection_name': self.collection_name,
                 'db_path': str(self.db_path)
             }
+            stats.update(self.backend.get_stats())
+            if self.projection:
+                stats['projection'] = self.projection.get_stats()
+            elif self.embedding_dimensions:
+                stats['projection'] = {'method': 'api', 'dimensions': self.embedding_dimensions}
+            if self.lexical_index:
+                stats['lexical_document_count'] = self.lexical_index.count()
+            if self.embedding_cache:
+                stats['embedding_cache'] = self.embedding_cache.get_stats()
+            stats['query_cache'] = query_embedding_cache.get_stats()
+            return stats
         except Exception as e:
             print(f"İstatistik hatası: {e}")
             return {}
@@ -206,21 +785,194 @@ class VectorDatabase:
     def delete_document(self, document_id: str) -> bool:
         """Dokuman sil"""
         try:
-            self.collection.delete(ids=[document_id])
+            self.backend.delete([document_id])
+            self._persist_unless_deferred()
+            if self.lexical_index:
+                self.lexical_index.delete([document_id])
+            return True
+        except Exception as e:
+            print(f"Silme hatası: {e}")
+            return False
+    
+    def delete_documents(self, document_ids: List[str]) -> bool:
+        """Birden fazla dokümanı tek işlemde sil"""
+        if not document_ids:
+            return True
+        try:
+            self.backend.delete(list(document_ids))
+            self._persist_unless_deferred()
+            if self.lexical_index:
+                self.lexical_index.delete(document_ids)
             return True
         except Exception as e:
             print(f"Silme hatası: {e}")
             return False
     
+    def _embedding_space(self) -> str:
+        """Saklanan vektörlerin uzayı (model, API boyutu ve PCA boyutu)"""
+        if self.projection:
+            return f"{self.embedding_cache_key}+pca{self.projection.n_components}"
+        return self.embedding_cache_key
+    
+    def export_snapshot(self, snapshot_dir: str, batch_size: int = 10000) -> Dict:
+        """
+        Koleksiyonu ikili anlık görüntü olarak dışa aktar
+        
+        Vektörler indeks uzayında tek bir embeddings.npy (float32) dosyasına,
+        id, document ve metadata aynı sırayla records.jsonl.gz dosyasına yazılır.
+        manifest.json kayıt sayısını, embedding uzayını ve dosya özetlerini
+        (SHA-256) içerir. PCA projeksiyonu varsa birlikte kopyalanır.
+        
+        Args:
+            snapshot_dir (str): Anlık görüntü klasörü
+            batch_size (int): Backend'den okunan grup boyutu
+            
+        Returns:
+            Dict: Manifest (başarısızsa boş dict)
+        """
+        import numpy as np
+        
+        try:
+            target = Path(snapshot_dir)
+            target.mkdir(parents=True, exist_ok=True)
+            expected = self.backend.count()
+            matrix = None
+            written = 0
+            
+            with gzip.open(target / "records.jsonl.gz", 'wt', encoding='utf-8') as records_file:
+                for ids, embeddings, documents, metadatas in self.backend.iter_batches(batch_size):
+                    embeddings = np.asarray(embeddings, dtype='float32')
+                    if matrix is None:
+                        matrix = np.lib.format.open_memmap(
+                            target / "embeddings.npy", mode='w+', dtype='float32',
+                            shape=(expected, embeddings.shape[1])
+                        )
+                    if written + len(ids) > expected:
+                        raise ValueError("Koleksiyon dışa aktarma sırasında değişti")
+                    
+                    matrix[written:written + len(ids)] = embeddings
+                    for doc_id, document, metadata in zip(ids, documents, metadatas):
+                        records_file.write(json.dumps(
+                            {'id': doc_id, 'document': document, 'metadata': metadata}, ensure_ascii=False
+                        ) + "\n")
+                    written += len(ids)
+            
+            if written != expected:
+                raise ValueError(f"Beklenen {expected} kayıt, okunan {written}")
+            if matrix is None:
+                np.save(target / "embeddings.npy", np.empty((0, 0), dtype='float32'))
+                dimension = None
+            else:
+                dimension = int(matrix.shape[1])
+                matrix.flush()
+                del matrix
+            
+            files = ["embeddings.npy", "records.jsonl.gz"]
+            if self.projection and self.projection.is_fitted:
+                shutil.copyfile(self.projection.path, target / "pca_projection.npz")
+                files.append("pca_projection.npz")
+            
+            manifest = {
+                'format_version': SNAPSHOT_FORMAT,
+                'created_at': datetime.now().isoformat(),
+                'count': written,
+                'dimension': dimension,
+                'embedding_space': self._embedding_space(),
+                'backend': self.backend.name,
+                'files': {
+                    name: {'sha256': file_sha256(target / name), 'bytes': (target / name).stat().st_size}
+                    for name in files
+                }
+            }
+            with open(target / "manifest.json", 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            
+            print(f"Anlık görüntü yazıldı: {written} kayıt -> {target}")
+            return manifest
+        except Exception as e:
+            print(f"Dışa aktarma hatası: {e}")
+            return {}
+    
+    def import_snapshot(self, snapshot_dir: str, batch_size: int = 10000, verify: bool = True) -> int:
+        """
+        export_snapshot ile yazılmış anlık görüntüyü yükle
+        
+        Vektörler yeniden embed edilmeden büyük gruplar halinde doğrudan
+        backend'e yazılır; BM25 indeksi dokümanlardan yerel olarak oluşturulur.
+        Mevcut ID'ler atlanır ve yüklenen sayısına dahil edilmez.
+        
+        Args:
+            snapshot_dir (str): Anlık görüntü klasörü
+            batch_size (int): Backend'e yazılan grup boyutu
+            verify (bool): Dosya özetlerini manifest'e göre doğrula
+            
+        Returns:
+            int: Yeni eklenen kayıt sayısı (başarısızsa 0)
+        """
+        import numpy as np
+        
+        try:
+            source = Path(snapshot_dir)
+            with open(source / "manifest.json", 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            if manifest.get('format_version') != SNAPSHOT_FORMAT:
+                raise ValueError(f"Desteklenmeyen anlık görüntü biçimi: {manifest.get('format_version')}")
+            if manifest['embedding_space'] != self._embedding_space():
+                raise ValueError(f"Embedding uzayı uyuşmuyor: {manifest['embedding_space']} "
+                                 f"(veritabanı: {self._embedding_space()})")
+            if verify:
+                for name, info in manifest['files'].items():
+                    if file_sha256(source / name) != info['sha256']:
+                        raise ValueError(f"Özet doğrulanamadı: {name}")
+            
+            if 'pca_projection.npz' in manifest['files']:
+                self._restore_projection(source / "pca_projection.npz")
+            
+            matrix = np.load(source / "embeddings.npy", mmap_mode='r')
+            count_before = self.backend.count()
+            loaded = 0
+            with gzip.open(source / "records.jsonl.gz", 'rt', encoding='utf-8') as records_file:
+                while True:
+                    records = [json.loads(line) for line in islice(records_file, batch_size)]
+                    if not records:
+                        break
+                    ids = [record['id'] for record in records]
+                    documents = [record['document'] for record in records]
+                    embeddings = np.asarray(matrix[loaded:loaded + len(records)], dtype='float32')
+                    self.backend.add(ids, embeddings, documents, [record['metadata'] for record in records])
+                    if self.lexical_index:
+                        self.lexical_index.add(ids, documents)
+                    loaded += len(records)
+            
+            if loaded != manifest['count']:
+                raise ValueError(f"Beklenen {manifest['count']} kayıt, okunan {loaded}")
+            self.backend.persist()
+            inserted = self.backend.count() - count_before
+            print(f"Anlık görüntüden {inserted} kayıt yüklendi ({loaded - inserted} kayıt zaten vardı)")
+            return inserted
+        except Exception as e:
+            print(f"İçe aktarma hatası: {e}")
+            return 0
+    
+    def _restore_projection(self, path: Path):
+        # Kayıtlı vektörler farklı bir projeksiyonla üretilmişse karıştırılmamalı
+        if self.projection is None:
+            return
+        if self.projection.is_fitted and self.backend.count() > 0:
+            if file_sha256(path) != file_sha256(self.projection.path):
+                raise ValueError("Veritabanında farklı bir PCA projeksiyonu ile üretilmiş vektörler var")
+            return
+        from .projection import PCAProjection
+        shutil.copyfile(path, self.projection.path)
+        self.projection = PCAProjection(self.projection.path, self.projection.n_components)
+    
     def clear_collection(self) -> bool:
         """Collection'ı temizle"""
         try:
-            # Collection'ı sil ve yeniden oluştur
-            self.client.delete_collection(self.collection_name)
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Sosyal hizmet raporları vektör veritabanı"}
-            )
+            self.backend.clear()
+            if self.lexical_index:
+                self.lexical_index.clear()
             return True
         except Exception as e:
             print(f"Temizleme hatası: {e}")